@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+HTML 解析基准 (Parse Benchmark)
+==============================
+对 sources.json 中每个源保存的列表页/详情页样本，比较不同解析后端的
+解析耗时和内存峰值，并校验提取结果与 html.parser 基线完全一致。
+
+Usage:
+    python3 bench_parse.py record              # 抓取每个源的列表页 + 前3篇详情页到 fixtures/
+    python3 bench_parse.py record --details 5  # 每个源保存5篇详情页
+    python3 bench_parse.py run                 # 对比 html.parser / lxml（冷启动 + 已学习选择器）
+    python3 bench_parse.py run --repeat 10
+"""
+
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+from monitor import (
+    SOURCES_FILE, ExtractionProfiles, NewsFetcher, load_json, save_json, log,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+BACKENDS = ["html.parser", "lxml"]
+
+
+def record(config: dict, details: int):
+    """抓取样本：fixtures/<source_id>/list.html、detail_NN.html、meta.json"""
+    import urllib3
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    fetcher = NewsFetcher(config, history=None)
+    for source in config["sources"]:
+        encoding = source.get("encoding", "utf-8")
+        html = fetcher._fetch_page(source["url"], encoding)
+        if not html:
+            log.warning(f"⚠️  跳过 {source['name']}：无法获取页面")
+            continue
+
+        target = FIXTURES_DIR / source["id"]
+        target.mkdir(parents=True, exist_ok=True)
+        (target / "list.html").write_text(html, encoding="utf-8")
+
+        articles = fetcher._extract_articles_generic(html, source["url"], source)
+        detail_urls = []
+        for article in articles[:details]:
+            detail_html = fetcher._fetch_page(article["url"], encoding)
+            if detail_html:
+                detail_urls.append(article["url"])
+                (target / f"detail_{len(detail_urls):02d}.html").write_text(detail_html, encoding="utf-8")
+
+        save_json(target / "meta.json", {"url": source["url"], "detail_urls": detail_urls})
+        log.info(f"💾 {source['name']}: 列表页 + {len(detail_urls)} 篇详情页")
+
+
+def load_fixtures(config: dict) -> list[tuple[dict, str, list[str]]]:
+    fixtures = []
+    for source in config["sources"]:
+        target = FIXTURES_DIR / source["id"]
+        if not (target / "list.html").exists():
+            continue
+        details = [p.read_text(encoding="utf-8") for p in sorted(target.glob("detail_*.html"))]
+        fixtures.append((source, (target / "list.html").read_text(encoding="utf-8"), details))
+    return fixtures
+
+
+def extract_once(fetcher: NewsFetcher, source: dict, list_html: str, details: list[str]):
+    """跑一遍列表页 + 详情页提取，返回可比较的结果（去掉抓取时间）"""
+    articles = fetcher._extract_articles_generic(list_html, source["url"], source)
+    links = [(a["title"], a["url"]) for a in articles]
+    texts = [fetcher._parse_detail(html, source["id"])[0] for html in details]
+    return links, texts
+
+
+def run(config: dict, repeat: int):
+    fixtures = load_fixtures(config)
+    if not fixtures:
+        print(f"❌ {FIXTURES_DIR} 下没有样本，请先运行: python3 bench_parse.py record")
+        sys.exit(1)
+
+    # 基线：html.parser、不使用已学习选择器
+    baseline_config = {**config, "settings": {**config["settings"], "html_parser": "html.parser"}}
+    baseline_fetcher = NewsFetcher(baseline_config, history=None)
+    baseline = {s["id"]: extract_once(baseline_fetcher, s, l, d) for s, l, d in fixtures}
+
+    print(f"{'source':<16} {'backend':<12} {'mode':<6} {'list(ms)':>9} {'detail(ms)':>11} "
+          f"{'peak(MB)':>9} {'identical':>10}")
+    for backend in BACKENDS:
+        backend_config = {**config, "settings": {**config["settings"], "html_parser": backend}}
+        fetcher = NewsFetcher(backend_config, history=None)
+        if fetcher.html_parser != backend:
+            print(f"{'-':<16} {backend:<12} 未安装，跳过")
+            continue
+
+        for source, list_html, details in fixtures:
+            # cold: 每次都重新探测选择器；warm: 使用 cold 阶段学到的选择器
+            fetcher.profiles = ExtractionProfiles(None)
+            for mode in ("cold", "warm"):
+                list_ms = detail_ms = 0.0
+                for _ in range(repeat):
+                    if mode == "cold":
+                        fetcher.profiles = ExtractionProfiles(None)
+                    start = time.perf_counter()
+                    fetcher._extract_articles_generic(list_html, source["url"], source)
+                    list_ms += (time.perf_counter() - start) * 1000
+                    start = time.perf_counter()
+                    for html in details:
+                        fetcher._parse_detail(html, source["id"])
+                    detail_ms += (time.perf_counter() - start) * 1000
+
+                learned = fetcher.profiles
+                if mode == "cold":
+                    fetcher.profiles = ExtractionProfiles(None)
+                tracemalloc.start()
+                result = extract_once(fetcher, source, list_html, details)
+                peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+                tracemalloc.stop()
+                fetcher.profiles = learned
+
+                identical = "✅" if result == baseline[source["id"]] else "❌"
+                print(f"{source['id']:<16} {backend:<12} {mode:<6} {list_ms / repeat:>9.2f} "
+                      f"{detail_ms / repeat:>11.2f} {peak:>9.2f} {identical:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML解析后端基准测试")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="抓取每个源的样本页面")
+    rec.add_argument("--details", type=int, default=3, help="每个源保存的详情页数量")
+    bench = sub.add_parser("run", help="对比解析耗时/内存并校验结果一致")
+    bench.add_argument("--repeat", type=int, default=5, help="每个样本重复解析次数")
+    args = parser.parse_args()
+
+    config = load_json(SOURCES_FILE)
+    if args.command == "record":
+        record(config, args.details)
+    else:
+        run(config, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+已抓取文章历史存储 (History Store)
+==================================
+monitor.py 的增量检测状态。提供两种可插拔后端：
+- JsonHistoryStore:   原 history.json，整个文件加载/重写
+- SqliteHistoryStore: history.db，URL哈希唯一索引 + WAL + 批量写入 + TTL清理
+                      + MinHash LSH 分段索引（近似重复检索）
+
+首次使用 SQLite 后端时自动从 history.json 一次性迁移。
+
+Usage:
+    python3 history_store.py stats               # 查看历史记录条数
+    python3 history_store.py migrate             # 手动从 history.json 迁移
+    python3 history_store.py prune --days 180    # 清理180天前的记录
+    python3 history_store.py bench               # JSON vs SQLite 性能对比
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import hashlib
+import argparse
+import tempfile
+import threading
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+from near_dup import MinHashIndex, band_keys, decode_signature, similarity
+
+SCRIPT_DIR = Path(__file__).parent
+HISTORY_FILE = SCRIPT_DIR / "history.json"
+HISTORY_DB = SCRIPT_DIR / "history.db"
+
+# 北京时间
+BJT = timezone(timedelta(hours=8))
+
+
+def _parse_ts(value: str) -> float:
+    """ISO时间转时间戳，解析失败返回0（视为最旧）"""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+# ============================================================
+# JSON 后端（兼容旧版 history.json）
+# ============================================================
+
+class JsonHistoryStore:
+    """
+    history.json 后端：全量加载到内存，保存时整体重写。
+    近似检索用内存中的 LSH 索引，首次 find_similar 时从已有签名建立，之后随 add/prune 更新。
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.data: dict = {}
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                self.data = json.load(f)
+        self.data.setdefault("articles", {})
+        self._lock = threading.Lock()
+        self._index: MinHashIndex | None = None
+
+    def contains(self, url_hash: str) -> bool:
+        return url_hash in self.data["articles"]
+
+    def _ensure_index(self) -> MinHashIndex:
+        """调用方持有 _lock"""
+        if self._index is None:
+            self._index = MinHashIndex()
+            for h, r in self.data["articles"].items():
+                if r.get("minhash"):
+                    self._index.add(h, decode_signature(r["minhash"]))
+        return self._index
+
+    def find_similar(self, signature: list[int], threshold: float, exclude: set[str] = frozenset()) -> list[str]:
+        """返回MinHash相似度 ≥ threshold 的历史文章URL哈希（LSH取候选，不扫描全部历史）"""
+        with self._lock:
+            matches = self._ensure_index().query(signature, threshold)
+        return [h for h in matches if h not in exclude]
+
+    def add(self, url_hash: str, record: dict):
+        with self._lock:
+            self.data["articles"][url_hash] = record
+            if self._index is not None:
+                if record.get("minhash"):
+                    self._index.add(url_hash, decode_signature(record["minhash"]))
+                else:
+                    self._index.remove(url_hash)
+
+    def get_last_run(self) -> str:
+        return self.data.get("last_run", "")
+
+    def set_last_run(self, value: str):
+        self.data["last_run"] = value
+
+    def count(self) -> int:
+        return len(self.data["articles"])
+
+    def prune(self, ttl_days: int) -> int:
+        """删除 fetched_at 早于 ttl_days 天的记录，返回删除条数"""
+        cutoff = time.time() - ttl_days * 86400
+        with self._lock:
+            old = [h for h, r in self.data["articles"].items()
+                   if _parse_ts(r.get("fetched_at", "")) < cutoff]
+            for h in old:
+                del self.data["articles"][h]
+                if self._index is not None:
+                    self._index.remove(h)
+        return len(old)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+
+    def close(self):
+        pass
+
+
+# ============================================================
+# SQLite 后端
+# ============================================================
+
+class SqliteHistoryStore:
+    """
+    history.db 后端：
+    - articles.url_hash 为主键（唯一索引），查询不需要加载全部历史
+    - WAL 模式，写入不阻塞读取
+    - add() 先进缓冲区，达到 batch_size 或 save() 时批量插入
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS articles (
+            url_hash     TEXT PRIMARY KEY,
+            title        TEXT NOT NULL DEFAULT '',
+            url          TEXT NOT NULL DEFAULT '',
+            source       TEXT NOT NULL DEFAULT '',
+            fetched_at   TEXT NOT NULL DEFAULT '',
+            fetched_ts   REAL NOT NULL DEFAULT 0,
+            content_hash TEXT NOT NULL DEFAULT '',
+            minhash      TEXT NOT NULL DEFAULT ''
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_articles_fetched_ts ON articles(fetched_ts);
+        CREATE TABLE IF NOT EXISTS minhash_bands (
+            band     INTEGER NOT NULL,
+            value    INTEGER NOT NULL,
+            url_hash TEXT NOT NULL,
+            PRIMARY KEY (band, value, url_hash)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path: Path, batch_size: int = 500):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending: dict[str, tuple] = {}
+        # 爬虫在线程池中调用 contains()，连接由锁保护
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._upgrade_schema()
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+
+    def _upgrade_schema(self):
+        """旧版 history.db 没有 minhash 列，补上"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(articles)")}
+        if columns and "minhash" not in columns:
+            self.conn.execute("ALTER TABLE articles ADD COLUMN minhash TEXT NOT NULL DEFAULT ''")
+
+    @staticmethod
+    def _row(url_hash: str, record: dict) -> tuple:
+        fetched_at = record.get("fetched_at", "")
+        return (
+            url_hash,
+            record.get("title", ""),
+            record.get("url", ""),
+            record.get("source", ""),
+            fetched_at,
+            _parse_ts(fetched_at),
+            record.get("content_hash", ""),
+            record.get("minhash", ""),
+        )
+
+    @staticmethod
+    def _band_rows(rows) -> list[tuple]:
+        return [(band, value, row[0])
+                for row in rows if row[7]
+                for band, value in band_keys(decode_signature(row[7]))]
+
+    def contains(self, url_hash: str) -> bool:
+        with self._lock:
+            if url_hash in self._pending:
+                return True
+            cur = self.conn.execute(
+                "SELECT 1 FROM articles WHERE url_hash = ?", (url_hash,)
+            )
+            return cur.fetchone() is not None
+
+    def add(self, url_hash: str, record: dict):
+        with self._lock:
+            self._pending[url_hash] = self._row(url_hash, record)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def add_many(self, items):
+        """批量写入 (url_hash, record) 序列，用于迁移"""
+        with self._lock:
+            self._insert_locked([self._row(h, r) for h, r in items])
+
+    def _insert_locked(self, rows: list[tuple]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO minhash_bands VALUES (?, ?, ?)", self._band_rows(rows)
+        )
+        self.conn.commit()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        self._insert_locked(list(self._pending.values()))
+        self._pending.clear()
+
+    def find_similar(self, signature: list[int], threshold: float, exclude: set[str] = frozenset()) -> list[str]:
+        """
+        返回MinHash相似度 ≥ threshold 的历史文章URL哈希。
+        先按LSH分段索引取候选，再用签名估算相似度，不扫描全表。
+        """
+        with self._lock:
+            self._flush_locked()
+            candidates = {}
+            for band, value in band_keys(signature):
+                for url_hash, encoded in self.conn.execute(
+                    "SELECT b.url_hash, a.minhash FROM minhash_bands b "
+                    "JOIN articles a ON a.url_hash = b.url_hash "
+                    "WHERE b.band = ? AND b.value = ?", (band, value)
+                ):
+                    candidates[url_hash] = encoded
+        return [h for h, encoded in candidates.items()
+                if h not in exclude and similarity(signature, decode_signature(encoded)) >= threshold]
+
+    def get_meta(self, key: str, default: str = "") -> str:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+            self.conn.commit()
+
+    def get_last_run(self) -> str:
+        return self.get_meta("last_run")
+
+    def set_last_run(self, value: str):
+        self.set_meta("last_run", value)
+
+    def count(self) -> int:
+        with self._lock:
+            self._flush_locked()
+            return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def prune(self, ttl_days: int) -> int:
+        """删除 fetched_at 早于 ttl_days 天的记录，返回删除条数"""
+        cutoff = time.time() - ttl_days * 86400
+        with self._lock:
+            self._flush_locked()
+            self.conn.execute(
+                "DELETE FROM minhash_bands WHERE url_hash IN "
+                "(SELECT url_hash FROM articles WHERE fetched_ts < ?)", (cutoff,)
+            )
+            cur = self.conn.execute("DELETE FROM articles WHERE fetched_ts < ?", (cutoff,))
+            self.conn.commit()
+            return cur.rowcount
+
+    def save(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        self.save()
+        with self._lock:
+            self.conn.close()
+
+
+# ============================================================
+# 工厂 + 迁移
+# ============================================================
+
+def migrate_json_to_sqlite(json_path: Path, store: SqliteHistoryStore) -> int:
+    """把 history.json 的全部记录导入 SQLite，返回导入条数"""
+    legacy = JsonHistoryStore(json_path)
+    articles = legacy.data["articles"]
+    store.add_many(articles.items())
+    if legacy.get_last_run() and not store.get_last_run():
+        store.set_last_run(legacy.get_last_run())
+    store.set_meta("migrated_from_json", datetime.now(BJT).isoformat())
+    return len(articles)
+
+
+def open_history_store(backend: str = "sqlite", json_path: Path = HISTORY_FILE,
+                       db_path: Path = HISTORY_DB):
+    """
+    按配置打开历史存储。
+    SQLite 后端首次打开时，若存在 history.json 则自动迁移一次（原文件保留不动）。
+    """
+    if backend == "json":
+        return JsonHistoryStore(json_path)
+    if backend != "sqlite":
+        raise ValueError(f"未知的历史存储后端: {backend}")
+
+    store = SqliteHistoryStore(db_path)
+    if json_path.exists() and not store.get_meta("migrated_from_json"):
+        migrate_json_to_sqlite(json_path, store)
+    return store
+
+
+# ============================================================
+# 基准测试：JSON vs SQLite
+# ============================================================
+
+def _fake_records(n: int):
+    now = datetime.now(BJT)
+    for i in range(n):
+        url = f"https://www.example.gov.cn/art/{i:08d}.html"
+        yield hashlib.md5(url.encode("utf-8")).hexdigest(), {
+            "title": f"关于进一步做好汽车出口相关工作的通知（第{i}号）",
+            "url": url,
+            "source": "商务部-公告列表",
+            "fetched_at": (now - timedelta(minutes=i)).isoformat(),
+            "content_hash": hashlib.md5(str(i).encode()).hexdigest(),
+        }
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def benchmark(sizes: list[int], lookups: int = 10000, new_per_run: int = 50):
+    """
+    模拟一次监控运行的三个阶段：
+    - load:   打开历史存储
+    - lookup: lookups 次增量检测（一半命中一半未命中）
+    - save:   新增 new_per_run 条记录并落盘
+    """
+    print(f"{'entries':>10} {'backend':>8} {'load(s)':>10} {'lookup(s)':>10} {'save(s)':>10} {'size(MB)':>10}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = Path(tmp) / "history.json"
+            db_path = Path(tmp) / "history.db"
+
+            records = dict(_fake_records(n))
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump({"articles": records}, f, ensure_ascii=False, indent=2)
+            seed = SqliteHistoryStore(db_path)
+            seed.add_many(records.items())
+            seed.close()
+
+            keys = list(records)
+            probes = [random.choice(keys) if i % 2 else f"missing-{i}" for i in range(lookups)]
+            fresh = list(_fake_records(n + new_per_run))[n:]
+            del records, keys
+
+            for backend, path in (("json", json_path), ("sqlite", db_path)):
+                holder = {}
+                load = _timed(lambda: holder.setdefault("store", open_history_store(
+                    backend, json_path if backend == "json" else Path(tmp) / "none.json", db_path)))
+                store = holder["store"]
+                lookup = _timed(lambda: [store.contains(h) for h in probes])
+
+                def _save():
+                    for h, r in fresh:
+                        store.add(h, r)
+                    store.save()
+
+                save = _timed(_save)
+                store.close()
+                size_mb = os.path.getsize(path) / 1024 / 1024
+                print(f"{n:>10} {backend:>8} {load:>10.3f} {lookup:>10.3f} {save:>10.3f} {size_mb:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="已抓取文章历史存储工具")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="查看历史记录条数")
+    sub.add_parser("migrate", help="从 history.json 迁移到 history.db")
+    prune = sub.add_parser("prune", help="清理过期记录")
+    prune.add_argument("--days", type=int, required=True, help="保留最近N天的记录")
+    bench = sub.add_parser("bench", help="JSON vs SQLite 性能对比")
+    bench.add_argument("--sizes", default="10000,100000,1000000", help="记录条数，逗号分隔")
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        benchmark([int(x) for x in args.sizes.split(",")])
+        return
+
+    if args.command == "migrate":
+        if not HISTORY_FILE.exists():
+            print(f"❌ 未找到 {HISTORY_FILE}")
+            sys.exit(1)
+        store = SqliteHistoryStore(HISTORY_DB)
+        n = migrate_json_to_sqlite(HISTORY_FILE, store)
+        store.close()
+        print(f"✅ 已迁移 {n} 条记录到 {HISTORY_DB}")
+        return
+
+    store = open_history_store("sqlite")
+    if args.command == "prune":
+        print(f"🧹 已清理 {store.prune(args.days)} 条记录")
+    print(f"📚 历史记录: {store.count()} 条，上次运行: {store.get_last_run() or '—'}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+关键词多模式匹配 (Keyword Matcher)
+=================================
+基于 Aho-Corasick 自动机：所有关键词一次性编译，
+之后每段文本只需扫描一遍即可找出全部命中的关键词，
+耗时与文本长度成正比，与关键词数量无关。
+"""
+
+from collections import deque
+
+
+class KeywordMatcher:
+    """
+    带权重的关键词匹配器（不区分大小写）。
+    weights: {关键词: 权重}，同一关键词重复出现只计一次分。
+    """
+
+    def __init__(self, weights: dict[str, float]):
+        self.weights: dict[str, float] = {}
+        for keyword, weight in weights.items():
+            kw = keyword.lower()
+            if kw:
+                self.weights[kw] = max(weight, self.weights.get(kw, 0.0))
+
+        # goto[state] = {字符: 下一状态}；output[state] = 在该状态结束的关键词
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[str]] = [[]]
+        for kw in self.weights:
+            self._insert(kw)
+        self._build_failure_links()
+
+    def _insert(self, keyword: str):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append(keyword)
+
+    def _build_failure_links(self):
+        # 广度优先：第一层的失败指针都指向根，更深的节点沿父节点的失败链查找
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def _iter_matches(self, text: str):
+        """逐个产出命中的关键词（同一关键词出现几次就产出几次）"""
+        state = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for ch in text.lower():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            yield from output[state]
+
+    def find(self, text: str) -> set[str]:
+        """返回文本中命中的全部关键词（小写）"""
+        return set(self._iter_matches(text))
+
+    def score(self, text: str) -> tuple[float, list[str]]:
+        """返回 (加权得分, 命中关键词按权重降序)"""
+        matched = sorted(self.find(text), key=lambda kw: (-self.weights[kw], kw))
+        return sum(self.weights[kw] for kw in matched), matched
+
+    def hits(self, text: str) -> float:
+        """加权命中次数（重复出现累计），用于衡量关键词密度"""
+        return sum(self.weights[kw] for kw in self._iter_matches(text))
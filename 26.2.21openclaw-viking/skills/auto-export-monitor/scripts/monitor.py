@@ -9,21 +9,41 @@ Usage:
     python3 monitor.py              # 完整运行：爬取 + AI分析
     python3 monitor.py --fetch-only # 仅爬取，不调用AI分析
     python3 monitor.py --test       # 测试模式：只爬第一个源的前3篇
+    python3 monitor.py --concurrency 8  # 爬取并发数（按域名限流）
+    python3 monitor.py --no-http-cache  # 忽略列表页缓存，强制重新解析
+    python3 monitor.py --llm-concurrency 2  # AI分析并发数（受RPM/TPM限流）
+    python3 monitor.py --daemon     # 守护模式：常驻运行，按 update_freq/priority 轮询
+    python3 monitor.py --prometheus /var/lib/node_exporter/auto_export.prom  # 额外输出 Prometheus 指标
 """
 
 import os
+import re
 import sys
 import json
 import time
+import sqlite3
 import hashlib
+import unicodedata
 import random
+import signal
 import argparse
 import logging
+import threading
+import queue
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+
+from history_store import open_history_store
+from report_store import ReportStore
+from near_dup import article_signature, NearDupClusterer
+from keyword_matcher import KeywordMatcher
 
 # ============================================================
 # 配置和初始化
@@ -32,7 +52,13 @@ from bs4 import BeautifulSoup
 SCRIPT_DIR = Path(__file__).parent
 SOURCES_FILE = SCRIPT_DIR / "sources.json"
 HISTORY_FILE = SCRIPT_DIR / "history.json"
+HISTORY_DB = SCRIPT_DIR / "history.db"
+ANALYSIS_CACHE_DB = SCRIPT_DIR / "analysis_cache.db"
+HTTP_CACHE_FILE = SCRIPT_DIR / "http_cache.json"
+EXTRACTION_PROFILES_FILE = SCRIPT_DIR / "extraction_profiles.json"
 OUTPUT_DIR = SCRIPT_DIR / "output"
+REPORT_STORE_DIR = OUTPUT_DIR / "store"
+METRICS_DIR = OUTPUT_DIR / "metrics"
 
 # 日志
 logging.basicConfig(
@@ -66,19 +92,303 @@ def content_hash(text: str) -> str:
     return hashlib.md5(text.encode("utf-8")).hexdigest()
 
 
+def normalized_content_hash(text: str) -> str:
+    """
+    归一化后的正文哈希：全半角统一(NFKC)、转小写、去掉所有空白。
+    同一通知在不同网站转载时排版不同，归一化后哈希一致。
+    """
+    normalized = re.sub(r"\s+", "", unicodedata.normalize("NFKC", text).lower())
+    return content_hash(normalized)
+
+
 # ============================================================
 # 爬虫模块
 # ============================================================
 
+def resolve_html_parser(name: str = "auto") -> str:
+    """
+    选择 BeautifulSoup 解析后端：
+    - auto: 安装了 lxml 就用 lxml（比 html.parser 快数倍），否则回退 html.parser
+    - lxml / html.parser: 指定后端，lxml 未安装时回退并告警
+    """
+    if name in ("auto", "lxml"):
+        try:
+            import lxml  # noqa: F401
+            return "lxml"
+        except ImportError:
+            if name == "lxml":
+                log.warning("lxml 未安装，回退到 html.parser")
+    return "html.parser"
+
+
+def selector_strainer(selector: str) -> SoupStrainer | None:
+    """
+    把 "tag" / "tag.class" / "tag#id" 形式的选择器转成 SoupStrainer，
+    只解析该容器子树，不必为取一个容器构建整棵DOM树。其他形式返回None。
+    """
+    match = re.fullmatch(r"([a-zA-Z][\w-]*)(?:([.#])([\w-]+))?", selector)
+    if not match:
+        return None
+    tag, kind, value = match.groups()
+    if kind == ".":
+        return SoupStrainer(tag, class_=value)
+    if kind == "#":
+        return SoupStrainer(tag, id=value)
+    return SoupStrainer(tag)
+
+
+def stats_delta(current: dict[str, dict], before: dict[str, dict]) -> dict[str, dict]:
+    """
+    两次快照之间的增量：{key: {计数名: 数值}} 逐项相减，本轮没有变化的 key 不保留。
+    用于把进程级累计的限流/解析统计换算成单轮的值（守护模式下对象跨轮复用）。
+    """
+    delta = {}
+    for key, stat in current.items():
+        prev = before.get(key, {})
+        diff = {name: value - prev.get(name, 0) for name, value in stat.items()}
+        if any(diff.values()):
+            delta[key] = diff
+    return delta
+
+
+class HostThrottle:
+    """
+    按域名限流：每个 netloc 独立的并发上限 + 最小请求间隔。
+    不同域名之间互不等待，替代原来全局的随机 sleep。
+    NewsFetcher 的调度器先用 ready_in/reserve 预约时间点再提交任务，
+    工作线程进入 acquire 时无需再排队等待。
+    """
+
+    def __init__(self, per_host_concurrency: int, delay_min: float, delay_max: float):
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.delay_min = delay_min
+        self.delay_max = delay_max
+        self._lock = threading.Lock()
+        self._slots: dict[str, threading.Semaphore] = {}
+        self._next_at: dict[str, float] = {}
+        self._reserved = threading.local()
+        self.stats: dict[str, dict] = {}
+
+    def _slot(self, host: str) -> threading.Semaphore:
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.Semaphore(self.per_host_concurrency)
+                self.stats[host] = {"requests": 0, "request_seconds": 0.0, "wait_seconds": 0.0}
+            return self._slots[host]
+
+    def snapshot(self) -> dict[str, dict]:
+        """当前累计统计的副本"""
+        with self._lock:
+            return {host: dict(stat) for host, stat in self.stats.items()}
+
+    def ready_in(self, host: str) -> float:
+        """距离该域名下一个可用时间点还有多少秒（0 表示现在即可请求）"""
+        with self._lock:
+            return max(0.0, self._next_at.get(host, 0.0) - time.monotonic())
+
+    def reserve(self, host: str) -> float:
+        """预约该域名下一个可用时间点（随机间隔，保持与原 _delay 相同的礼貌程度），返回该时间点"""
+        with self._lock:
+            start_at = max(time.monotonic(), self._next_at.get(host, 0.0))
+            self._next_at[host] = start_at + random.uniform(self.delay_min, self.delay_max)
+            return start_at
+
+    def run_reserved(self, start_at: float, fn, *args):
+        """在工作线程中执行 fn，其中第一次 acquire 使用调度方已预约的时间点"""
+        self._reserved.start_at = start_at
+        try:
+            return fn(*args)
+        finally:
+            self._reserved.start_at = None
+
+    @contextmanager
+    def acquire(self, url: str):
+        """占用目标域名的一个请求名额，必要时等待到最小间隔"""
+        host = urlparse(url).netloc
+        slot = self._slot(host)
+        slot.acquire()
+        try:
+            start_at = getattr(self._reserved, "start_at", None)
+            self._reserved.start_at = None
+            if start_at is None:
+                start_at = self.reserve(host)
+            wait = start_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+
+            started = time.monotonic()
+            try:
+                yield host
+            finally:
+                with self._lock:
+                    stat = self.stats[host]
+                    stat["requests"] += 1
+                    stat["request_seconds"] += time.monotonic() - started
+                    stat["wait_seconds"] += max(wait, 0.0)
+        finally:
+            slot.release()
+
+
+class HttpCache:
+    """
+    列表页条件请求缓存：按URL保存 ETag / Last-Modified 和正文哈希。
+    - 请求时带上 If-None-Match / If-Modified-Since
+    - 服务端返回304，或正文哈希与上次相同，即视为列表页未变化
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: dict = load_json(path)
+        self.hits = {"not_modified": 0, "same_body": 0}
+        self._lock = threading.Lock()
+
+    def conditional_headers(self, url: str) -> dict:
+        """根据上次的校验信息构造条件请求头"""
+        entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.hits)
+
+    def record_not_modified(self, url: str):
+        with self._lock:
+            self.hits["not_modified"] += 1
+
+    def update(self, url: str, etag: str | None, last_modified: str | None, body_hash: str) -> bool:
+        """保存新的校验信息，返回正文是否与上次相同"""
+        with self._lock:
+            unchanged = self.entries.get(url, {}).get("body_hash") == body_hash
+            if unchanged:
+                self.hits["same_body"] += 1
+            self.entries[url] = {
+                "etag": etag or "",
+                "last_modified": last_modified or "",
+                "body_hash": body_hash,
+                "checked_at": datetime.now(BJT).isoformat(),
+            }
+            return unchanged
+
+    def forget(self, url: str):
+        """删除缓存条目，下次强制完整抓取"""
+        with self._lock:
+            self.entries.pop(url, None)
+
+    def save(self):
+        with self._lock:
+            save_json(self.path, self.entries)
+
+
+class ExtractionProfiles:
+    """
+    每个源的提取档案：记住列表页/详情页上次命中的容器选择器，
+    下次优先尝试，未命中才回退到全量探测。
+    同时累计每个源的解析耗时，用于对比学习前后的解析成本。
+    path 为 None 时只在内存中学习，不落盘。
+    """
+
+    def __init__(self, path: Path | None):
+        self.path = path
+        self.profiles: dict = load_json(path) if path else {}
+        self.parse_stats: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def preferred(self, source_id: str, kind: str) -> str | None:
+        """kind: "list" 或 "detail" """
+        return self.profiles.get(source_id, {}).get(f"{kind}_selector")
+
+    def learn(self, source_id: str, kind: str, selector: str):
+        with self._lock:
+            profile = self.profiles.setdefault(source_id, {})
+            profile[f"{kind}_selector"] = selector
+            profile["updated_at"] = datetime.now(BJT).isoformat()
+
+    def snapshot(self) -> dict[str, dict]:
+        """当前累计解析统计的副本"""
+        with self._lock:
+            return {source_id: dict(stat) for source_id, stat in self.parse_stats.items()}
+
+    def record(self, source_id: str, kind: str, seconds: float, learned_hit: bool):
+        """记录一次解析：耗时、是否直接命中已学习的选择器"""
+        with self._lock:
+            stat = self.parse_stats.setdefault(source_id, {
+                "list_pages": 0, "list_seconds": 0.0,
+                "detail_pages": 0, "detail_seconds": 0.0,
+                "learned_hits": 0,
+            })
+            stat[f"{kind}_pages"] += 1
+            stat[f"{kind}_seconds"] += seconds
+            if learned_hit:
+                stat["learned_hits"] += 1
+
+    def save(self):
+        if self.path:
+            with self._lock:
+                save_json(self.path, self.profiles)
+
+
 class NewsFetcher:
     """新闻爬取器：支持多源爬取、关键词过滤、增量检测"""
 
-    def __init__(self, config: dict, history: dict):
+    # 列表页：常见的新闻列表容器
+    LIST_SELECTORS = [
+        "div.news-list", "div.list", "ul.news_list", "div.content-list",
+        "div.main-content", "div.article-list", "div.news",
+        "div.list-content", "div.right-content", "div.con_list",
+        "ul.list", "div.newsList", "div.news_con",
+        "table.list", "div#list", "div.mod-list",
+    ]
+
+    # 详情页：常见的正文容器
+    DETAIL_SELECTORS = [
+        "div.article-content", "div.content", "div.TRS_Editor",
+        "div.article", "div.detail-content", "div.news-content",
+        "div.main-text", "div.text", "div.con_text", "div.artical",
+        "article", "div#content", "div.pages_content",
+        "div.Custom_UniformBlock", "div.article-body",
+    ]
+
+    def __init__(self, config: dict, history, concurrency: int | None = None,
+                 http_cache: HttpCache | None = None, profiles: ExtractionProfiles | None = None):
         self.sources = config["sources"]
         self.filter_keywords = config["filter_keywords"]
         self.settings = config["settings"]
         self.history = history
+        # 每个源一个关键词自动机，启动时编译一次
+        self.matchers = {
+            source["id"]: self._build_matcher(source, config.get("keyword_weights", {}))
+            for source in self.sources
+        }
+        self.http_cache = http_cache
+        self.profiles = profiles or ExtractionProfiles(None)
+        self.html_parser = resolve_html_parser(self.settings.get("html_parser", "auto"))
+        self.concurrency = max(1, concurrency or self.settings.get("concurrency", 4))
+        self.throttle = HostThrottle(
+            self.settings.get("per_host_concurrency", 1),
+            self.settings["request_delay_min"],
+            self.settings["request_delay_max"],
+        )
+        self.timings: dict = {}
+        self.last_new_counts: dict[str, int] = {}
+        # 本轮运行指标（每次 iter_articles 开始时清零），汇总见 build_run_metrics
+        self.source_metrics: dict[str, dict] = {}
+        self.http_status: dict[str, int] = {}
+        self.detail_seconds: dict[str, float] = {}
+        self._metrics_lock = threading.Lock()
+        self._current = threading.local()  # 当前线程正在处理的源，用于把请求归到源上
+
         self.session = requests.Session()
+        # 连接池大小与并发数保持一致，避免线程间抢连接
+        adapter = HTTPAdapter(
+            pool_connections=self.concurrency, pool_maxsize=self.concurrency
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def _get_headers(self) -> dict:
         """随机User-Agent"""
@@ -91,32 +401,134 @@ class NewsFetcher:
             "Connection": "keep-alive",
         }
 
-    def _delay(self):
-        """随机延迟，避免被封"""
-        delay = random.uniform(
-            self.settings["request_delay_min"],
-            self.settings["request_delay_max"]
-        )
-        time.sleep(delay)
-
-    def _fetch_page(self, url: str, encoding: str = "utf-8") -> str | None:
-        """获取单个页面HTML"""
+    def _request(self, url: str, extra_headers: dict | None = None) -> requests.Response | None:
+        """发送GET请求（受按域名限流约束），网络异常时返回None"""
+        headers = self._get_headers()
+        if extra_headers:
+            headers.update(extra_headers)
+        resp = None
+        started = time.monotonic()
         try:
-            resp = self.session.get(
-                url,
-                headers=self._get_headers(),
-                timeout=self.settings["request_timeout"],
-                verify=False  # 部分政府网站SSL证书有问题
-            )
-            resp.encoding = encoding
-            if resp.status_code == 200:
-                return resp.text
-            else:
-                log.warning(f"HTTP {resp.status_code}: {url}")
-                return None
+            with self.throttle.acquire(url):
+                started = time.monotonic()  # 不计限流等待
+                resp = self.session.get(
+                    url,
+                    headers=headers,
+                    timeout=self.settings["request_timeout"],
+                    verify=False  # 部分政府网站SSL证书有问题
+                )
+                return resp
         except requests.RequestException as e:
             log.error(f"请求失败 {url}: {e}")
             return None
+        finally:
+            self._record_request(
+                str(resp.status_code) if resp is not None else "error",
+                len(resp.content) if resp is not None else 0,
+                time.monotonic() - started,
+            )
+
+    def _source_metric(self, source_id: str) -> dict:
+        """取某个源的本轮指标（调用方持有 _metrics_lock）"""
+        return self.source_metrics.setdefault(source_id, {
+            "requests": 0, "bytes": 0, "request_seconds": 0.0,
+            "list_seconds": 0.0, "list_unchanged": False,
+            "found": 0, "relevant": 0, "new": 0,
+            "detail_pages": 0, "detail_seconds": 0.0,
+        })
+
+    def _record_request(self, status: str, nbytes: int, seconds: float):
+        source_id = getattr(self._current, "source_id", "")
+        with self._metrics_lock:
+            self.http_status[status] = self.http_status.get(status, 0) + 1
+            m = self._source_metric(source_id)
+            m["requests"] += 1
+            m["bytes"] += nbytes
+            m["request_seconds"] += seconds
+
+    def _fetch_page(self, url: str, encoding: str = "utf-8") -> str | None:
+        """获取单个页面HTML"""
+        resp = self._request(url)
+        if resp is None:
+            return None
+        resp.encoding = encoding
+        if resp.status_code == 200:
+            return resp.text
+        log.warning(f"HTTP {resp.status_code}: {url}")
+        return None
+
+    def _fetch_list_page(self, url: str, encoding: str = "utf-8") -> tuple[str | None, bool]:
+        """
+        获取列表页HTML，启用HTTP缓存时发送条件请求。
+        返回 (html, unchanged)：unchanged=True 表示列表页与上次相同，无需解析。
+        """
+        if not self.http_cache:
+            return self._fetch_page(url, encoding), False
+
+        resp = self._request(url, self.http_cache.conditional_headers(url))
+        if resp is None:
+            return None, False
+        if resp.status_code == 304:
+            self.http_cache.record_not_modified(url)
+            return None, True
+        if resp.status_code != 200:
+            log.warning(f"HTTP {resp.status_code}: {url}")
+            return None, False
+
+        resp.encoding = encoding
+        html = resp.text
+        unchanged = self.http_cache.update(
+            url,
+            resp.headers.get("ETag"),
+            resp.headers.get("Last-Modified"),
+            content_hash(html),
+        )
+        return (None, True) if unchanged else (html, False)
+
+    def _make_soup(self, html: str, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+        return BeautifulSoup(html, self.html_parser, parse_only=parse_only)
+
+    def _select_learned(self, html: str, source_id: str, kind: str, selectors: list[str],
+                        accept, prepare=None, noise_tags: tuple = ()):
+        """
+        按提取档案选择容器：先试该源上次命中的选择器，未命中再依次探测。
+        已学习的选择器能转成 SoupStrainer 时只解析该容器子树；
+        命中失败才构建完整DOM树做全量探测。
+        accept(element) 返回可用结果或假值；prepare(soup) 在选择前清理DOM。
+        noise_tags 是 prepare 会整体删除的容器：子树解析看不到祖先，
+        若这些容器内也能匹配到该选择器（完整解析时会被删掉），改走完整解析，保证结果一致。
+        返回 (结果, 是否命中已学习的选择器, 完整soup或None)。
+        """
+        learned = self.profiles.preferred(source_id, kind)
+        strainer = selector_strainer(learned) if learned else None
+        if strainer and noise_tags:
+            noise = self._make_soup(html, SoupStrainer(list(noise_tags)))
+            if noise.select_one(learned):
+                strainer = None
+        if strainer:
+            partial = self._make_soup(html, strainer)
+            if prepare:
+                prepare(partial)
+            result = accept(partial.select_one(learned))
+            if result:
+                return result, True, None
+
+        soup = self._make_soup(html)
+        if prepare:
+            prepare(soup)
+        if learned and not strainer:
+            result = accept(soup.select_one(learned))
+            if result:
+                return result, True, soup
+
+        for selector in selectors:
+            if selector == learned:
+                continue
+            result = accept(soup.select_one(selector))
+            if result:
+                self.profiles.learn(source_id, kind, selector)
+                return result, False, soup
+        return None, False, soup
 
     def _extract_articles_generic(self, html: str, base_url: str, source: dict) -> list[dict]:
         """
@@ -124,27 +536,17 @@ class NewsFetcher:
         从列表页HTML中提取文章标题和链接。
         采用多种策略匹配不同网站的页面结构。
         """
-        soup = BeautifulSoup(html, "html.parser")
+        started = time.perf_counter()
         articles = []
         seen_urls = set()
 
         # 策略1: 查找常见的新闻列表结构
         # 大多数政府/机构网站使用 <li><a> 或 <div><a> 结构
-        link_candidates = []
-
-        # 优先查找新闻列表区域内的链接
-        for container_selector in [
-            "div.news-list", "div.list", "ul.news_list", "div.content-list",
-            "div.main-content", "div.article-list", "div.news",
-            "div.list-content", "div.right-content", "div.con_list",
-            "ul.list", "div.newsList", "div.news_con",
-            "table.list", "div#list", "div.mod-list",
-        ]:
-            container = soup.select_one(container_selector)
-            if container:
-                link_candidates = container.find_all("a", href=True)
-                if link_candidates:
-                    break
+        # 优先查找新闻列表区域内的链接（该源学到的容器优先）
+        link_candidates, learned_hit, soup = self._select_learned(
+            html, source["id"], "list", self.LIST_SELECTORS,
+            lambda el: el.find_all("a", href=True) if el else None,
+        )
 
         # 如果没找到容器，回退到全页面搜索
         if not link_candidates:
@@ -177,7 +579,6 @@ class NewsFetcher:
             elif href.startswith("//"):
                 full_url = "https:" + href
             elif href.startswith("/"):
-                from urllib.parse import urlparse
                 parsed = urlparse(base_url)
                 full_url = f"{parsed.scheme}://{parsed.netloc}{href}"
             else:
@@ -197,77 +598,87 @@ class NewsFetcher:
                 "fetch_time": datetime.now(BJT).isoformat(),
             })
 
+        self.profiles.record(source["id"], "list", time.perf_counter() - started, learned_hit)
         return articles[:self.settings["max_articles_per_source"]]
 
+    def _build_matcher(self, source: dict, keyword_weights: dict) -> KeywordMatcher:
+        """
+        源专属关键词 + 通用关键词合并成一个自动机。
+        权重：keyword_weights 中指定的优先，其次源专属关键词 boost_keyword_weight，通用关键词 1。
+        """
+        boost = self.settings.get("boost_keyword_weight", 2)
+        weights = {kw: keyword_weights.get(kw, 1) for kw in self.filter_keywords}
+        for kw in source.get("keywords_boost", []):
+            weights[kw] = max(weights.get(kw, 1), keyword_weights.get(kw, boost))
+        return KeywordMatcher(weights)
+
     def _is_relevant(self, article: dict, source: dict) -> bool:
         """
         关键词过滤：判断文章是否与汽车出口相关。
         - auto_relevant=true 的源：天然相关（如汽车流通协会），所有文章都保留
-        - 其他源：使用两级过滤（源专属关键词 + 通用关键词）
+        - 其他源：源专属关键词或通用关键词命中至少一个
+        命中的关键词和加权得分写入 article["matched_keywords"] / article["relevance_score"]，
+        报告中同一风险等级内按得分排序。
         """
-        # 天然相关的源，所有文章都视为相关
-        if source.get("auto_relevant", False):
-            return True
+        matcher = self.matchers.get(source["id"]) or self._build_matcher(source, {})
+        score, matched = matcher.score(article["title"])
+        article["relevance_score"] = score
+        article["matched_keywords"] = matched
 
-        text = article["title"].lower()
-
-        # 源专属关键词（优先级高，命中一个即可）
-        for kw in source.get("keywords_boost", []):
-            if kw.lower() in text:
-                return True
-
-        # 通用关键词（需要命中至少一个）
-        for kw in self.filter_keywords:
-            if kw.lower() in text:
-                return True
-
-        return False
+        # 天然相关的源，所有文章都视为相关
+        return source.get("auto_relevant", False) or bool(matched)
 
     def _is_new(self, article: dict) -> bool:
         """增量检测：通过URL哈希判断是否已抓取过"""
-        url_hash = content_hash(article["url"])
-        return url_hash not in self.history.get("articles", {})
+        return not self.history.contains(content_hash(article["url"]))
 
     def _mark_fetched(self, article: dict, detail_text: str = ""):
         """标记文章为已抓取"""
         url_hash = content_hash(article["url"])
-        if "articles" not in self.history:
-            self.history["articles"] = {}
-        self.history["articles"][url_hash] = {
+        article["content_hash"] = normalized_content_hash(detail_text) if detail_text else ""
+        article_signature(article)  # 写入 article["minhash"]，供近似去重索引
+        self.history.add(url_hash, {
             "title": article["title"],
             "url": article["url"],
             "source": article["source_name"],
             "fetched_at": datetime.now(BJT).isoformat(),
-            "content_hash": content_hash(detail_text) if detail_text else "",
-        }
+            "content_hash": article["content_hash"],
+            "minhash": article["minhash"],
+        })
 
-    def _fetch_detail(self, url: str, encoding: str = "utf-8") -> str:
+    def _fetch_detail(self, url: str, encoding: str = "utf-8", source_id: str = "") -> str:
         """获取文章详情页正文"""
         html = self._fetch_page(url, encoding)
         if not html:
             return ""
 
-        soup = BeautifulSoup(html, "html.parser")
+        started = time.perf_counter()
+        text, learned_hit = self._parse_detail(html, source_id)
+        self.profiles.record(source_id, "detail", time.perf_counter() - started, learned_hit)
+        return text
 
-        # 移除script和style
-        for tag in soup(["script", "style", "nav", "header", "footer"]):
-            tag.decompose()
+    def _parse_detail(self, html: str, source_id: str) -> tuple[str, bool]:
+        """从详情页HTML提取正文，返回 (正文, 是否命中已学习的选择器)"""
+        def strip_noise(soup):
+            # 移除script和style
+            for tag in soup(["script", "style", "nav", "header", "footer"]):
+                tag.decompose()
 
-        # 尝试多种正文容器选择器
-        content_selectors = [
-            "div.article-content", "div.content", "div.TRS_Editor",
-            "div.article", "div.detail-content", "div.news-content",
-            "div.main-text", "div.text", "div.con_text", "div.artical",
-            "article", "div#content", "div.pages_content",
-            "div.Custom_UniformBlock", "div.article-body",
-        ]
+        def accept(content_div):
+            if not content_div:
+                return None
+            text = content_div.get_text(separator="\n", strip=True)
+            return text if len(text) > 100 else None  # 正文至少100字
 
-        for selector in content_selectors:
-            content_div = soup.select_one(selector)
-            if content_div:
-                text = content_div.get_text(separator="\n", strip=True)
-                if len(text) > 100:  # 正文至少100字
-                    return text[:5000]  # 限制长度，节省API调用成本
+        # 尝试多种正文容器选择器（该源学到的容器优先）
+        text, learned_hit, soup = self._select_learned(
+            html, source_id, "detail", self.DETAIL_SELECTORS, accept, strip_noise,
+            noise_tags=("nav", "header", "footer"),
+        )
+        # 只做宽松的长度上限，送入大模型前由 condense_content 按token预算压缩
+        max_chars = self.settings.get("max_content_chars", 20000)
+        if text:
+            return text[:max_chars], learned_hit
 
         # 回退：取body全部文本
         body = soup.find("body")
@@ -275,83 +686,463 @@ class NewsFetcher:
             text = body.get_text(separator="\n", strip=True)
             # 取中间部分（跳过头尾导航）
             lines = [l.strip() for l in text.split("\n") if len(l.strip()) > 15]
-            return "\n".join(lines[:80])[:5000]
+            return "\n".join(lines[:80])[:max_chars], False
 
-        return ""
+        return "", False
 
-    def fetch_all(self, test_mode: bool = False) -> list[dict]:
+    def _scan_source(self, source: dict, test_mode: bool = False) -> list[dict]:
         """
-        主爬取流程：
-        1. 逐源爬取列表页
-        2. 关键词过滤
-        3. 增量检测
-        4. 爬取新文章详情页
+        爬取单个源的列表页，返回待抓取详情的新文章：
+        列表页 → 关键词过滤 → 增量检测（max_detail_fetch 在抓详情时按成功篇数控制）
         """
-        all_new_articles = []
-        sources = self.sources[:1] if test_mode else self.sources
-
-        for source in sources:
-            log.info(f"📡 正在爬取: {source['name']} ({source['url']})")
-
-            # 爬取列表页
-            html = self._fetch_page(source["url"], source.get("encoding", "utf-8"))
-            if not html:
-                log.warning(f"⚠️  跳过 {source['name']}：无法获取页面")
-                continue
-
-            # 提取文章列表
-            articles = self._extract_articles_generic(html, source["url"], source)
-            log.info(f"   找到 {len(articles)} 篇文章")
-
-            # 关键词过滤
-            relevant = [a for a in articles if self._is_relevant(a, source)]
-            log.info(f"   关键词匹配 {len(relevant)} 篇")
-
-            # 增量检测
-            new_articles = [a for a in relevant if self._is_new(a)]
-            log.info(f"   新增文章 {len(new_articles)} 篇")
-
-            if test_mode:
-                new_articles = new_articles[:3]
+        name = source["name"]
+        log.info(f"📡 正在爬取: {name} ({source['url']})")
+        self._current.source_id = source["id"]
+
+        # 爬取列表页（未变化时直接跳过解析）
+        started = time.monotonic()
+        html, unchanged = self._fetch_list_page(source["url"], source.get("encoding", "utf-8"))
+        with self._metrics_lock:
+            m = self._source_metric(source["id"])
+            m["list_seconds"] = time.monotonic() - started
+            m["list_unchanged"] = unchanged
+        if unchanged:
+            log.info(f"   [{name}] 列表页未变化，跳过解析")
+            return []
+        if not html:
+            log.warning(f"⚠️  跳过 {name}：无法获取页面")
+            return []
+
+        # 提取文章列表
+        articles = self._extract_articles_generic(html, source["url"], source)
+
+        # 关键词过滤
+        relevant = [a for a in articles if self._is_relevant(a, source)]
+
+        # 增量检测
+        new_articles = [a for a in relevant if self._is_new(a)]
+        log.info(f"   [{name}] 找到 {len(articles)} 篇 / 关键词匹配 {len(relevant)} 篇 / "
+                 f"新增 {len(new_articles)} 篇")
+        with self._metrics_lock:
+            m.update(found=len(articles), relevant=len(relevant), new=len(new_articles))
+
+        if test_mode:
+            new_articles = new_articles[:3]
+        return new_articles
+
+    def _fetch_article(self, article: dict, encoding: str) -> str:
+        """抓取单篇文章详情并计算近似去重签名（在线程池中执行），返回正文（失败为空串）"""
+        log.info(f"   📄 抓取详情: {article['title'][:40]}...")
+        self._current.source_id = article["source_id"]
+        started = time.monotonic()
+        text = self._fetch_detail(article["url"], encoding, article["source_id"])
+        elapsed = time.monotonic() - started
+        article["content"] = text or article["title"]  # 回退到标题
+        # MinHash 签名在工作线程中算好（写入 article["minhash"]），主线程去重时直接复用
+        article_signature(article)
+        with self._metrics_lock:
+            m = self._source_metric(article["source_id"])
+            m["detail_pages"] += 1
+            m["detail_seconds"] += elapsed
+            self.detail_seconds[article["url"]] = elapsed
+        return text
+
+    def _run_by_host(self, pool: ThreadPoolExecutor, tasks: list[tuple], budget: dict | None = None,
+                     leftover: set | None = None):
+        """
+        按域名调度任务：每个域名一个队列，只在该域名有空闲名额且已到最小间隔时才提交，
+        工作线程不会占着线程池名额等限流，其他域名的请求可以插空执行。
+        tasks: [(url, source_id, fn, args)]，同一域名内按顺序执行。
+        budget: {source_id: 成功上限}，结果为真视为成功；
+        在途任务数不超过剩余名额，失败的任务不占名额，达到上限后该源剩余任务不再提交，
+        其 source_id 记入 leftover。
+        按完成顺序逐个产出 (task, result)。
+        """
+        queues: dict[str, list] = {}
+        for task in tasks:
+            queues.setdefault(urlparse(task[0]).netloc, []).append(task)
+        running = {}
+        host_running: dict[str, int] = {}
+        in_flight: dict[str, int] = {}
+        remaining = dict(budget or {})
+
+        def next_task(queue: list):
+            for i, task in enumerate(queue):
+                source_id = task[1]
+                if source_id not in remaining or in_flight.get(source_id, 0) < remaining[source_id]:
+                    return queue.pop(i)
+            return None
 
-            # 爬取详情页
-            detail_count = 0
-            for article in new_articles:
-                if detail_count >= self.settings["max_detail_fetch"]:
+        while queues or running:
+            # 反复轮转各域名提交任务，直到线程池满或没有可立即提交的任务
+            dispatched = True
+            while dispatched:
+                dispatched = False
+                next_ready = None
+                for host in list(queues):
+                    queue = queues[host]
+                    # 已达成功上限的源不再抓取
+                    exhausted = {t[1] for t in queue if t[1] in remaining and remaining[t[1]] <= 0}
+                    if exhausted:
+                        if leftover is not None:
+                            leftover.update(exhausted)
+                        queue[:] = [t for t in queue if t[1] not in exhausted]
+                    if not queue:
+                        del queues[host]
+                        continue
+                    if len(running) >= self.concurrency:
+                        continue
+                    if host_running.get(host, 0) >= self.throttle.per_host_concurrency:
+                        continue
+                    delay = self.throttle.ready_in(host)
+                    if delay > 0:
+                        next_ready = delay if next_ready is None else min(next_ready, delay)
+                        continue
+                    task = next_task(queue)
+                    if task is None:
+                        continue
+                    _, source_id, fn, args = task
+                    start_at = self.throttle.reserve(host)
+                    running[pool.submit(self.throttle.run_reserved, start_at, fn, *args)] = (task, host)
+                    host_running[host] = host_running.get(host, 0) + 1
+                    in_flight[source_id] = in_flight.get(source_id, 0) + 1
+                    dispatched = True
+
+            if not running:
+                if next_ready is None:
                     break
+                time.sleep(next_ready)
+                continue
 
-                log.info(f"   📄 抓取详情: {article['title'][:40]}...")
-                self._delay()
-                detail_text = self._fetch_detail(article["url"], source.get("encoding", "utf-8"))
-
-                if detail_text:
-                    article["content"] = detail_text
-                    detail_count += 1
-                else:
-                    article["content"] = article["title"]  # 回退到标题
-
+            done, _ = wait(running, timeout=next_ready, return_when=FIRST_COMPLETED)
+            for future in done:
+                task, host = running.pop(future)
+                host_running[host] -= 1
+                in_flight[task[1]] -= 1
+                result = future.result()
+                if result and task[1] in remaining:
+                    remaining[task[1]] -= 1
+                yield task, result
+
+    def iter_articles(self, test_mode: bool = False, sources: list[dict] | None = None):
+        """
+        主爬取流程（并发，流式产出）：
+        1. 并发爬取所有源的列表页
+        2. 关键词过滤 + 增量检测
+        3. 并发爬取新文章详情页，每篇抓完立即 yield（按完成顺序）
+        同一域名的请求由 HostThrottle 控制并发和间隔，不同域名并行。
+        sources 为 None 时爬取全部源（守护模式下只传入到期的源）。
+        生成器耗尽后才更新历史记录、保存缓存并输出耗时统计。
+        """
+        fetched = 0
+        self.source_metrics, self.http_status, self.detail_seconds = {}, {}, {}
+        if sources is None:
+            sources = self.sources[:1] if test_mode else self.sources
+        started = time.monotonic()
+        # 限流/解析/缓存统计在进程内累计，记下起点，本轮只报告增量
+        hosts_before = self.throttle.snapshot()
+        parse_before = self.profiles.snapshot()
+        cache_before = self.http_cache.snapshot() if self.http_cache else {}
+        log.info(f"⚙️  并发数 {self.concurrency}，每域名并发 {self.throttle.per_host_concurrency}")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            # 阶段1：列表页
+            listings = {}
+            list_tasks = [(s["url"], s["id"], self._scan_source, (s, test_mode)) for s in sources]
+            for (_, source_id, _, _), candidates in self._run_by_host(pool, list_tasks):
+                listings[source_id] = candidates
+            list_done = time.monotonic()
+            self.last_new_counts = {s["id"]: len(listings.get(s["id"], [])) for s in sources}
+
+            # 阶段2：详情页（所有源的文章一起调度，按域名轮转提交）
+            # 每个源最多成功抓取 max_detail_fetch 篇，失败的不占名额
+            detail_tasks = [
+                (article["url"], source["id"], self._fetch_article,
+                 (article, source.get("encoding", "utf-8")))
+                for source in sources
+                for article in listings.get(source["id"], [])
+            ]
+            budget = {source["id"]: self.settings["max_detail_fetch"] for source in sources}
+            leftover = set()
+            for (_, _, _, (article, _)), detail_text in self._run_by_host(
+                    pool, detail_tasks, budget, leftover):
                 # 标记为已抓取
                 self._mark_fetched(article, detail_text)
-                all_new_articles.append(article)
-
-            self._delay()
+                fetched += 1
+                yield article
+
+        if self.http_cache:
+            # 本次处理不完，不能让下次因列表页未变化而漏掉剩余文章
+            for source in sources:
+                if source["id"] in leftover:
+                    self.http_cache.forget(source["url"])
+
+        finished = time.monotonic()
+        self.timings = {
+            "wall_seconds": round(finished - started, 3),
+            "list_seconds": round(list_done - started, 3),
+            "detail_seconds": round(finished - list_done, 3),
+            "hosts": {
+                host: {k: round(v, 3) if isinstance(v, float) else v for k, v in stat.items()}
+                for host, stat in stats_delta(self.throttle.snapshot(), hosts_before).items()
+            },
+            "parse": {
+                source_id: {k: round(v, 4) if isinstance(v, float) else v for k, v in stat.items()}
+                for source_id, stat in stats_delta(self.profiles.snapshot(), parse_before).items()
+            },
+            "http_cache": {
+                kind: count - cache_before.get(kind, 0)
+                for kind, count in self.http_cache.snapshot().items()
+            } if self.http_cache else None,
+        }
 
         # 更新历史记录
-        self.history["last_run"] = datetime.now(BJT).isoformat()
-        save_json(HISTORY_FILE, self.history)
-
-        log.info(f"\n✅ 爬取完成：共获取 {len(all_new_articles)} 篇新文章")
-        return all_new_articles
+        self.history.set_last_run(datetime.now(BJT).isoformat())
+        ttl_days = self.settings.get("history_ttl_days", 0)
+        if ttl_days:
+            pruned = self.history.prune(ttl_days)
+            if pruned:
+                log.info(f"🧹 清理 {pruned} 条超过 {ttl_days} 天的历史记录")
+        self.history.save()
+        if self.http_cache:
+            self.http_cache.save()
+        self.profiles.save()
+
+        log.info(f"\n✅ 爬取完成：共获取 {fetched} 篇新文章")
+        self._log_timings()
+
+    def fetch_all(self, test_mode: bool = False, sources: list[dict] | None = None) -> list[dict]:
+        """一次性爬取全部新文章，结果按 sources.json 中的源顺序返回"""
+        articles = list(self.iter_articles(test_mode, sources))
+        order = {s["id"]: i for i, s in enumerate(self.sources)}
+        return sorted(articles, key=lambda a: order.get(a["source_id"], len(order)))
+
+    def _log_timings(self):
+        """输出总耗时和各域名耗时"""
+        t = self.timings
+        log.info(f"⏱️  爬取总耗时 {t['wall_seconds']:.1f}s "
+                 f"(列表页 {t['list_seconds']:.1f}s + 详情页 {t['detail_seconds']:.1f}s)")
+        hosts = sorted(t["hosts"].items(), key=lambda kv: kv[1]["request_seconds"], reverse=True)
+        for host, stat in hosts:
+            log.info(f"   {host}: {stat['requests']} 次请求, "
+                     f"请求 {stat['request_seconds']:.1f}s, 限流等待 {stat['wait_seconds']:.1f}s")
+        for source_id, stat in t["parse"].items():
+            pages = stat["list_pages"] + stat["detail_pages"]
+            log.info(f"   解析 {source_id}: 列表页 {stat['list_seconds'] * 1000:.0f}ms / "
+                     f"详情页 {stat['detail_pages']} 篇 {stat['detail_seconds'] * 1000:.0f}ms，"
+                     f"已学习选择器命中 {stat['learned_hits']}/{pages}")
+        if t["http_cache"]:
+            hits = t["http_cache"]
+            log.info(f"🗂️  列表页缓存命中: 304 {hits['not_modified']} 次, 正文未变 {hits['same_body']} 次")
 
 
 # ============================================================
 # AI分析模块
 # ============================================================
 
+class RateLimiter:
+    """
+    令牌桶限流：同时限制每分钟请求数(RPM)和每分钟token数(TPM)。
+    任一桶不足时阻塞等待，0 表示该维度不限。
+    """
+
+    def __init__(self, requests_per_min: int, tokens_per_min: int):
+        self.rpm = requests_per_min
+        self.tpm = tokens_per_min
+        self._requests = float(requests_per_min)
+        self._tokens = float(tokens_per_min)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def acquire(self, tokens: int):
+        """预占一次请求和 tokens 个token"""
+        if self.tpm:
+            tokens = min(tokens, self.tpm)  # 超过桶容量的单次请求也要能发出去
+        while True:
+            with self._lock:
+                self._refill()
+                wait = 0.0
+                if self.rpm and self._requests < 1:
+                    wait = max(wait, (1 - self._requests) * 60 / self.rpm)
+                if self.tpm and self._tokens < tokens:
+                    wait = max(wait, (tokens - self._tokens) * 60 / self.tpm)
+                if wait <= 0:
+                    if self.rpm:
+                        self._requests -= 1
+                    if self.tpm:
+                        self._tokens -= tokens
+                    return
+            time.sleep(wait)
+
+    def settle(self, delta_tokens: int):
+        """按实际用量修正预占的token数（正数表示多用了）"""
+        if not self.tpm:
+            return
+        with self._lock:
+            self._tokens -= delta_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算token数：中文约1字1token，其他字符约4字符1token"""
+    cjk = sum(1 for ch in text if "\u4e00" <= ch <= "\u9fff")
+    return cjk + (len(text) - cjk) // 4 + 1
+
+
+# 详情页正文中的导航/页脚/分享等模板行
+BOILERPLATE_PATTERNS = re.compile(
+    r"^(首页|当前位置|您的位置|您现在的位置|位置[:：]|打印|关闭窗口|关闭本页|【?打印本页|分享到|"
+    r"字号|【?\s*大\s*中\s*小|浏览次数|访问量|阅读[:：]|点击[:：]|上一篇|下一篇|责任编辑|"
+    r"扫一扫|返回顶部|网站地图|联系我们|主办单位|承办单位|版权所有|Copyright|.*ICP备|.*公网安备)",
+    re.IGNORECASE,
+)
+
+
+def condense_content(text: str, matcher: KeywordMatcher, budget: int) -> str:
+    """
+    按token预算压缩正文，替代固定字符截断：
+    1. 去掉导航/页脚等模板行和过短的碎片行（≤4字）
+    2. 去掉重复行（同一页面的标题、落款常重复出现）
+    3. 仍超预算时按关键词密度给段落打分（命中权重 / √token数，首段略加权），
+       按得分从高到低装入预算，输出时保持原文顺序
+    budget <= 0 表示不限。
+    """
+    seen = set()
+    paragraphs = []
+    for line in text.split("\n"):
+        line = line.strip()
+        key = re.sub(r"\s+", "", line)
+        if len(key) <= 4 or key in seen or BOILERPLATE_PATTERNS.match(line):
+            continue
+        seen.add(key)
+        paragraphs.append(line)
+
+    tokens = [estimate_tokens(p) for p in paragraphs]
+    if budget <= 0 or sum(tokens) <= budget:
+        return "\n".join(paragraphs)
+
+    def score(i: int) -> float:
+        density = matcher.hits(paragraphs[i]) / tokens[i] ** 0.5
+        return density * (1.5 if i == 0 else 1.0)
+
+    chosen, used = set(), 0
+    for i in sorted(range(len(paragraphs)), key=lambda i: (-score(i), i)):
+        if used + tokens[i] <= budget:
+            chosen.add(i)
+            used += tokens[i]
+
+    if not chosen:
+        # 单段就超预算：截取得分最高的一段
+        best = max(range(len(paragraphs)), key=score)
+        return paragraphs[best][:budget]
+    return "\n".join(paragraphs[i] for i in sorted(chosen))
+
+
+class AnalysisCache:
+    """
+    AI分析结果缓存（SQLite），按 归一化正文哈希 + 提示词版本 + 模型名 寻址。
+    同一份政策在多个网站转载时只调用一次大模型。
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS analyses (
+            content_hash   TEXT NOT NULL,
+            prompt_version TEXT NOT NULL,
+            model          TEXT NOT NULL,
+            analysis       TEXT NOT NULL,
+            tokens         INTEGER NOT NULL DEFAULT 0,
+            created_at     TEXT NOT NULL,
+            PRIMARY KEY (content_hash, prompt_version, model)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.stats = {"hits": 0, "misses": 0, "tokens_saved": 0}
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT analysis, tokens FROM analyses "
+                "WHERE content_hash = ? AND prompt_version = ? AND model = ?", key
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self.stats["tokens_saved"] += row[1]
+        return json.loads(row[0])
+
+    def put(self, key: tuple, analysis: dict, tokens: int):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, json.dumps(analysis, ensure_ascii=False), tokens,
+                 datetime.now(BJT).isoformat()),
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
 class PolicyAnalyzer:
-    """政策分析器：调用通义千问(qwen-max-latest)进行AI分析"""
+    """政策分析器：调用通义千问(默认 qwen-max-latest)进行AI分析"""
+
+    BASE_URL = "https://dashscope.aliyuncs.com/compatible-mode/v1"
+    # 修改 _system_prompt 或 analyze_article 中的提示词模板时递增，使旧缓存失效
+    PROMPT_VERSION = "2"
+
+    def __init__(self, settings: dict | None = None, concurrency: int | None = None,
+                 cache: AnalysisCache | None = None, keywords: dict[str, float] | None = None):
+        settings = settings or {}
+        self.cache = cache
+        # 正文压缩：按 filter_keywords 密度挑段落装入 content_token_budget
+        self.content_budget = settings.get("content_token_budget", 1500)
+        self.matcher = KeywordMatcher(keywords or {})
+        self.model = settings.get("model", "qwen-max-latest")
+        self.max_tokens = settings.get("max_tokens", 2000)
+        self.concurrency = max(1, concurrency or settings.get("concurrency", 4))
+        self.max_retries = settings.get("max_retries", 4)
+        self.backoff_base = settings.get("backoff_base", 2.0)
+        self.backoff_max = settings.get("backoff_max", 60.0)
+        self.expected_output_tokens = settings.get("expected_output_tokens", 600)
+        # 批量模式：多篇短文合并成一次请求，batch_size <= 1 关闭
+        self.batch_size = settings.get("batch_size", 5)
+        self.batch_article_tokens = settings.get("batch_article_tokens", 600)
+        self.batch_token_budget = settings.get("batch_token_budget", 3000)
+        self.batch_max_tokens = settings.get("batch_max_tokens", 8000)
+        self.limiter = RateLimiter(
+            settings.get("requests_per_minute", 60),
+            settings.get("tokens_per_minute", 100000),
+        )
+        self.stats = {"requests": 0, "retries": 0, "failures": 0,
+                      "prompt_tokens": 0, "completion_tokens": 0,
+                      "articles": 0, "content_tokens_raw": 0, "content_tokens_sent": 0,
+                      "batch_requests": 0, "batched_articles": 0, "batch_fallbacks": 0}
+        self._stats_lock = threading.Lock()
+        # 每篇文章的模型耗时和token（run_once 开始时清空），汇总见 build_run_metrics
+        self.article_metrics: list[dict] = []
+        self._call_local = threading.local()
+        self._client = None
+        self._raw_session = None
+        self._client_lock = threading.Lock()
 
-    def __init__(self):
         self.api_key = self._load_api_key()
         if not self.api_key:
             log.warning("⚠️  DASHSCOPE_API_KEY 未找到，将跳过AI分析")
@@ -386,60 +1177,118 @@ class PolicyAnalyzer:
 
         return ""
 
-    def _call_qwen(self, prompt: str) -> str:
-        """调用通义千问API（兼容OpenAI接口）"""
-        if not self.api_key:
-            return ""
+    def _get_client(self):
+        """复用同一个 OpenAI 客户端（线程安全）；openai 库未安装时返回 None，改用 requests"""
+        with self._client_lock:
+            if self._client is None and self._raw_session is None:
+                try:
+                    from openai import OpenAI
+                    # 重试由本类统一调度，关闭SDK内置重试
+                    self._client = OpenAI(api_key=self.api_key, base_url=self.BASE_URL, max_retries=0)
+                except ImportError:
+                    log.warning("openai 库未安装，尝试使用 requests 直接调用")
+                    self._raw_session = requests.Session()
+            return self._client
+
+    def _messages(self, prompt: str) -> list[dict]:
+        return [
+            {"role": "system", "content": self._system_prompt()},
+            {"role": "user", "content": prompt}
+        ]
 
+    def _record_usage(self, usage: dict | None, reserved: int):
+        self._call_local.usage = usage or {}
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            if usage:
+                self.stats["prompt_tokens"] += usage.get("prompt_tokens", 0)
+                self.stats["completion_tokens"] += usage.get("completion_tokens", 0)
+        if usage and usage.get("total_tokens"):
+            self.limiter.settle(usage["total_tokens"] - reserved)
+
+    @staticmethod
+    def _is_retryable(exc: Exception) -> bool:
+        """429、5xx 和网络错误可重试，其余错误（如401、参数错误）直接放弃"""
+        status = getattr(exc, "status_code", None)
+        if status is None:
+            status = getattr(getattr(exc, "response", None), "status_code", None)
+        if status is not None:
+            return status == 429 or status >= 500
+        return isinstance(exc, (requests.ConnectionError, requests.Timeout)) or \
+            type(exc).__name__ in ("APIConnectionError", "APITimeoutError")
+
+    def _backoff(self, exc: Exception, attempt: int) -> float:
+        """指数退避 + 随机抖动；服务端给了 Retry-After 时以其为下限"""
+        delay = random.uniform(0.5, 1.0) * min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
         try:
-            from openai import OpenAI
-            client = OpenAI(
-                api_key=self.api_key,
-                base_url="https://dashscope.aliyuncs.com/compatible-mode/v1"
-            )
-            response = client.chat.completions.create(
-                model="qwen-max-latest",
-                messages=[
-                    {"role": "system", "content": self._system_prompt()},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000,
-            )
-            return response.choices[0].message.content
-        except ImportError:
-            log.warning("openai 库未安装，尝试使用 requests 直接调用")
-            return self._call_qwen_raw(prompt)
-        except Exception as e:
-            log.error(f"AI分析失败: {e}")
-            return ""
+            delay = max(delay, float(headers.get("retry-after", 0)))
+        except (TypeError, ValueError):
+            pass
+        return delay
 
-    def _call_qwen_raw(self, prompt: str) -> str:
-        """备用方案：直接用requests调用DashScope API"""
-        try:
-            resp = requests.post(
-                "https://dashscope.aliyuncs.com/compatible-mode/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": "qwen-max-latest",
-                    "messages": [
-                        {"role": "system", "content": self._system_prompt()},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 2000,
-                },
-                timeout=60,
-            )
-            data = resp.json()
-            return data["choices"][0]["message"]["content"]
-        except Exception as e:
-            log.error(f"AI分析失败(raw): {e}")
+    def _call_qwen(self, prompt: str, max_tokens: int | None = None,
+                   expected_output: int | None = None) -> str:
+        """
+        调用通义千问API（兼容OpenAI接口），限流 + 429/5xx 抖动退避重试。
+        max_tokens / expected_output 默认取单篇分析的配置，批量请求时按篇数放大。
+        """
+        if not self.api_key:
             return ""
 
+        max_tokens = max_tokens or self.max_tokens
+        reserved = estimate_tokens(self._system_prompt() + prompt) + (expected_output or self.expected_output_tokens)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(reserved)
+            try:
+                client = self._get_client()
+                if client is None:
+                    return self._call_qwen_raw(prompt, reserved, max_tokens)
+                response = client.chat.completions.create(
+                    model=self.model,
+                    messages=self._messages(prompt),
+                    temperature=0.3,
+                    max_tokens=max_tokens,
+                )
+                usage = response.usage.model_dump() if response.usage else None
+                self._record_usage(usage, reserved)
+                return response.choices[0].message.content
+            except Exception as e:
+                if attempt < self.max_retries and self._is_retryable(e):
+                    delay = self._backoff(e, attempt)
+                    with self._stats_lock:
+                        self.stats["retries"] += 1
+                    log.warning(f"AI接口繁忙({e.__class__.__name__})，{delay:.1f}s 后重试 "
+                                f"({attempt + 1}/{self.max_retries})")
+                    time.sleep(delay)
+                    continue
+                with self._stats_lock:
+                    self.stats["failures"] += 1
+                log.error(f"AI分析失败: {e}")
+                return ""
+        return ""
+
+    def _call_qwen_raw(self, prompt: str, reserved: int, max_tokens: int) -> str:
+        """备用方案：直接用requests调用DashScope API（异常交给 _call_qwen 判断是否重试）"""
+        resp = self._raw_session.post(
+            f"{self.BASE_URL}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": self.model,
+                "messages": self._messages(prompt),
+                "temperature": 0.3,
+                "max_tokens": max_tokens,
+            },
+            timeout=60,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        self._record_usage(data.get("usage"), reserved)
+        return data["choices"][0]["message"]["content"]
+
     def _system_prompt(self) -> str:
         return """你是「鑫智圈」平台的汽车产业出海风控分析师。
 你的任务是分析来自权威机构（商务部、海关总署、中国信保、行业协会等）的政策文章，
@@ -466,40 +1315,243 @@ class PolicyAnalyzer:
   "insurance_hint": "是否建议投保及理由（一句话，无需投保则填空字符串）"
 }"""
 
+    def _cache_key(self, article: dict) -> tuple | None:
+        if not (self.cache and self.api_key):
+            return None
+        # 压缩预算不同，送入模型的正文不同，也要区分缓存
+        raw = article.get("content", article["title"])
+        return (article.get("content_hash") or normalized_content_hash(raw),
+                f"{self.PROMPT_VERSION}/{self.content_budget}", self.model)
+
+    def _cached(self, article: dict, cache_key: tuple | None) -> dict | None:
+        cached = self.cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            log.info(f"🗂️  命中分析缓存: {article['title'][:40]}...")
+            self._record_article(article, cached=True)
+        return cached
+
+    def _timed_call(self, prompt: str, **kwargs) -> tuple[str, float, dict]:
+        """调用模型，返回 (输出, 耗时含重试, 本次token用量)"""
+        self._call_local.usage = {}
+        started = time.monotonic()
+        result = self._call_qwen(prompt, **kwargs)
+        return result, time.monotonic() - started, self._call_local.usage
+
+    def _record_article(self, article: dict, seconds: float = 0.0, usage: dict | None = None,
+                        share: int = 1, cached: bool = False):
+        """记录单篇文章的模型耗时和token；批量请求按篇数平摊token"""
+        usage = usage or {}
+        with self._stats_lock:
+            self.article_metrics.append({
+                "url": article["url"],
+                "source_id": article["source_id"],
+                "llm_seconds": round(seconds, 3),
+                "prompt_tokens": usage.get("prompt_tokens", 0) // share,
+                "completion_tokens": usage.get("completion_tokens", 0) // share,
+                "batch": share,
+                "cached": cached,
+            })
+
+    def _condense(self, article: dict) -> str:
+        """压缩正文并累计压缩前后的token数"""
+        raw = article.get("content", article["title"])
+        content = condense_content(raw, self.matcher, self.content_budget)
+        with self._stats_lock:
+            self.stats["articles"] += 1
+            self.stats["content_tokens_raw"] += estimate_tokens(raw)
+            self.stats["content_tokens_sent"] += estimate_tokens(content)
+        return content
+
+    @staticmethod
+    def _strip_code_fence(text: str) -> str:
+        """清理可能的markdown代码块标记"""
+        cleaned = text.strip()
+        if cleaned.startswith("```"):
+            cleaned = cleaned.split("\n", 1)[1] if "\n" in cleaned else cleaned
+            cleaned = cleaned.rsplit("```", 1)[0] if "```" in cleaned else cleaned
+            cleaned = cleaned.strip()
+        if cleaned.startswith("json"):
+            cleaned = cleaned[4:].strip()
+        return cleaned
+
     def analyze_article(self, article: dict) -> dict:
         """分析单篇文章"""
+        cache_key = self._cache_key(article)
+        cached = self._cached(article, cache_key)
+        if cached is not None:
+            return cached
+        return self._analyze_single(article, self._condense(article), cache_key)
+
+    def _analyze_single(self, article: dict, content: str, cache_key: tuple | None) -> dict:
         prompt = f"""请分析以下来自「{article['source_name']}」的政策/行业文章：
 
 标题：{article['title']}
 
 正文内容：
-{article.get('content', article['title'])[:3000]}
+{content}
 
 请按要求输出JSON分析结果。"""
 
-        log.info(f"🤖 AI分析: {article['title'][:40]}...")
-        result_text = self._call_qwen(prompt)
+        raw_tokens = estimate_tokens(article.get("content", article["title"]))
+        log.info(f"🤖 AI分析: {article['title'][:40]}...（正文 {raw_tokens}→{estimate_tokens(content)} tokens）")
+        result_text, seconds, usage = self._timed_call(prompt)
+        self._record_article(article, seconds, usage)
 
         if not result_text:
             return self._fallback_analysis(article)
 
         # 解析JSON
         try:
-            # 清理可能的markdown代码块标记
-            cleaned = result_text.strip()
-            if cleaned.startswith("```"):
-                cleaned = cleaned.split("\n", 1)[1] if "\n" in cleaned else cleaned
-                cleaned = cleaned.rsplit("```", 1)[0] if "```" in cleaned else cleaned
-                cleaned = cleaned.strip()
-            if cleaned.startswith("json"):
-                cleaned = cleaned[4:].strip()
-
-            analysis = json.loads(cleaned)
+            analysis = json.loads(self._strip_code_fence(result_text))
+            if cache_key:
+                tokens = estimate_tokens(self._system_prompt() + prompt) + estimate_tokens(result_text)
+                self.cache.put(cache_key, analysis, tokens)
             return analysis
         except json.JSONDecodeError:
             log.warning(f"AI返回的JSON解析失败，使用原始文本")
             return self._fallback_analysis(article, result_text)
 
+    def _is_short(self, article: dict) -> bool:
+        """压缩后正文不超过 batch_article_tokens 的文章可以合并进批量请求"""
+        tokens = estimate_tokens(article.get("content", article["title"]))
+        if self.content_budget > 0:
+            tokens = min(tokens, self.content_budget)
+        return tokens <= self.batch_article_tokens
+
+    def group_articles(self, articles):
+        """
+        把文章流切分成请求组（生成器）：长文单独成组立即产出；
+        短文攒够 batch_size 篇或正文总token达到 batch_token_budget 时成组产出，结束时清空。
+        batch_size <= 1 时每篇单独成组。
+        """
+        batch, batch_tokens = [], 0
+        for article in articles:
+            if self.batch_size <= 1 or not self._is_short(article):
+                yield [article]
+                continue
+            tokens = estimate_tokens(article.get("content", article["title"]))
+            if batch and batch_tokens + tokens > self.batch_token_budget:
+                yield batch
+                batch, batch_tokens = [], 0
+            batch.append(article)
+            batch_tokens += tokens
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch, batch_tokens = [], 0
+        if batch:
+            yield batch
+
+    def analyze_group(self, articles: list[dict]) -> list[dict]:
+        """
+        分析一组文章，返回与输入顺序一致的分析结果。
+        多篇未命中缓存的文章合并成一次请求（共用一份系统提示词），
+        模型返回以 id 为键的JSON数组；响应中缺失或解析失败的条目自动回退为单篇请求。
+        批量请求本身失败（网络/HTTP/限流重试耗尽）时整组记为失败一次，不再逐篇重发；
+        未配置API Key时不做批量。
+        """
+        results: list[dict | None] = [None] * len(articles)
+        pending = []
+        for i, article in enumerate(articles):
+            cache_key = self._cache_key(article)
+            cached = self._cached(article, cache_key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, article, cache_key, self._condense(article)))
+
+        if len(pending) == 1 or not self.api_key:
+            for i, article, cache_key, content in pending:
+                results[i] = self._analyze_single(article, content, cache_key)
+        elif pending:
+            parsed, tokens_each, seconds, usage = self._analyze_multi(
+                [(str(n), a, c) for n, (_, a, _, c) in enumerate(pending, 1)])
+            if parsed is None:
+                for i, article, _, _ in pending:
+                    self._record_article(article, seconds, usage, share=len(pending))
+                    results[i] = self._fallback_analysis(article)
+                with self._stats_lock:
+                    self.stats["batch_requests"] += 1
+                    self.stats["batched_articles"] += len(pending)
+                return results
+            fallbacks = 0
+            for n, (i, article, cache_key, content) in enumerate(pending, 1):
+                analysis = parsed.get(str(n))
+                if analysis is None:
+                    fallbacks += 1
+                    results[i] = self._analyze_single(article, content, cache_key)
+                    continue
+                if cache_key:
+                    self.cache.put(cache_key, analysis, tokens_each)
+                self._record_article(article, seconds, usage, share=len(pending))
+                results[i] = analysis
+            with self._stats_lock:
+                self.stats["batch_requests"] += 1
+                self.stats["batched_articles"] += len(pending)
+                self.stats["batch_fallbacks"] += fallbacks
+        return results
+
+    def _analyze_multi(self, items: list[tuple[str, dict, str]]) -> tuple[dict[str, dict] | None, int, float, dict]:
+        """
+        一次请求分析多篇文章，items 为 [(id, 文章, 压缩后正文), ...]。
+        返回 ({id: 分析结果}（只含解析成功的条目）, 每篇分摊的token估算, 请求耗时, token用量)；
+        请求本身失败时第一项为 None。
+        """
+        parts = [f"请分析以下 {len(items)} 篇政策/行业文章，每篇以「=== 文章 编号 ===」开头：", ""]
+        for item_id, article, content in items:
+            parts.append(f"=== 文章 {item_id} ===")
+            parts.append(f"来源：{article['source_name']}")
+            parts.append(f"标题：{article['title']}")
+            parts.append("正文内容：")
+            parts.append(content)
+            parts.append("")
+        parts.append(f"请输出一个JSON数组，共 {len(items)} 个元素，每个元素对应一篇文章，"
+                     f"字段与单篇分析的JSON格式相同，并增加 \"id\" 字段填写文章编号。"
+                     f"只输出JSON数组，不要输出其他内容。")
+        prompt = "\n".join(parts)
+
+        log.info(f"🤖 AI批量分析 {len(items)} 篇: " + "；".join(a["title"][:15] for _, a, _ in items))
+        result_text, seconds, usage = self._timed_call(
+            prompt,
+            max_tokens=min(self.max_tokens * len(items), self.batch_max_tokens),
+            expected_output=self.expected_output_tokens * len(items),
+        )
+        if not result_text:
+            log.warning(f"批量分析请求失败，本组 {len(items)} 篇使用默认分析结果")
+            return None, 0, seconds, usage
+        parsed = self._parse_multi(result_text, {item_id for item_id, _, _ in items})
+        if len(parsed) < len(items):
+            log.warning(f"批量分析返回 {len(parsed)}/{len(items)} 篇有效结果，其余回退为单篇请求")
+        tokens = estimate_tokens(self._system_prompt() + prompt) + estimate_tokens(result_text)
+        return parsed, tokens // len(items), seconds, usage
+
+    def _parse_multi(self, text: str, ids: set[str]) -> dict[str, dict]:
+        """
+        解析批量结果：优先整体解析JSON数组；整体失败（如输出被截断）时
+        逐个扫描顶层对象，保留能解析、带有效 id 和 risk_level 的条目。
+        """
+        cleaned = self._strip_code_fence(text)
+        try:
+            data = json.loads(cleaned)
+            items = data if isinstance(data, list) else data.get("results", []) if isinstance(data, dict) else []
+        except json.JSONDecodeError:
+            items, pos = [], 0
+            decoder = json.JSONDecoder()
+            while (start := cleaned.find("{", pos)) >= 0:
+                try:
+                    obj, pos = decoder.raw_decode(cleaned, start)
+                    items.append(obj)
+                except json.JSONDecodeError:
+                    pos = start + 1
+
+        parsed = {}
+        for item in items:
+            if not isinstance(item, dict) or "risk_level" not in item:
+                continue
+            item_id = str(item.pop("id", "")).strip()
+            if item_id in ids and item_id not in parsed:
+                parsed[item_id] = item
+        return parsed
+
     def _fallback_analysis(self, article: dict, raw_text: str = "") -> dict:
         """AI分析失败时的回退方案"""
         return {
@@ -515,14 +1567,38 @@ class PolicyAnalyzer:
         }
 
     def analyze_batch(self, articles: list[dict]) -> list[dict]:
-        """批量分析文章"""
-        results = []
-        for article in articles:
-            analysis = self.analyze_article(article)
-            article["ai_analysis"] = analysis
-            results.append(article)
-            time.sleep(1)  # API调用间隔
-        return results
+        """
+        批量分析文章：按 group_articles 分组后线程池并发调用，
+        速率由 RateLimiter 控制。
+        """
+        started = time.monotonic()
+        groups = list(self.group_articles(articles))
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for group, analyses in zip(groups, pool.map(self.analyze_group, groups)):
+                for article, analysis in zip(group, analyses):
+                    article["ai_analysis"] = analysis
+
+        self.log_stats(len(articles), time.monotonic() - started)
+        return articles
+
+    def log_stats(self, count: int, elapsed: float):
+        """输出本轮分析的请求/重试/token 统计和缓存命中情况"""
+        st = self.stats
+        log.info(f"⏱️  AI分析 {count} 篇，耗时 {elapsed:.1f}s"
+                 f"（并发 {self.concurrency}，请求 {st['requests']} 次，重试 {st['retries']} 次，"
+                 f"失败 {st['failures']} 次，tokens {st['prompt_tokens']}+{st['completion_tokens']}）")
+        if st["batch_requests"]:
+            log.info(f"📦 批量请求 {st['batch_requests']} 次，合并 {st['batched_articles']} 篇，"
+                     f"回退单篇 {st['batch_fallbacks']} 篇")
+        if st["articles"]:
+            raw, sent = st["content_tokens_raw"], st["content_tokens_sent"]
+            log.info(f"✂️  正文压缩: 平均每篇 {raw / st['articles']:.0f} → {sent / st['articles']:.0f} tokens"
+                     f"（共 {raw} → {sent}，减少 {(1 - sent / raw) * 100 if raw else 0:.0f}%，"
+                     f"预算 {self.content_budget}）")
+        if self.cache:
+            cs = self.cache.stats
+            log.info(f"🗂️  分析缓存: 命中 {cs['hits']} 次 / 未命中 {cs['misses']} 次，"
+                     f"节省约 {cs['tokens_saved']} tokens")
 
 
 # ============================================================
@@ -560,11 +1636,12 @@ class ReportFormatter:
             lines.append("✅ 今日暂无与汽车出口相关的新政策动态。")
             return "\n".join(lines)
 
-        # 按风险等级排序：red > yellow > green
+        # 按风险等级排序：red > yellow > green，同等级内按关键词相关度降序
         risk_order = {"red": 0, "yellow": 1, "green": 2}
         articles.sort(
-            key=lambda a: risk_order.get(
-                a.get("ai_analysis", {}).get("risk_level", "yellow"), 1
+            key=lambda a: (
+                risk_order.get(a.get("ai_analysis", {}).get("risk_level", "yellow"), 1),
+                -a.get("relevance_score", 0),
             )
         )
 
@@ -592,6 +1669,8 @@ class ReportFormatter:
                 lines.append(f"🛡️ 信保提示：{hint}")
 
             lines.append(f"🔗 原文：{article['url']}")
+            for dup in article.get("duplicates", []):
+                lines.append(f"🔁 转载：{dup['source_name']} {dup['url']}")
             lines.append("")
 
         lines.append("━" * 30)
@@ -601,6 +1680,27 @@ class ReportFormatter:
 
         return "\n".join(lines)
 
+    @staticmethod
+    def article_record(a: dict) -> dict:
+        """单篇文章的JSON记录（JSON报告和 ReportStore 共用）"""
+        return {
+            "title": a["title"],
+            "url": a["url"],
+            "source": a["source_name"],
+            "source_id": a["source_id"],
+            "category": a["category"],
+            "fetch_time": a["fetch_time"],
+            "relevance_score": a.get("relevance_score", 0),
+            "matched_keywords": a.get("matched_keywords", []),
+            "ai_analysis": a.get("ai_analysis", {}),
+            "duplicates": a.get("duplicates", []),
+        }
+
+    @staticmethod
+    def _risk_summary(articles: list[dict], default: str | None = None) -> dict:
+        levels = [a.get("ai_analysis", {}).get("risk_level", default) for a in articles]
+        return {level: levels.count(level) for level in ("red", "yellow", "green")}
+
     def format_json_report(self, articles: list[dict]) -> dict:
         """生成JSON格式的完整报告（供后续系统对接）"""
         now = datetime.now(BJT)
@@ -609,78 +1709,446 @@ class ReportFormatter:
             "generated_at": now.isoformat(),
             "report_type": "鑫智圈·政策风控内参",
             "total_articles": len(articles),
-            "risk_summary": {
-                "red": sum(1 for a in articles if a.get("ai_analysis", {}).get("risk_level") == "red"),
-                "yellow": sum(1 for a in articles if a.get("ai_analysis", {}).get("risk_level") == "yellow"),
-                "green": sum(1 for a in articles if a.get("ai_analysis", {}).get("risk_level") == "green"),
-            },
-            "articles": [
-                {
-                    "title": a["title"],
-                    "url": a["url"],
-                    "source": a["source_name"],
-                    "category": a["category"],
-                    "fetch_time": a["fetch_time"],
-                    "ai_analysis": a.get("ai_analysis", {}),
-                }
-                for a in articles
-            ],
+            "risk_summary": self._risk_summary(articles),
+            "articles": [self.article_record(a) for a in articles],
+        }
+
+    def format_digest(self, records: list[dict], since: str, until: str | None = None) -> str:
+        """
+        生成汇总简报（日报/周报），records 为 ReportStore 中的文章记录。
+        按风险等级分组，组内按日期倒序，每篇只列一行摘要和原文链接。
+        未经AI分析的文章（--fetch-only）与存储索引一致按 yellow 计。
+        """
+        until = until or datetime.now(BJT).strftime("%Y-%m-%d")
+        summary = self._risk_summary(records, "yellow")
+
+        lines = []
+        lines.append("📋 鑫智圈·政策风控汇总")
+        lines.append(f"📅 {since} ~ {until}")
+        lines.append(f"📊 共 {len(records)} 条动态：🔴 {summary['red']} / 🟡 {summary['yellow']} / 🟢 {summary['green']}")
+        lines.append("")
+
+        if not records:
+            lines.append("✅ 该时段暂无与汽车出口相关的政策动态。")
+            return "\n".join(lines)
+
+        for level in ("red", "yellow", "green"):
+            group = [r for r in records if r.get("ai_analysis", {}).get("risk_level", "yellow") == level]
+            if not group:
+                continue
+            group.sort(key=lambda r: (r["fetch_time"], r.get("relevance_score", 0)), reverse=True)
+            lines.append("━" * 30)
+            lines.append(f"{self.RISK_EMOJI[level]} {self.RISK_LABEL[level]}（{len(group)}）")
+            for r in group:
+                analysis = r.get("ai_analysis", {})
+                lines.append(f"• {r['fetch_time'][:10]} {analysis.get('policy_brief', r['title'][:25])}"
+                             f" | {r['source']} | {analysis.get('risk_type', '—')}")
+                lines.append(f"  🔗 {r['url']}")
+            lines.append("")
+
+        lines.append("━" * 30)
+        lines.append("⚠️ 以上分析仅供参考，具体决策请结合实际情况")
+        return "\n".join(lines)
+
+    def format_json_digest(self, records: list[dict], since: str, until: str | None = None) -> dict:
+        """生成JSON格式的汇总简报"""
+        by_source: dict[str, int] = {}
+        for r in records:
+            by_source[r["source"]] = by_source.get(r["source"], 0) + 1
+        return {
+            "generated_at": datetime.now(BJT).isoformat(),
+            "report_type": "鑫智圈·政策风控汇总",
+            "since": since,
+            "until": until or datetime.now(BJT).strftime("%Y-%m-%d"),
+            "total_articles": len(records),
+            "risk_summary": self._risk_summary(records, "yellow"),
+            "by_source": by_source,
+            "articles": records,
         }
 
 
 # ============================================================
-# 主流程
+# 调度模块（守护模式）
 # ============================================================
 
-def main():
-    parser = argparse.ArgumentParser(description="汽车出口政策新闻监控")
-    parser.add_argument("--fetch-only", action="store_true", help="仅爬取，不调用AI分析")
-    parser.add_argument("--test", action="store_true", help="测试模式：仅爬取第一个源的前3篇")
-    args = parser.parse_args()
+class SourceScheduler:
+    """
+    守护模式的源调度器：
+    - 基础轮询间隔由 update_freq 决定，priority 数值越大（越次要）间隔越长
+    - 连续没有新文章的源按 backoff_factor 逐步拉长间隔，最多 max_backoff 倍
+    - 一旦出现新文章，间隔立即恢复为基础值
+    - 本轮运行出错的源在 retry_after 秒后重试（不超过正常间隔），不计入空轮次
+    """
+
+    DEFAULT_INTERVALS = {"daily": 2 * 3600, "weekly": 6 * 3600, "monthly": 12 * 3600}
+
+    def __init__(self, sources: list[dict], settings: dict | None = None):
+        settings = settings or {}
+        self.sources = sources
+        self.intervals = {**self.DEFAULT_INTERVALS, **settings.get("intervals", {})}
+        self.backoff_factor = settings.get("backoff_factor", 1.5)
+        self.max_backoff = settings.get("max_backoff", 4)
+        self.retry_after = settings.get("retry_after", 300)
+        # 启动时所有源立即到期
+        self.state = {s["id"]: {"next_due": 0.0, "idle_runs": 0} for s in sources}
+
+    def interval(self, source: dict) -> float:
+        base = self.intervals.get(source.get("update_freq", "daily"), self.intervals["daily"])
+        base *= max(1, source.get("priority", 1))
+        backoff = min(self.max_backoff, self.backoff_factor ** self.state[source["id"]]["idle_runs"])
+        return base * backoff
+
+    def due(self, now: float) -> list[dict]:
+        """到期的源，优先级高的在前"""
+        due = [s for s in self.sources if self.state[s["id"]]["next_due"] <= now]
+        return sorted(due, key=lambda s: (s.get("priority", 1), self.state[s["id"]]["next_due"]))
+
+    def complete(self, source: dict, new_count: int, now: float):
+        st = self.state[source["id"]]
+        st["idle_runs"] = 0 if new_count else st["idle_runs"] + 1
+        st["next_due"] = now + self.interval(source)
+
+    def fail(self, source: dict, now: float):
+        st = self.state[source["id"]]
+        st["next_due"] = now + min(self.retry_after, self.interval(source))
+
+    def seconds_until_next(self, now: float) -> float:
+        return max(0.0, min(st["next_due"] for st in self.state.values()) - now)
 
-    # 禁用SSL警告（部分政府网站SSL证书有问题）
-    import urllib3
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-    log.info("🚗 汽车出口政策新闻监控 启动")
-    log.info(f"📅 {datetime.now(BJT).strftime('%Y-%m-%d %H:%M:%S')} (北京时间)")
-    log.info("")
+# ============================================================
+# 流水线模块（爬取 → 近似去重 → AI分析）
+# ============================================================
 
-    # 加载配置
-    config = load_json(SOURCES_FILE)
-    if not config:
-        log.error("❌ sources.json 配置文件不存在或为空")
-        sys.exit(1)
+class AnalysisPipeline:
+    """
+    生产者/消费者流水线：爬虫每抓完一篇详情就在主线程做近似去重，
+    保留的文章经 analyzer.group_articles 分组（长文单篇、短文合批）后放入有界队列，
+    由 analyzer.concurrency 个工作线程并发分析。
+    爬取和分析同时进行，端到端耗时接近 max(爬取, 分析) 而不是两者之和；
+    队列满时爬虫阻塞等待（背压），分析跟不上时不会无限积压。
+    """
+
+    def __init__(self, analyzer: "PolicyAnalyzer", queue_size: int = 8):
+        self.analyzer = analyzer
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._lock = threading.Lock()
+        self.metrics = {
+            "queue_size": self.queue.maxsize,
+            "fetch": {"articles": 0, "seconds": 0.0},
+            "dedupe": {"kept": 0, "seconds": 0.0},
+            "analyze": {"articles": 0, "groups": 0, "seconds": 0.0, "busy_seconds": 0.0, "idle_seconds": 0.0},
+            "queue": {"max_depth": 0, "avg_depth": 0.0, "put_wait_seconds": 0.0},
+        }
+        self._depth_samples = 0
+
+    def _worker(self):
+        m = self.metrics["analyze"]
+        while True:
+            waited = time.monotonic()
+            group = self.queue.get()
+            idle = time.monotonic() - waited
+            if group is None:
+                with self._lock:
+                    m["idle_seconds"] += idle
+                return
+
+            started = time.monotonic()
+            try:
+                analyses = self.analyzer.analyze_group(group)
+            except Exception as e:
+                log.error(f"❌ AI分析异常: {group[0]['title'][:40]}... {e}")
+                analyses = [self.analyzer._fallback_analysis(a) for a in group]
+            for article, analysis in zip(group, analyses):
+                article["ai_analysis"] = analysis
+            with self._lock:
+                m["articles"] += len(group)
+                m["groups"] += 1
+                m["busy_seconds"] += time.monotonic() - started
+                m["idle_seconds"] += idle
+
+    def _put(self, group: list[dict]):
+        q = self.metrics["queue"]
+        depth = self.queue.qsize()
+        q["max_depth"] = max(q["max_depth"], depth + 1)
+        q["avg_depth"] += (depth - q["avg_depth"]) / (self._depth_samples + 1)
+        self._depth_samples += 1
+        started = time.monotonic()
+        self.queue.put(group)
+        q["put_wait_seconds"] += time.monotonic() - started
+
+    def run(self, articles, clusterer: NearDupClusterer | None = None) -> list[dict]:
+        """
+        消费 articles 迭代器（通常是 NewsFetcher.iter_articles），
+        全部分析完成后返回保留下来的文章（已带 ai_analysis）。
+        """
+        m = self.metrics
+        started = time.monotonic()
+        workers = [threading.Thread(target=self._worker, daemon=True)
+                   for _ in range(self.analyzer.concurrency)]
+        for worker in workers:
+            worker.start()
+
+        kept = []
+
+        def deduped():
+            for article in articles:
+                m["fetch"]["articles"] += 1
+                if clusterer is not None:
+                    dedupe_started = time.monotonic()
+                    keep = clusterer.offer(article)
+                    m["dedupe"]["seconds"] += time.monotonic() - dedupe_started
+                    if not keep:
+                        continue
+                kept.append(article)
+                yield article
+            m["fetch"]["seconds"] = time.monotonic() - started
 
-    history = load_json(HISTORY_FILE)
+        try:
+            for group in self.analyzer.group_articles(deduped()):
+                self._put(group)
+        finally:
+            for _ in workers:
+                self.queue.put(None)
+            for worker in workers:
+                worker.join()
+
+        m["dedupe"]["kept"] = len(kept)
+        m["analyze"]["seconds"] = time.monotonic() - started
+        self._log_metrics()
+        return kept
+
+    def _log_metrics(self):
+        m = self.metrics
+        fetch, analyze, q = m["fetch"], m["analyze"], m["queue"]
+
+        def rate(count, seconds):
+            return count / seconds if seconds > 0 else 0.0
+
+        log.info(f"🚰 流水线：爬取 {fetch['articles']} 篇 {fetch['seconds']:.1f}s "
+                 f"({rate(fetch['articles'], fetch['seconds']):.2f} 篇/s) → 去重保留 {m['dedupe']['kept']} 篇 "
+                 f"({m['dedupe']['seconds'] * 1000:.0f}ms) → 分析 {analyze['articles']} 篇 / {analyze['groups']} 组，"
+                 f"端到端 {analyze['seconds']:.1f}s ({rate(analyze['articles'], analyze['seconds']):.2f} 篇/s)")
+        log.info(f"   分析队列容量 {m['queue_size']}，最大深度 {q['max_depth']}，平均深度 {q['avg_depth']:.1f}，"
+                 f"爬虫因队列满等待 {q['put_wait_seconds']:.1f}s；"
+                 f"分析线程忙 {analyze['busy_seconds']:.1f}s / 空闲 {analyze['idle_seconds']:.1f}s")
 
-    # Step 1: 爬取
-    log.info("=" * 50)
-    log.info("📡 Step 1: 爬取新闻列表")
-    log.info("=" * 50)
-    fetcher = NewsFetcher(config, history)
-    new_articles = fetcher.fetch_all(test_mode=args.test)
 
-    if not new_articles:
-        log.info("📭 本次没有发现新的相关文章")
-        # 仍然输出空报告
-        formatter = ReportFormatter()
-        report_md = formatter.format_report([])
-        print("\n" + report_md)
-        return
+# ============================================================
+# 运行指标模块
+# ============================================================
 
-    # Step 2: AI分析
-    if not args.fetch_only:
-        log.info("")
-        log.info("=" * 50)
-        log.info("🤖 Step 2: AI政策分析")
+def build_run_metrics(started_at: datetime, wall_seconds: float, fetcher: NewsFetcher,
+                      analyzer: "PolicyAnalyzer | None", pipeline: "AnalysisPipeline | None",
+                      articles: list[dict]) -> dict:
+    """
+    汇总一轮运行的结构化指标：各源抓取耗时/字节数/文章数/解析耗时、HTTP状态分布、
+    AI分析每篇耗时和token、缓存命中，以及每篇入选文章的 trace（详情页耗时 + 模型耗时 + token）。
+    llm.totals 是进程启动以来的累计值（守护模式下持续增长）。
+    """
+    t = fetcher.timings
+    sources = {}
+    for source_id, m in fetcher.source_metrics.items():
+        parse = t.get("parse", {}).get(source_id, {})
+        sources[source_id] = {
+            **{k: round(v, 3) if isinstance(v, float) else v for k, v in m.items()},
+            "parse_list_seconds": parse.get("list_seconds", 0.0),
+            "parse_detail_seconds": parse.get("detail_seconds", 0.0),
+        }
+
+    metrics = {
+        "run_id": f"RUN{started_at.strftime('%Y%m%d%H%M%S')}",
+        "started_at": started_at.isoformat(),
+        "wall_seconds": round(wall_seconds, 3),
+        "articles": {
+            "found": sum(m["found"] for m in sources.values()),
+            "relevant": sum(m["relevant"] for m in sources.values()),
+            "new": sum(m["new"] for m in sources.values()),
+            "reported": len(articles),
+        },
+        "fetch": {
+            "wall_seconds": t.get("wall_seconds", 0.0),
+            "list_seconds": t.get("list_seconds", 0.0),
+            "detail_seconds": t.get("detail_seconds", 0.0),
+            "requests": sum(fetcher.http_status.values()),
+            "bytes": sum(m["bytes"] for m in sources.values()),
+            "http_status": dict(sorted(fetcher.http_status.items())),
+            "http_cache": t.get("http_cache"),
+        },
+        "sources": sources,
+        "hosts": t.get("hosts", {}),
+        "llm": None,
+        "pipeline": pipeline.metrics if pipeline else None,
+    }
+
+    llm_by_url = {}
+    if analyzer:
+        calls = [m for m in analyzer.article_metrics if not m["cached"]]
+        llm_by_url = {m["url"]: m for m in analyzer.article_metrics}
+        metrics["llm"] = {
+            "articles": len(analyzer.article_metrics),
+            "cached": len(analyzer.article_metrics) - len(calls),
+            "avg_seconds": round(sum(m["llm_seconds"] for m in calls) / len(calls), 3) if calls else 0.0,
+            "max_seconds": max((m["llm_seconds"] for m in calls), default=0.0),
+            "prompt_tokens": sum(m["prompt_tokens"] for m in calls),
+            "completion_tokens": sum(m["completion_tokens"] for m in calls),
+            "totals": dict(analyzer.stats),
+            "analysis_cache": dict(analyzer.cache.stats) if analyzer.cache else None,
+        }
+
+    metrics["trace"] = [
+        {
+            "url": a["url"],
+            "source_id": a["source_id"],
+            "title": a["title"],
+            "detail_seconds": round(fetcher.detail_seconds.get(a["url"], 0.0), 3),
+            **{k: v for k, v in llm_by_url.get(a["url"], {}).items() if k not in ("url", "source_id")},
+        }
+        for a in articles
+    ]
+    return metrics
+
+
+def format_prometheus(metrics: dict) -> str:
+    """把一轮指标转换成 Prometheus 文本格式（node_exporter textfile collector 可直接采集）"""
+    lines = []
+
+    def metric(name: str, help_text: str, samples: list[tuple[dict, float]], kind: str = "gauge"):
+        lines.append(f"# HELP auto_export_{name} {help_text}")
+        lines.append(f"# TYPE auto_export_{name} {kind}")
+        for labels, value in samples:
+            label_str = ",".join(f'{k}="{v}"' for k, v in labels.items())
+            lines.append(f"auto_export_{name}{{{label_str}}} {value}" if label_str else f"auto_export_{name} {value}")
+
+    sources = metrics["sources"]
+    metric("run_timestamp_seconds", "Start time of the last run.",
+           [({}, datetime.fromisoformat(metrics["started_at"]).timestamp())])
+    metric("run_wall_seconds", "Wall time of the last run.", [({}, metrics["wall_seconds"])])
+    metric("run_articles", "Articles in the last run by stage.",
+           [({"stage": k}, v) for k, v in metrics["articles"].items()])
+    metric("fetch_stage_seconds", "Crawl wall time by stage.",
+           [({"stage": k.removesuffix("_seconds")}, metrics["fetch"][k])
+            for k in ("wall_seconds", "list_seconds", "detail_seconds")])
+    metric("http_responses", "HTTP responses in the last run by status.",
+           [({"status": k}, v) for k, v in metrics["fetch"]["http_status"].items()])
+    metric("source_fetch_seconds", "Per-source fetch latency by page kind.",
+           [({"source": sid, "kind": kind}, m[f"{kind}_seconds"])
+            for sid, m in sources.items() for kind in ("list", "detail")])
+    metric("source_parse_seconds", "Per-source HTML parse time by page kind.",
+           [({"source": sid, "kind": kind}, m[f"parse_{kind}_seconds"])
+            for sid, m in sources.items() for kind in ("list", "detail")])
+    metric("source_bytes", "Bytes downloaded per source.", [({"source": sid}, m["bytes"]) for sid, m in sources.items()])
+    metric("source_articles", "Articles per source by stage.",
+           [({"source": sid, "stage": stage}, m[stage])
+            for sid, m in sources.items() for stage in ("found", "relevant", "new")])
+    if metrics["fetch"]["http_cache"]:
+        metric("http_cache_hits", "List page cache hits in the last run by kind.",
+               [({"kind": k}, v) for k, v in metrics["fetch"]["http_cache"].items()])
+
+    llm = metrics["llm"]
+    if llm:
+        metric("llm_article_seconds", "LLM latency per analysed article in the last run.",
+               [({"stat": "avg"}, llm["avg_seconds"]), ({"stat": "max"}, llm["max_seconds"])])
+        metric("llm_run_tokens", "LLM tokens used in the last run.",
+               [({"type": "prompt"}, llm["prompt_tokens"]), ({"type": "completion"}, llm["completion_tokens"])])
+        totals = llm["totals"]
+        metric("llm_requests_total", "LLM requests since process start.", [({}, totals["requests"])], "counter")
+        metric("llm_retries_total", "LLM retries since process start.", [({}, totals["retries"])], "counter")
+        metric("llm_failures_total", "LLM failures since process start.", [({}, totals["failures"])], "counter")
+        metric("llm_tokens_total", "LLM tokens since process start.",
+               [({"type": "prompt"}, totals["prompt_tokens"]), ({"type": "completion"}, totals["completion_tokens"])],
+               "counter")
+        if llm["analysis_cache"]:
+            cs = llm["analysis_cache"]
+            metric("analysis_cache_total", "Analysis cache lookups since process start.",
+                   [({"result": "hit"}, cs["hits"]), ({"result": "miss"}, cs["misses"])], "counter")
+    return "\n".join(lines) + "\n"
+
+
+def write_run_metrics(metrics: dict, prometheus_path: str | None = None):
+    """写 output/metrics/latest.json，并追加到 runs.jsonl；指定路径时同时写 Prometheus 文本（原子替换）"""
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    save_json(METRICS_DIR / "latest.json", metrics)
+    with open(METRICS_DIR / "runs.jsonl", "a", encoding="utf-8") as f:
+        f.write(json.dumps(metrics, ensure_ascii=False) + "\n")
+
+    if prometheus_path:
+        path = Path(prometheus_path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(format_prometheus(metrics), encoding="utf-8")
+        os.replace(tmp, path)
+
+    f = metrics["fetch"]
+    log.info(f"📈 运行指标: {METRICS_DIR / 'latest.json'}（总耗时 {metrics['wall_seconds']:.1f}s，"
+             f"{f['requests']} 次请求 / {f['bytes'] / 1024:.0f} KB，HTTP {f['http_status']}）")
+
+
+# ============================================================
+# 主流程
+# ============================================================
+
+def run_once(config: dict, args, fetcher: NewsFetcher, history, analyzer: "PolicyAnalyzer | None",
+             sources: list[dict] | None = None, emit_empty: bool = True) -> list[dict]:
+    """
+    执行一轮：爬取 → 近似去重 → AI分析 → 生成报告。
+    有 analyzer 时前三步组成流水线（AnalysisPipeline），边爬边分析。
+    emit_empty=False 时（守护模式）没有新文章就不输出报告。
+    每轮结束写出运行指标（write_run_metrics）。
+    """
+    started_at, started = datetime.now(BJT), time.monotonic()
+    pipeline = None
+    if analyzer:
+        analyzer.article_metrics.clear()
+
+    def finish(articles: list[dict]) -> list[dict]:
+        metrics = build_run_metrics(started_at, time.monotonic() - started, fetcher, analyzer, pipeline, articles)
+        write_run_metrics(metrics, getattr(args, "prometheus", None))
+        return articles
+
+    # 近似去重：与历史近似重复的丢弃，本批内近似重复的合并为一条
+    threshold = config["settings"].get("near_dup_threshold", 0.8)
+    batch_hashes: set[str] = set()
+    clusterer = NearDupClusterer(history, threshold, batch_hashes) if threshold else None
+
+    def fetched_articles():
+        for article in fetcher.iter_articles(test_mode=args.test, sources=sources):
+            batch_hashes.add(content_hash(article["url"]))  # 查历史时排除本批自身
+            yield article
+
+    # Step 1 + 2: 爬取 + AI分析
+    log.info("=" * 50)
+    if analyzer:
+        log.info("📡🤖 Step 1+2: 爬取新闻 + AI政策分析（流水线）")
         log.info("=" * 50)
-        analyzer = PolicyAnalyzer()
-        analyzed_articles = analyzer.analyze_batch(new_articles)
+        pipeline = AnalysisPipeline(analyzer, config["settings"].get("pipeline_queue_size", 8))
+        analysis_started = time.monotonic()
+        new_articles = pipeline.run(fetched_articles(), clusterer)
+        if new_articles:
+            analyzer.log_stats(len(new_articles), time.monotonic() - analysis_started)
     else:
-        analyzed_articles = new_articles
+        log.info("📡 Step 1: 爬取新闻列表")
+        log.info("=" * 50)
+        new_articles = []
+        for article in fetched_articles():
+            if clusterer is None or clusterer.offer(article):
+                new_articles.append(article)
         log.info("⏭️  跳过AI分析 (--fetch-only)")
 
+    if clusterer is not None and clusterer.dropped + clusterer.representatives:
+        total = len(batch_hashes)
+        log.info(f"🧬 近似去重：{total} 篇 → {len(new_articles)} 篇"
+                 f"（与历史重复 {len(clusterer.dropped)} 篇，本批合并 {clusterer.merged} 篇）")
+
+    if not new_articles:
+        log.info("📭 本次没有发现新的相关文章")
+        if emit_empty:
+            # 仍然输出空报告
+            formatter = ReportFormatter()
+            report_md = formatter.format_report([])
+            print("\n" + report_md)
+        return finish([])
+    analyzed_articles = new_articles
+
     # Step 3: 生成报告
     log.info("")
     log.info("=" * 50)
@@ -708,12 +2176,113 @@ def main():
     log.info(f"📄 Markdown报告: {md_path}")
     log.info(f"📄 JSON报告: {json_path}")
 
+    # 逐篇追加到文章存储，供 report_store.py digest 生成日报/周报
+    store = ReportStore(REPORT_STORE_DIR)
+    stored = store.append(report_json["report_id"], report_json["articles"])
+    store.close()
+    log.info(f"🗄️  已写入文章存储 {stored} 篇: {REPORT_STORE_DIR}")
+
     # 输出到stdout（供OpenClaw读取并推送钉钉）
     print("\n" + "=" * 50)
-    print(report_md)
-    print("=" * 50)
+    print(report_md, flush=True)
+    print("=" * 50, flush=True)
+    return finish(analyzed_articles)
+
+
+def run_daemon(config: dict, args, fetcher: NewsFetcher, history, analyzer: "PolicyAnalyzer | None"):
+    """
+    守护模式：常驻进程，复用HTTP会话、配置、缓存和AI客户端，
+    按 SourceScheduler 只轮询到期的源，有新文章时才输出报告。
+    """
+    scheduler = SourceScheduler(config["sources"], config.get("scheduler", {}))
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    log.info("🛰️  守护模式启动（Ctrl+C 或 SIGTERM 退出）")
+
+    try:
+        while not stop.is_set():
+            due = scheduler.due(time.time())
+            if due:
+                log.info(f"⏰ 到期的源: {', '.join(s['name'] for s in due)}")
+                try:
+                    run_once(config, args, fetcher, history, analyzer, sources=due, emit_empty=False)
+                except Exception:
+                    # 单轮出错（源配置、SQLite、报告写入等）不能让常驻进程退出
+                    log.exception("❌ 本轮运行出错，稍后重试这些源")
+                    now = time.time()
+                    for source in due:
+                        scheduler.fail(source, now)
+                else:
+                    now = time.time()
+                    for source in due:
+                        scheduler.complete(source, fetcher.last_new_counts.get(source["id"], 0), now)
+
+            wait = scheduler.seconds_until_next(time.time())
+            next_at = datetime.now(BJT) + timedelta(seconds=wait)
+            log.info(f"💤 下次轮询: {next_at.strftime('%m-%d %H:%M:%S')}")
+            stop.wait(wait)
+    except KeyboardInterrupt:
+        pass
+    log.info("👋 守护模式退出")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="汽车出口政策新闻监控")
+    parser.add_argument("--fetch-only", action="store_true", help="仅爬取，不调用AI分析")
+    parser.add_argument("--test", action="store_true", help="测试模式：仅爬取第一个源的前3篇")
+    parser.add_argument("--daemon", action="store_true",
+                        help="守护模式：常驻运行，按 update_freq/priority 轮询各源")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="爬取并发线程数（默认取 sources.json 中 settings.concurrency）")
+    parser.add_argument("--llm-concurrency", type=int, default=None,
+                        help="AI分析并发数（默认取 sources.json 中 llm.concurrency，1 为串行）")
+    parser.add_argument("--no-analysis-cache", action="store_true",
+                        help="禁用AI分析结果缓存，相同正文也重新调用大模型")
+    parser.add_argument("--no-http-cache", action="store_true",
+                        help="禁用列表页条件请求缓存，强制重新下载并解析")
+    parser.add_argument("--prometheus", default=None, metavar="PATH",
+                        help="每轮结束额外写出 Prometheus 文本格式指标（如 node_exporter textfile 目录下的 .prom 文件）")
+    args = parser.parse_args()
+    if args.daemon and args.test:
+        parser.error("--daemon 不能与 --test 同时使用")
+
+    # 禁用SSL警告（部分政府网站SSL证书有问题）
+    import urllib3
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    log.info("🚗 汽车出口政策新闻监控 启动")
+    log.info(f"📅 {datetime.now(BJT).strftime('%Y-%m-%d %H:%M:%S')} (北京时间)")
+    log.info("")
 
-    log.info("\n✅ 监控完成！")
+    # 加载配置
+    config = load_json(SOURCES_FILE)
+    if not config:
+        log.error("❌ sources.json 配置文件不存在或为空")
+        sys.exit(1)
+
+    history = open_history_store(
+        config["settings"].get("history_backend", "sqlite"), HISTORY_FILE, HISTORY_DB
+    )
+
+    # 测试模式只看前几篇，不使用也不更新列表页缓存
+    http_cache = None if (args.no_http_cache or args.test) else HttpCache(HTTP_CACHE_FILE)
+    fetcher = NewsFetcher(config, history, concurrency=args.concurrency, http_cache=http_cache,
+                          profiles=ExtractionProfiles(EXTRACTION_PROFILES_FILE))
+
+    analyzer = None
+    if not args.fetch_only:
+        cache = None if args.no_analysis_cache else AnalysisCache(ANALYSIS_CACHE_DB)
+        weights = config.get("keyword_weights", {})
+        keywords = {kw: weights.get(kw, 1) for kw in config["filter_keywords"]}
+        analyzer = PolicyAnalyzer(config.get("llm", {}), concurrency=args.llm_concurrency,
+                                  cache=cache, keywords=keywords)
+
+    if args.daemon:
+        run_daemon(config, args, fetcher, history, analyzer)
+    else:
+        run_once(config, args, fetcher, history, analyzer)
+        log.info("\n✅ 监控完成！")
+    history.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+近似重复文章检测 (Near-Duplicate Detection)
+==========================================
+同一政策经常被多个网站转载并做少量改动（加按语、改标题、换排版）。
+用 MinHash 估计 标题+正文 字符3-gram集合的 Jaccard 相似度，
+相似度 ≥ threshold 视为同一篇。
+
+检索用 LSH 分段：NUM_PERM 个最小哈希切成 BANDS 段，每段 ROWS 个，
+只有至少一段完全相同的文章才会成为候选，再用签名精确估算相似度，
+因此与历史比较的代价只取决于候选数，而不是历史总量。
+"""
+
+import re
+import hashlib
+import random
+import unicodedata
+from collections import defaultdict
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 3
+MIN_TEXT_LEN = 30  # 归一化后少于30字的文本特征太少，不参与近似判重
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20260224)  # 固定种子：签名要跨运行可比
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).lower()
+    return re.sub(r"[\s\W_]+", "", text)
+
+
+def _hash64(data: str) -> int:
+    return int.from_bytes(hashlib.blake2b(data.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(text: str) -> list[int] | None:
+    """字符3-gram集合的MinHash签名（NUM_PERM个值）；文本过短返回None"""
+    norm = _normalize(text)
+    if len(norm) < MIN_TEXT_LEN:
+        return None
+    shingles = {_hash64(norm[i:i + SHINGLE]) for i in range(len(norm) - SHINGLE + 1)}
+    return [min((a * h + b) % _PRIME for h in shingles) for a, b in _PERMS]
+
+
+def similarity(sig_a: list[int], sig_b: list[int]) -> float:
+    """用签名估算 Jaccard 相似度"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def band_keys(signature: list[int]) -> list[tuple[int, int]]:
+    """签名分段，返回 [(段号, 段哈希), ...]；段哈希取63位，可直接存入SQLite INTEGER"""
+    keys = []
+    for band in range(BANDS):
+        chunk = ",".join(str(v) for v in signature[band * ROWS:(band + 1) * ROWS])
+        keys.append((band, _hash64(chunk) >> 1))
+    return keys
+
+
+def encode_signature(signature: list[int] | None) -> str:
+    return ",".join(f"{v:x}" for v in signature) if signature else ""
+
+
+def decode_signature(value: str) -> list[int] | None:
+    return [int(v, 16) for v in value.split(",")] if value else None
+
+
+def article_signature(article: dict) -> list[int] | None:
+    """文章签名（标题+正文），结果缓存在 article["minhash"]（编码字符串，过短为空串）"""
+    if "minhash" not in article:
+        article["minhash"] = encode_signature(minhash(article["title"] + "\n" + article.get("content", "")))
+    return decode_signature(article["minhash"])
+
+
+class MinHashIndex:
+    """
+    内存中的LSH索引：同一批文章内部聚类（id 为序号），
+    以及 JSON 历史后端的近似检索（id 为URL哈希）
+    """
+
+    def __init__(self):
+        self._bands: dict[tuple[int, int], set] = defaultdict(set)
+        self._signatures: dict = {}
+
+    def add(self, item_id, signature: list[int]):
+        if item_id in self._signatures:
+            self.remove(item_id)
+        self._signatures[item_id] = signature
+        for key in band_keys(signature):
+            self._bands[key].add(item_id)
+
+    def remove(self, item_id):
+        signature = self._signatures.pop(item_id, None)
+        if signature is None:
+            return
+        for key in band_keys(signature):
+            ids = self._bands.get(key)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del self._bands[key]
+
+    def query(self, signature: list[int], threshold: float) -> set:
+        candidates = {i for key in band_keys(signature) for i in self._bands.get(key, ())}
+        return {i for i in candidates if similarity(signature, self._signatures[i]) >= threshold}
+
+
+class NearDupClusterer:
+    """
+    增量式近似重复聚类，文章逐篇到达（流水线中边爬边判重）：
+    1. 与历史文章近似重复的（之前已推送过）直接丢弃
+    2. 本批内部近似重复的合并为一组，先到的作为代表，
+       后到的挂在代表文章的 duplicates 字段下
+
+    exclude 为本批文章的URL哈希，查历史时排除自身；offer() 时可继续追加。
+    """
+
+    def __init__(self, history=None, threshold: float = 0.8, exclude: set[str] | None = None):
+        self.history = history
+        self.threshold = threshold
+        self.exclude = exclude if exclude is not None else set()
+        self.index = MinHashIndex()
+        self.representatives: list[dict] = []
+        self.dropped: list[dict] = []
+        self.merged = 0
+
+    def offer(self, article: dict) -> bool:
+        """加入一篇文章，返回它是否作为新的代表文章保留"""
+        signature = article_signature(article)
+        if signature is None:
+            self.representatives.append(article)
+            return True
+
+        if self.history is not None and self.history.find_similar(signature, self.threshold, self.exclude):
+            self.dropped.append(article)
+            return False
+
+        matches = self.index.query(signature, self.threshold)
+        if matches:
+            leader = self.representatives[min(matches)]
+            leader.setdefault("duplicates", []).append({
+                "title": article["title"],
+                "url": article["url"],
+                "source_name": article["source_name"],
+            })
+            self.merged += 1
+            return False
+
+        self.index.add(len(self.representatives), signature)
+        self.representatives.append(article)
+        return True
+
+
+def cluster_near_duplicates(articles: list[dict], history=None, threshold: float = 0.8,
+                            exclude: set[str] | None = None) -> tuple[list[dict], list[dict]]:
+    """
+    一次性聚类整批文章（规则见 NearDupClusterer）。
+    返回 (代表文章列表, 与历史重复而被丢弃的文章列表)。
+    """
+    clusterer = NearDupClusterer(history, threshold, exclude)
+    for article in articles:
+        clusterer.offer(article)
+    return clusterer.representatives, clusterer.dropped
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+离线录制/回放与端到端基准 (Record / Replay Bench)
+================================================
+record 正常爬取并调用大模型，把每个页面（NewsFetcher._fetch_page）和每次模型调用
+（PolicyAnalyzer._call_qwen）连同耗时录制成磁带（cassettes/<名称>/）；
+bench 离线回放某天的磁带：页面和模型响应都来自磁带，按录制时的耗时模拟延迟，
+完整跑一遍 爬取 → 近似去重 → AI分析 → 生成报告，输出各阶段耗时、页面吞吐、解析耗时和内存峰值。
+无需网络即可调并发、换解析后端、对比优化前后。
+
+Usage:
+    python3 replay.py record                      # 录制到 cassettes/<今天日期>/
+    python3 replay.py record --name baseline --fetch-only
+    python3 replay.py list                        # 查看已录制的磁带
+    python3 replay.py bench --name baseline       # 回放并输出基准
+    python3 replay.py bench --concurrency 8 --llm-concurrency 8 --latency-scale 0.5 --repeat 3
+    python3 replay.py bench --html-parser html.parser --keep-delays
+"""
+
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+from history_store import open_history_store
+from near_dup import NearDupClusterer
+from monitor import (
+    BJT, SOURCES_FILE, AnalysisCache, AnalysisPipeline, ExtractionProfiles, NewsFetcher,
+    PolicyAnalyzer, ReportFormatter, content_hash, estimate_tokens, load_json, log, save_json,
+)
+
+CASSETTES_DIR = Path(__file__).parent / "cassettes"
+
+
+class Cassette:
+    """
+    一盘磁带：
+    - config.json   录制时使用的完整配置（回放时使用同一批源）
+    - pages.json    {url: {"status": "ok"/"error", "latency": 秒, "file": 相对路径}}
+    - pages/*.html  页面内容（已按源编码解码）
+    - llm.json      {提示词哈希: {"latency": 秒, "response": 模型原始输出, "titles": [...]}}
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.pages: dict[str, dict] = load_json(self.root / "pages.json")
+        self.llm: dict[str, dict] = load_json(self.root / "llm.json")
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def prompt_key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()[:24]
+
+    def config(self) -> dict:
+        return load_json(self.root / "config.json")
+
+    def record_page(self, url: str, html: str | None, latency: float):
+        entry = {"status": "ok" if html is not None else "error", "latency": round(latency, 4)}
+        if html is not None:
+            entry["file"] = f"pages/{content_hash(url)}.html"
+            path = self.root / entry["file"]
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(html, encoding="utf-8")
+        with self._lock:
+            self.pages[url] = entry
+
+    def page(self, url: str) -> tuple[str | None, float] | None:
+        """返回 (html或None, 录制耗时)；未录制的URL返回None"""
+        entry = self.pages.get(url)
+        if entry is None:
+            return None
+        html = (self.root / entry["file"]).read_text(encoding="utf-8") if entry.get("file") else None
+        return html, entry["latency"]
+
+    def record_llm(self, key: str, prompt: str, response: str, latency: float):
+        with self._lock:
+            self.llm[key] = {"latency": round(latency, 4), "response": response,
+                             "titles": re.findall(r"^标题：(.*)$", prompt, re.M)}
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            save_json(self.root / "pages.json", self.pages)
+            save_json(self.root / "llm.json", self.llm)
+
+
+# ============================================================
+# 录制
+# ============================================================
+
+class RecordingFetcher(NewsFetcher):
+    """正常抓取，同时把页面和请求耗时（resp.elapsed，不含限流等待）写入磁带"""
+
+    def __init__(self, config: dict, history, cassette: Cassette, **kwargs):
+        super().__init__(config, history, **kwargs)
+        self.cassette = cassette
+        self._latency = threading.local()
+
+    def _request(self, url: str, extra_headers: dict | None = None):
+        resp = super()._request(url, extra_headers)
+        self._latency.value = resp.elapsed.total_seconds() if resp is not None else 0.0
+        return resp
+
+    def _fetch_page(self, url: str, encoding: str = "utf-8") -> str | None:
+        html = super()._fetch_page(url, encoding)
+        self.cassette.record_page(url, html, getattr(self._latency, "value", 0.0))
+        return html
+
+
+class RecordingAnalyzer(PolicyAnalyzer):
+    """正常调用大模型，同时录制每次调用的提示词哈希、原始输出和耗时"""
+
+    def __init__(self, settings: dict, cassette: Cassette, **kwargs):
+        super().__init__(settings, **kwargs)
+        self.cassette = cassette
+
+    def _call_qwen(self, prompt: str, max_tokens: int | None = None,
+                   expected_output: int | None = None) -> str:
+        started = time.monotonic()
+        result = super()._call_qwen(prompt, max_tokens, expected_output)
+        if result:
+            self.cassette.record_llm(Cassette.prompt_key(self.model, prompt), prompt, result,
+                                     time.monotonic() - started)
+        return result
+
+
+# ============================================================
+# 回放
+# ============================================================
+
+class ReplayFetcher(NewsFetcher):
+    """页面来自磁带：仍经过 HostThrottle（按域名并发/间隔），按录制耗时 × latency_scale 模拟网络"""
+
+    def __init__(self, config: dict, history, cassette: Cassette, latency_scale: float = 1.0, **kwargs):
+        super().__init__(config, history, **kwargs)
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+        self.replay_stats = {"pages": 0, "misses": 0, "bytes": 0}
+        self._stats_lock = threading.Lock()
+
+    def _fetch_page(self, url: str, encoding: str = "utf-8") -> str | None:
+        recorded = self.cassette.page(url)
+        with self.throttle.acquire(url):
+            if recorded is not None:
+                time.sleep(recorded[1] * self.latency_scale)
+        with self._stats_lock:
+            if recorded is None:
+                self.replay_stats["misses"] += 1
+                return None
+            self.replay_stats["pages"] += 1
+            self.replay_stats["bytes"] += len(recorded[0] or "")
+        return recorded[0]
+
+
+class ReplayAnalyzer(PolicyAnalyzer):
+    """
+    模型响应来自磁带：同一提示词直接回放录制的输出和耗时；
+    分组与录制时不同（批量模式下组合取决于抓取完成顺序）导致提示词不一致时，
+    按提示词中的标题从录制结果拼出等价响应，耗时取录制的平均值。
+    """
+
+    def __init__(self, settings: dict, cassette: Cassette, latency_scale: float = 1.0, **kwargs):
+        super().__init__(settings, **kwargs)
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+        self.replay_stats = {"hits": 0, "synthesized": 0, "misses": 0}
+        self._by_title = self._index_by_title()
+        latencies = [entry["latency"] for entry in cassette.llm.values()]
+        self._mean_latency = sum(latencies) / len(latencies) if latencies else 0.0
+
+    def _load_api_key(self) -> str:
+        return "replay"
+
+    def _index_by_title(self) -> dict[str, dict]:
+        """从录制的单篇/批量输出中拆出每篇文章的分析结果"""
+        by_title = {}
+        for entry in self.cassette.llm.values():
+            titles = entry.get("titles", [])
+            cleaned = self._strip_code_fence(entry["response"])
+            if len(titles) == 1:
+                try:
+                    by_title[titles[0]] = json.loads(cleaned)
+                except json.JSONDecodeError:
+                    pass
+            elif titles:
+                ids = {str(n) for n in range(1, len(titles) + 1)}
+                for item_id, analysis in self._parse_multi(cleaned, ids).items():
+                    by_title[titles[int(item_id) - 1]] = analysis
+        return by_title
+
+    def _synthesize(self, prompt: str) -> str:
+        titles = re.findall(r"^标题：(.*)$", prompt, re.M)
+        found = [self._by_title.get(t) for t in titles]
+        if not titles or any(a is None for a in found):
+            return ""
+        if "=== 文章 " not in prompt:
+            return json.dumps(found[0], ensure_ascii=False)
+        return json.dumps([{**a, "id": str(n)} for n, a in enumerate(found, 1)], ensure_ascii=False)
+
+    def _call_qwen(self, prompt: str, max_tokens: int | None = None,
+                   expected_output: int | None = None) -> str:
+        reserved = estimate_tokens(self._system_prompt() + prompt) + (expected_output or self.expected_output_tokens)
+        self.limiter.acquire(reserved)
+
+        entry = self.cassette.llm.get(Cassette.prompt_key(self.model, prompt))
+        if entry is not None:
+            result, latency, outcome = entry["response"], entry["latency"], "hits"
+        else:
+            result = self._synthesize(prompt)
+            latency, outcome = self._mean_latency, "synthesized" if result else "misses"
+        time.sleep(latency * self.latency_scale)
+
+        with self._stats_lock:
+            self.replay_stats[outcome] += 1
+        usage = {"prompt_tokens": estimate_tokens(self._system_prompt() + prompt),
+                 "completion_tokens": estimate_tokens(result)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        self._record_usage(usage, reserved)
+        return result
+
+
+# ============================================================
+# 命令
+# ============================================================
+
+def record(name: str, fetch_only: bool):
+    import urllib3
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    config = load_json(SOURCES_FILE)
+    cassette = Cassette(CASSETTES_DIR / name)
+    cassette.root.mkdir(parents=True, exist_ok=True)
+    save_json(cassette.root / "config.json", config)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 全新的历史记录：录制当天所有相关文章，不受本机增量状态影响
+        history = open_history_store("sqlite", Path(tmp) / "history.json", Path(tmp) / "history.db")
+        fetcher = RecordingFetcher(config, history, cassette)
+        articles = fetcher.fetch_all()
+        if not fetch_only:
+            weights = config.get("keyword_weights", {})
+            analyzer = RecordingAnalyzer(config.get("llm", {}), cassette,
+                                         keywords={kw: weights.get(kw, 1) for kw in config["filter_keywords"]})
+            analyzer.analyze_batch(articles)
+        history.close()
+
+    cassette.save()
+    save_json(cassette.root / "meta.json", {
+        "recorded_at": datetime.now(BJT).isoformat(),
+        "pages": len(cassette.pages),
+        "llm_calls": len(cassette.llm),
+        "articles": len(articles),
+    })
+    log.info(f"📼 已录制 {len(cassette.pages)} 个页面、{len(cassette.llm)} 次模型调用: {cassette.root}")
+
+
+def list_cassettes():
+    if not CASSETTES_DIR.exists():
+        print(f"❌ {CASSETTES_DIR} 下没有磁带，请先运行: python3 replay.py record")
+        return
+    print(f"{'name':<20} {'recorded_at':<26} {'pages':>6} {'llm':>5} {'articles':>9}")
+    for path in sorted(CASSETTES_DIR.iterdir()):
+        meta = load_json(path / "meta.json")
+        if meta:
+            print(f"{path.name:<20} {meta['recorded_at'][:19]:<26} {meta['pages']:>6} "
+                  f"{meta['llm_calls']:>5} {meta['articles']:>9}")
+
+
+def replay_once(cassette: Cassette, args) -> dict:
+    """回放一遍完整流程，返回各阶段指标"""
+    config = cassette.config()
+    settings = {**config["settings"]}
+    if args.html_parser:
+        settings["html_parser"] = args.html_parser
+    if not args.keep_delays:
+        settings["request_delay_min"] = settings["request_delay_max"] = 0
+    config = {**config, "settings": settings}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = open_history_store("sqlite", Path(tmp) / "history.json", Path(tmp) / "history.db")
+        fetcher = ReplayFetcher(config, history, cassette, args.latency_scale,
+                                concurrency=args.concurrency, profiles=ExtractionProfiles(None))
+        weights = config.get("keyword_weights", {})
+        analyzer = None if args.fetch_only else ReplayAnalyzer(
+            config.get("llm", {}), cassette, args.latency_scale, concurrency=args.llm_concurrency,
+            cache=AnalysisCache(Path(tmp) / "analysis_cache.db") if args.analysis_cache else None,
+            keywords={kw: weights.get(kw, 1) for kw in config["filter_keywords"]},
+        )
+
+        started = time.perf_counter()
+        batch_hashes: set[str] = set()
+        clusterer = NearDupClusterer(history, settings.get("near_dup_threshold", 0.8), batch_hashes)
+
+        def fetched():
+            for article in fetcher.iter_articles():
+                batch_hashes.add(content_hash(article["url"]))
+                yield article
+
+        pipeline = None
+        if analyzer:
+            pipeline = AnalysisPipeline(analyzer, settings.get("pipeline_queue_size", 8))
+            articles = pipeline.run(fetched(), clusterer)
+        else:
+            articles = [a for a in fetched() if clusterer.offer(a)]
+        pipeline_done = time.perf_counter()
+
+        formatter = ReportFormatter()
+        formatter.format_report(articles)
+        formatter.format_json_report(articles)
+        finished = time.perf_counter()
+        history.close()
+
+    t = fetcher.timings
+    parse = t["parse"].values()
+    result = {
+        "total": finished - started,
+        "list": t["list_seconds"],
+        "detail": t["detail_seconds"],
+        "pipeline": pipeline_done - started,
+        "report": finished - pipeline_done,
+        "parse": sum(s["list_seconds"] + s["detail_seconds"] for s in parse),
+        "pages": fetcher.replay_stats["pages"],
+        "page_misses": fetcher.replay_stats["misses"],
+        "articles": len(articles),
+    }
+    result["pages_per_sec"] = result["pages"] / t["wall_seconds"] if t["wall_seconds"] else 0.0
+    if pipeline:
+        result["dedupe"] = pipeline.metrics["dedupe"]["seconds"]
+        result["llm_requests"] = analyzer.stats["requests"]
+        result["llm_replay"] = dict(analyzer.replay_stats)
+    return result
+
+
+def bench(args):
+    cassette_dir = CASSETTES_DIR / args.name
+    if not (cassette_dir / "config.json").exists():
+        print(f"❌ 未找到磁带 {cassette_dir}，请先运行: python3 replay.py record --name {args.name}")
+        sys.exit(1)
+    cassette = Cassette(cassette_dir)
+    log.setLevel("WARNING")  # 回放时只看汇总
+
+    runs = [replay_once(cassette, args) for _ in range(args.repeat)]
+    # 内存峰值单独跑一遍（tracemalloc 会拖慢计时）
+    tracemalloc.start()
+    replay_once(cassette, args)
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+
+    def avg(key):
+        return sum(r[key] for r in runs) / len(runs)
+
+    last = runs[-1]
+    print(f"📼 磁带 {args.name}：{len(cassette.pages)} 个页面 / {len(cassette.llm)} 次模型调用，"
+          f"回放 {args.repeat} 次取平均（latency × {args.latency_scale}）")
+    print(f"{'stage':<14} {'seconds':>9}")
+    stages = ["list", "detail", "dedupe", "pipeline", "report", "total"] if "dedupe" in last else \
+        ["list", "detail", "pipeline", "report", "total"]
+    for stage in stages:
+        print(f"{stage:<14} {avg(stage):>9.3f}")
+    print(f"{'parse(cpu)':<14} {avg('parse'):>9.3f}")
+    print(f"页面 {last['pages']} 个（未录制 {last['page_misses']}），{avg('pages_per_sec'):.1f} 页/s；"
+          f"保留文章 {last['articles']} 篇；内存峰值 {peak_mb:.1f} MB")
+    if "llm_requests" in last:
+        rs = last["llm_replay"]
+        print(f"模型请求 {last['llm_requests']} 次（磁带命中 {rs['hits']}，按标题拼合 {rs['synthesized']}，"
+              f"缺失 {rs['misses']}）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线录制/回放与端到端基准")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="在线运行一遍并录制页面和模型调用")
+    rec.add_argument("--name", default=datetime.now(BJT).strftime("%Y%m%d"), help="磁带名称（默认今天日期）")
+    rec.add_argument("--fetch-only", action="store_true", help="只录制页面，不调用大模型")
+    sub.add_parser("list", help="查看已录制的磁带")
+    b = sub.add_parser("bench", help="离线回放磁带并输出基准")
+    b.add_argument("--name", default=None, help="磁带名称（默认最新一盘）")
+    b.add_argument("--repeat", type=int, default=1, help="回放次数，取平均")
+    b.add_argument("--concurrency", type=int, default=None, help="爬取并发数")
+    b.add_argument("--llm-concurrency", type=int, default=None, help="AI分析并发数")
+    b.add_argument("--latency-scale", type=float, default=1.0, help="录制耗时的缩放系数，0 表示不模拟延迟")
+    b.add_argument("--html-parser", default=None, help="覆盖 settings.html_parser")
+    b.add_argument("--keep-delays", action="store_true", help="保留 request_delay_min/max 礼貌间隔（默认置0）")
+    b.add_argument("--analysis-cache", action="store_true", help="启用（空的）分析缓存，测缓存开销")
+    b.add_argument("--fetch-only", action="store_true", help="只回放爬取，不做AI分析")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.name, args.fetch_only)
+    elif args.command == "list":
+        list_cassettes()
+    else:
+        if args.name is None:
+            names = sorted(p.name for p in CASSETTES_DIR.glob("*") if (p / "config.json").exists()) \
+                if CASSETTES_DIR.exists() else []
+            args.name = names[-1] if names else "-"
+        bench(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+文章/分析结果存储 (Report Store)
+================================
+每次运行分析过的文章逐条追加到按月切分的 JSONL 段文件，
+同时在 SQLite 索引中记录 (日期, 风险等级, 来源, 段文件, 偏移, 长度)。
+生成日报/周报时只查索引、按偏移直接读取命中的行，不再重新扫描 output/ 下的全部报告。
+
+段文件只追加不修改；索引损坏或丢失时可用 reindex 从段文件重建。
+
+Usage:
+    python3 report_store.py stats                          # 查看存储条数和日期范围
+    python3 report_store.py digest --since 2026-02-16      # 生成自某天起的汇总简报（Markdown）
+    python3 report_store.py digest --since 2026-02-16 --until 2026-02-22 --format json
+    python3 report_store.py digest --since 2026-02-01 --risk red --source mofcom
+    python3 report_store.py import                         # 一次性导入 output/ 下已有的 JSON 报告
+    python3 report_store.py reindex                        # 从段文件重建索引
+"""
+
+import sys
+import json
+import sqlite3
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+OUTPUT_DIR = SCRIPT_DIR / "output"
+REPORT_STORE_DIR = OUTPUT_DIR / "store"
+
+# 北京时间
+BJT = timezone(timedelta(hours=8))
+
+
+def _url_hash(url: str) -> str:
+    return hashlib.md5(url.encode("utf-8")).hexdigest()
+
+
+def _record_day(record: dict) -> str:
+    """记录所属日期（北京时间 YYYY-MM-DD），取抓取时间"""
+    try:
+        return datetime.fromisoformat(record["fetch_time"]).astimezone(BJT).strftime("%Y-%m-%d")
+    except (KeyError, ValueError):
+        return datetime.now(BJT).strftime("%Y-%m-%d")
+
+
+class ReportStore:
+    """
+    追加写的文章存储：
+    - <root>/articles_YYYYMM.jsonl  每行一篇文章（含 ai_analysis），按抓取月份切分
+    - <root>/index.db               索引：url_hash 唯一，按 day / risk_level / source_id 查询
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.root / "index.db", check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url_hash   TEXT PRIMARY KEY,
+                day        TEXT NOT NULL,
+                risk_level TEXT NOT NULL,
+                source_id  TEXT NOT NULL,
+                report_id  TEXT NOT NULL,
+                segment    TEXT NOT NULL,
+                offset     INTEGER NOT NULL,
+                length     INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_day ON entries(day);
+            CREATE INDEX IF NOT EXISTS idx_entries_risk ON entries(risk_level, day);
+            CREATE INDEX IF NOT EXISTS idx_entries_source ON entries(source_id, day);
+        """)
+        self._conn.commit()
+
+    def _index_row(self, record: dict, segment: str, offset: int, length: int) -> tuple:
+        return (
+            _url_hash(record["url"]),
+            _record_day(record),
+            record.get("ai_analysis", {}).get("risk_level", "yellow"),
+            record.get("source_id") or record.get("source", ""),
+            record.get("report_id", ""),
+            segment, offset, length,
+        )
+
+    def append(self, report_id: str, records: list[dict]) -> int:
+        """追加一批文章记录（已存在的URL跳过），返回实际写入条数"""
+        with self._lock:
+            existing = {
+                row[0] for row in self._conn.execute(
+                    f"SELECT url_hash FROM entries WHERE url_hash IN ({','.join('?' * len(records))})",
+                    [_url_hash(r["url"]) for r in records],
+                )
+            } if records else set()
+
+            rows = []
+            handles = {}
+            try:
+                for record in records:
+                    url_hash = _url_hash(record["url"])
+                    if url_hash in existing:
+                        continue
+                    existing.add(url_hash)
+                    record = {**record, "report_id": report_id}
+                    segment = f"articles_{_record_day(record)[:7].replace('-', '')}.jsonl"
+                    if segment not in handles:
+                        handles[segment] = open(self.root / segment, "ab")
+                        self._terminate_partial_line(handles[segment])
+                    f = handles[segment]
+                    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                    offset = f.tell()
+                    f.write(line)
+                    rows.append(self._index_row(record, segment, offset, len(line)))
+            finally:
+                # 先落盘段文件再写索引：中途失败最多留下未索引的行，reindex 可恢复
+                for f in handles.values():
+                    f.close()
+
+            self._conn.executemany("INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+            return len(rows)
+
+    @staticmethod
+    def _terminate_partial_line(f):
+        """上次写入中断留下半行时先补换行，避免和新记录粘在同一行"""
+        f.seek(0, 2)
+        if f.tell() == 0:
+            return
+        with open(f.name, "rb") as r:
+            r.seek(-1, 2)
+            if r.read(1) != b"\n":
+                f.write(b"\n")
+
+    def query(self, since: str, until: str | None = None, risk_levels: list[str] | None = None,
+              source_ids: list[str] | None = None) -> list[dict]:
+        """按日期范围（含首尾，YYYY-MM-DD）和可选的风险等级/来源过滤，按存储顺序返回记录"""
+        sql = "SELECT segment, offset, length FROM entries WHERE day >= ?"
+        params: list = [since]
+        if until:
+            sql += " AND day <= ?"
+            params.append(until)
+        if risk_levels:
+            sql += f" AND risk_level IN ({','.join('?' * len(risk_levels))})"
+            params.extend(risk_levels)
+        if source_ids:
+            sql += f" AND source_id IN ({','.join('?' * len(source_ids))})"
+            params.extend(source_ids)
+        sql += " ORDER BY segment, offset"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        records = []
+        current, f = None, None
+        try:
+            for segment, offset, length in rows:
+                if segment != current:
+                    if f:
+                        f.close()
+                    current, f = segment, open(self.root / segment, "rb")
+                f.seek(offset)
+                records.append(json.loads(f.read(length)))
+        finally:
+            if f:
+                f.close()
+        return records
+
+    def stats(self) -> dict:
+        with self._lock:
+            total, first, last = self._conn.execute(
+                "SELECT COUNT(*), MIN(day), MAX(day) FROM entries"
+            ).fetchone()
+            by_risk = dict(self._conn.execute(
+                "SELECT risk_level, COUNT(*) FROM entries GROUP BY risk_level"
+            ).fetchall())
+        segments = sorted(p.name for p in self.root.glob("articles_*.jsonl"))
+        return {"articles": total, "first_day": first, "last_day": last,
+                "by_risk": by_risk, "segments": segments}
+
+    def reindex(self) -> int:
+        """丢弃索引，按段文件内容重建（同一URL保留最早的一条）"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            rows = []
+            for path in sorted(self.root.glob("articles_*.jsonl")):
+                offset = 0
+                with open(path, "rb") as f:
+                    for line in f:
+                        if line.strip():
+                            try:
+                                record = json.loads(line)
+                            except json.JSONDecodeError:
+                                record = None  # 写入中断留下的半行
+                            if record is not None:
+                                rows.append(self._index_row(record, path.name, offset, len(line)))
+                        offset += len(line)
+            self._conn.executemany("INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def import_reports(store: ReportStore, output_dir: Path) -> int:
+    """一次性导入 output/report_*.json 中已有的文章"""
+    imported = 0
+    for path in sorted(output_dir.glob("report_*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+        imported += store.append(report.get("report_id", path.stem), report.get("articles", []))
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="文章/分析结果存储与汇总简报")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="查看存储条数和日期范围")
+    digest = sub.add_parser("digest", help="按日期范围生成汇总简报")
+    digest.add_argument("--since", required=True, help="起始日期 YYYY-MM-DD（含）")
+    digest.add_argument("--until", default=None, help="结束日期 YYYY-MM-DD（含），默认至今")
+    digest.add_argument("--risk", action="append", choices=["red", "yellow", "green"],
+                        help="只包含指定风险等级，可重复")
+    digest.add_argument("--source", action="append", help="只包含指定源ID，可重复")
+    digest.add_argument("--format", choices=["md", "json"], default="md", help="输出格式")
+    digest.add_argument("--output", default=None, help="写入文件（默认输出到 stdout）")
+    sub.add_parser("import", help="导入 output/ 下已有的 JSON 报告")
+    sub.add_parser("reindex", help="从段文件重建索引")
+    args = parser.parse_args()
+
+    if args.command == "digest":
+        for value in (args.since, args.until):
+            if value:
+                try:
+                    datetime.strptime(value, "%Y-%m-%d")
+                except ValueError:
+                    print(f"❌ 日期格式应为 YYYY-MM-DD: {value}")
+                    sys.exit(1)
+
+    store = ReportStore(REPORT_STORE_DIR)
+    if args.command == "digest":
+        from monitor import ReportFormatter  # 延迟导入：monitor 启动时会导入本模块
+
+        records = store.query(args.since, args.until, args.risk, args.source)
+        store.close()
+        formatter = ReportFormatter()
+        if args.format == "json":
+            text = json.dumps(formatter.format_json_digest(records, args.since, args.until),
+                              ensure_ascii=False, indent=2)
+        else:
+            text = formatter.format_digest(records, args.since, args.until)
+        if args.output:
+            Path(args.output).write_text(text, encoding="utf-8")
+            print(f"📄 汇总简报: {args.output}（{len(records)} 篇）")
+        else:
+            print(text)
+        return
+
+    if args.command == "import":
+        print(f"✅ 已导入 {import_reports(store, OUTPUT_DIR)} 篇文章")
+    elif args.command == "reindex":
+        print(f"✅ 索引已重建，共 {store.reindex()} 篇文章")
+    st = store.stats()
+    print(f"📚 存储: {st['articles']} 篇，日期 {st['first_day'] or '—'} ~ {st['last_day'] or '—'}，"
+          f"风险分布 {st['by_risk']}，段文件 {len(st['segments'])} 个")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
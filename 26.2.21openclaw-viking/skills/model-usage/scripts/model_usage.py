@@ -10,70 +10,235 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import re
+import sqlite3
 import subprocess
 import sys
-from dataclasses import dataclass
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 
 def eprint(msg: str) -> None:
     print(msg, file=sys.stderr)
 
 
-def run_codexbar_cost(provider: str) -> List[Dict[str, Any]]:
-    cmd = ["codexbar", "cost", "--format", "json", "--provider", provider]
-    try:
-        output = subprocess.check_output(cmd, text=True)
-    except FileNotFoundError:
-        raise RuntimeError("codexbar not found on PATH. Install CodexBar CLI first.")
-    except subprocess.CalledProcessError as exc:
-        raise RuntimeError(f"codexbar cost failed (exit {exc.returncode}).")
-    try:
-        payload = json.loads(output)
-    except json.JSONDecodeError as exc:
-        raise RuntimeError(f"Failed to parse codexbar JSON output: {exc}")
-    if not isinstance(payload, list):
-        raise RuntimeError("Expected codexbar cost JSON array.")
-    return payload
-
+PROVIDERS = ("codex", "claude")
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_VALUE_END = frozenset(" \t\r\n,:]}")
+
+
+class JsonStream:
+    """Incremental reader over a JSON text stream.
+
+    Only the values a caller asks for are decoded; everything else is scanned
+    and dropped chunk by chunk, so memory stays bounded by the largest decoded
+    value rather than by the size of the payload.
+    """
+
+    def __init__(self, handle: TextIO, chunk_size: int = CHUNK_SIZE) -> None:
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at end of input)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r}, got {found or 'end of input'!r}")
+        self._pos += 1
+
+    def _decode_buffered(self) -> Optional[Tuple[Any, int]]:
+        """Decode the next value from buffered text, or None if it may continue past the buffer."""
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            return None
+        # A value is only complete once a delimiter follows it; "12" or "1." may be cut at the chunk edge.
+        if end < len(self._buf) and self._buf[end] in _VALUE_END or self._eof:
+            return value, end
+        return None
 
-def load_payload(input_path: Optional[str], provider: str) -> Dict[str, Any]:
-    if input_path:
-        if input_path == "-":
-            raw = sys.stdin.read()
+    def value(self) -> Any:
+        """Decode and consume the next value."""
+        self.peek()
+        while True:
+            decoded = self._decode_buffered()
+            if decoded is not None:
+                value, self._pos = decoded
+                return value
+            self._fill()
+
+    def skip(self) -> None:
+        """Consume the next value without keeping it.
+
+        Values that fit in the buffered text are decoded and dropped in one
+        call; larger containers are walked element by element instead.
+        """
+        first = self.peek()
+        decoded = self._decode_buffered()
+        if decoded is not None:
+            self._pos = decoded[1]
+        elif first == "[":
+            for _ in self.iter_array():
+                self.skip()
+        elif first == "{":
+            for _ in self.iter_object():
+                self.skip()
         else:
-            with open(input_path, "r", encoding="utf-8") as handle:
-                raw = handle.read()
-        data = json.loads(raw)
-    else:
-        data = run_codexbar_cost(provider)
-
-    if isinstance(data, dict):
-        return data
-
-    if isinstance(data, list):
-        for entry in data:
-            if isinstance(entry, dict) and entry.get("provider") == provider:
-                return entry
-        raise RuntimeError(f"Provider '{provider}' not found in codexbar payload.")
+            self.value()
+
+    def _delimiter(self, close: str) -> bool:
+        found = self.peek()
+        self._pos += 1
+        if found == ",":
+            return False
+        if found == close:
+            return True
+        raise ValueError(f"expected ',' or {close!r}, got {found or 'end of input'!r}")
+
+    def iter_array(self) -> Iterator[None]:
+        """Step through array elements; the caller must consume each element."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            if self._delimiter("]"):
+                return
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield object keys; the caller must consume each key's value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise ValueError("expected object key")
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self._delimiter("}"):
+                return
+
+
+def _iter_payload_daily(stream: JsonStream, provider: Optional[str]) -> Generator[Dict[str, Any], None, bool]:
+    """Stream the daily rows of one provider object and return whether it matched.
+
+    With a provider set, rows are only yielded once the object's "provider" is
+    known to match; rows that appear before that key are held until then.
+    """
+    matched = provider is None
+    known = provider is None
+    pending: List[Dict[str, Any]] = []
+    for key in stream.iter_object():
+        if key == "provider" and not known:
+            known = True
+            matched = stream.value() == provider
+            if matched:
+                yield from pending
+            pending = []
+        elif key == "daily" and (matched or not known) and stream.peek() == "[":
+            for _ in stream.iter_array():
+                if stream.peek() != "{":
+                    stream.skip()
+                elif matched:
+                    yield stream.value()
+                else:
+                    pending.append(stream.value())
+        else:
+            stream.skip()
+    return matched
 
-    raise RuntimeError("Unsupported JSON input format.")
 
+def stream_daily_entries(
+    handle: TextIO, provider: str, require_array: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """Yield the selected provider's daily rows from codexbar cost JSON as they are parsed.
 
-@dataclass
-class ModelCost:
-    model: str
-    cost: float
+    Accepts the codexbar array (one object per provider) or a single provider
+    object. Other providers are skipped without being decoded.
+    """
+    stream = JsonStream(handle)
+    try:
+        top = stream.peek()
+        if top == "{" and not require_array:
+            yield from _iter_payload_daily(stream, None)
+        elif top == "[":
+            for _ in stream.iter_array():
+                if stream.peek() != "{":
+                    stream.skip()
+                elif (yield from _iter_payload_daily(stream, provider)):
+                    return
+            raise RuntimeError(f"Provider '{provider}' not found in codexbar payload.")
+        elif require_array:
+            raise RuntimeError("Expected codexbar cost JSON array.")
+        else:
+            raise RuntimeError("Unsupported JSON input format.")
+    except ValueError as exc:
+        raise RuntimeError(f"Failed to parse codexbar JSON output: {exc}")
 
 
-def parse_daily_entries(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-    daily = payload.get("daily")
-    if not daily:
-        return []
-    if not isinstance(daily, list):
-        return []
-    return [entry for entry in daily if isinstance(entry, dict)]
+def run_codexbar_cost(provider: str) -> Iterator[Dict[str, Any]]:
+    cmd = ["codexbar", "cost", "--format", "json", "--provider", provider]
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    except FileNotFoundError:
+        raise RuntimeError("codexbar not found on PATH. Install CodexBar CLI first.")
+    with proc:
+        try:
+            yield from stream_daily_entries(proc.stdout, provider, require_array=True)
+            while proc.stdout.read(CHUNK_SIZE):
+                pass
+        except RuntimeError:
+            # Truncated output from a failed run: report the exit status instead of the parse error.
+            proc.stdout.close()
+            if proc.wait() != 0:
+                raise RuntimeError(f"codexbar cost failed (exit {proc.returncode}).") from None
+            raise
+    if proc.returncode != 0:
+        raise RuntimeError(f"codexbar cost failed (exit {proc.returncode}).")
+
+
+def iter_daily_entries(input_path: Optional[str], provider: str) -> Iterator[Dict[str, Any]]:
+    if not input_path:
+        yield from run_codexbar_cost(provider)
+    elif input_path == "-":
+        yield from stream_daily_entries(sys.stdin, provider)
+    else:
+        with open(input_path, "r", encoding="utf-8") as handle:
+            yield from stream_daily_entries(handle, provider)
 
 
 def parse_date(value: str) -> Optional[date]:
@@ -83,69 +248,356 @@ def parse_date(value: str) -> Optional[date]:
         return None
 
 
-def filter_by_days(entries: List[Dict[str, Any]], days: Optional[int]) -> List[Dict[str, Any]]:
+def filter_by_days(entries: Iterable[Dict[str, Any]], days: Optional[int]) -> Iterator[Dict[str, Any]]:
     if not days:
-        return entries
+        yield from entries
+        return
     cutoff = date.today() - timedelta(days=days - 1)
-    filtered: List[Dict[str, Any]] = []
     for entry in entries:
         day = entry.get("date")
         if not isinstance(day, str):
             continue
         parsed = parse_date(day)
         if parsed and parsed >= cutoff:
-            filtered.append(entry)
-    return filtered
-
-
-def aggregate_costs(entries: Iterable[Dict[str, Any]]) -> Dict[str, float]:
-    totals: Dict[str, float] = {}
-    for entry in entries:
-        breakdowns = entry.get("modelBreakdowns")
-        if not breakdowns:
-            continue
-        if not isinstance(breakdowns, list):
-            continue
+            yield entry
+
+
+def digest_entry(entry: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Dict[str, List[Optional[float]]]]:
+    """Reduce a daily row to (date, current model, {model: [latest cost, total cost]}).
+
+    The current model is the highest-cost breakdown (first one on ties), falling
+    back to the last of modelsUsed. A model's latest cost is that of its first
+    breakdown; its total is None when none of its breakdowns had a numeric cost.
+    """
+    day = entry.get("date") if isinstance(entry.get("date"), str) else None
+    top_model: Optional[str] = None
+    top_cost = 0.0
+    models: Dict[str, List[Optional[float]]] = {}
+    breakdowns = entry.get("modelBreakdowns")
+    if isinstance(breakdowns, list):
         for item in breakdowns:
             if not isinstance(item, dict):
                 continue
-            model = item.get("modelName")
-            cost = item.get("cost")
-            if not isinstance(model, str):
+            name = item.get("modelName")
+            if not isinstance(name, str):
                 continue
-            if not isinstance(cost, (int, float)):
+            cost = item.get("cost")
+            cost = float(cost) if isinstance(cost, (int, float)) else None
+            costs = models.get(name)
+            if costs is None:
+                models[name] = [cost, cost]
+            elif cost is not None:
+                costs[1] = cost if costs[1] is None else costs[1] + cost
+            if cost is not None and (top_model is None or cost > top_cost):
+                top_model, top_cost = name, cost
+    if top_model is None:
+        models_used = entry.get("modelsUsed")
+        if isinstance(models_used, list) and models_used and isinstance(models_used[-1], str):
+            top_model = models_used[-1]
+    return day, top_model, models
+
+
+@dataclass
+class CostSummary:
+    """Per-model totals, current model and latest-day costs, built in one pass over daily rows.
+
+    Rows may arrive in any order; "latest" compares dates as strings, and a
+    later row wins ties, matching a stable sort by date.
+    """
+
+    totals: Dict[str, float] = field(default_factory=dict)
+    entry_count: int = 0
+    current_model: Optional[str] = None
+    current_date: Optional[str] = None
+    current_key: Optional[str] = None
+    latest: Dict[str, Tuple[str, Optional[str], Optional[float]]] = field(default_factory=dict)
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        self.entry_count += 1
+        day, top_model, models = digest_entry(entry)
+        key = day or ""
+        if top_model and (self.current_key is None or key >= self.current_key):
+            self.current_model, self.current_date, self.current_key = top_model, day, key
+        for name, (cost, total) in models.items():
+            if total is not None:
+                self.totals[name] = self.totals.get(name, 0.0) + total
+            previous = self.latest.get(name)
+            if previous is None or key >= previous[0]:
+                self.latest[name] = (key, day, cost)
+
+    def latest_day_cost(self, model: str) -> Tuple[Optional[str], Optional[float]]:
+        _, day, cost = self.latest.get(model, ("", None, None))
+        return day, cost
+
+
+def summarize(entries: Iterable[Dict[str, Any]]) -> CostSummary:
+    summary = CostSummary()
+    for entry in entries:
+        summary.add(entry)
+    return summary
+
+
+def default_index_path() -> str:
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache, "model-usage", "cost-index.sqlite")
+
+
+class CostIndex:
+    """Local SQLite index of daily per-model costs, keyed by provider/date/model.
+
+    Refreshes are incremental: rows dated before the newest stored day are
+    skipped, and the newest day itself is replaced since it may still be
+    accumulating usage. Queries then read only the requested date range.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS daily_rows (
+            provider TEXT NOT NULL,
+            day      TEXT NOT NULL,
+            seq      INTEGER NOT NULL,
+            dated    INTEGER NOT NULL,
+            model    TEXT,
+            PRIMARY KEY (provider, day, seq)
+        );
+        CREATE TABLE IF NOT EXISTS model_costs (
+            provider TEXT NOT NULL,
+            day      TEXT NOT NULL,
+            seq      INTEGER NOT NULL,
+            dated    INTEGER NOT NULL,
+            model    TEXT NOT NULL,
+            cost     REAL,
+            total    REAL,
+            PRIMARY KEY (provider, day, seq, model)
+        );
+        CREATE INDEX IF NOT EXISTS model_costs_by_model ON model_costs (provider, model, dated, day, total);
+        CREATE INDEX IF NOT EXISTS model_costs_by_day ON model_costs (provider, dated, day, model, total);
+        CREATE TABLE IF NOT EXISTS refreshes (
+            provider     TEXT PRIMARY KEY,
+            refreshed_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def age(self, provider: str) -> Optional[float]:
+        """Seconds since the provider was last refreshed, or None if it never was."""
+        row = self.conn.execute("SELECT refreshed_at FROM refreshes WHERE provider = ?", (provider,)).fetchone()
+        return time.time() - row[0] if row else None
+
+    def refresh(self, provider: str, entries: Iterable[Dict[str, Any]]) -> int:
+        """Ingest daily rows on or after the newest stored day; returns the number of rows written.
+
+        Rows are collected before the write transaction starts, so a slow codexbar
+        run never holds the database lock.
+        """
+        (cutoff,) = self.conn.execute(
+            "SELECT MAX(day) FROM daily_rows WHERE provider = ? AND dated = 1", (provider,)
+        ).fetchone()
+        rows: List[Tuple[Any, ...]] = []
+        costs: List[Tuple[Any, ...]] = []
+        for seq, entry in enumerate(entries):
+            day, top_model, models = digest_entry(entry)
+            key = day or ""
+            if cutoff and key < cutoff:
                 continue
-            totals[model] = totals.get(model, 0.0) + float(cost)
-    return totals
+            dated = 1 if day and parse_date(day) else 0
+            rows.append((provider, key, seq, dated, top_model))
+            costs.extend((provider, key, seq, dated, name, cost, total) for name, (cost, total) in models.items())
+
+        with self.conn:
+            for table in ("daily_rows", "model_costs"):
+                self.conn.execute(f"DELETE FROM {table} WHERE provider = ? AND day >= ?", (provider, cutoff or ""))
+            self.conn.executemany("INSERT INTO daily_rows VALUES (?, ?, ?, ?, ?)", rows)
+            self.conn.executemany("INSERT INTO model_costs VALUES (?, ?, ?, ?, ?, ?, ?)", costs)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO refreshes (provider, refreshed_at) VALUES (?, ?)", (provider, time.time())
+            )
+        return len(rows)
+
+    def summary(self, provider: str, days: Optional[int], model: Optional[str] = None) -> CostSummary:
+        """Build a CostSummary from the index; latest-day cost is filled in for `model` or the current model."""
+        where = "provider = ?"
+        params: List[Any] = [provider]
+        if days:
+            where += " AND dated = 1 AND day >= ?"
+            params.append((date.today() - timedelta(days=days - 1)).isoformat())
+
+        summary = CostSummary()
+        (summary.entry_count,) = self.conn.execute(f"SELECT COUNT(*) FROM daily_rows WHERE {where}", params).fetchone()
+        current = self.conn.execute(
+            f"SELECT model, day FROM daily_rows WHERE {where} AND model IS NOT NULL ORDER BY day DESC, seq DESC LIMIT 1",
+            params,
+        ).fetchone()
+        if current:
+            summary.current_model, summary.current_key = current
+            summary.current_date = current[1] or None
+        summary.totals = dict(
+            self.conn.execute(
+                f"SELECT model, SUM(total) FROM model_costs WHERE {where} GROUP BY model HAVING COUNT(total) > 0",
+                params,
+            )
+        )
+        target = model or summary.current_model
+        if target:
+            latest = self.conn.execute(
+                f"SELECT day, cost FROM model_costs WHERE {where} AND model = ? ORDER BY day DESC, seq DESC LIMIT 1",
+                params + [target],
+            ).fetchone()
+            if latest:
+                summary.latest[target] = (latest[0], latest[0] or None, latest[1])
+        return summary
+
+    def daily_costs(self, provider: str, days: Optional[int]) -> Dict[date, Dict[str, float]]:
+        """Per-day, per-model cost totals for dated rows, as collect_daily_costs builds them."""
+        sql = """
+            SELECT r.day, c.model, SUM(c.total)
+            FROM daily_rows r
+            LEFT JOIN model_costs c
+                ON c.provider = r.provider AND c.day = r.day AND c.seq = r.seq AND c.total IS NOT NULL
+            WHERE r.provider = ? AND r.dated = 1
+        """
+        params: List[Any] = [provider]
+        if days:
+            sql += " AND r.day >= ?"
+            params.append((date.today() - timedelta(days=days - 1)).isoformat())
+        sql += " GROUP BY r.day, c.model"
+        daily: Dict[date, Dict[str, float]] = {}
+        for day, model, total in self.conn.execute(sql, params):
+            costs = daily.setdefault(date.fromisoformat(day), {})
+            if model is not None:
+                costs[model] = total
+        return daily
+
+
+def refreshed_index(index_path: str, input_path: Optional[str], provider: str, max_age: float) -> CostIndex:
+    """Open the cost index, refreshing it first when given --input or when it is older than max_age."""
+    index = CostIndex(index_path)
+    try:
+        age = index.age(provider)
+        if input_path or age is None or age >= max_age:
+            index.refresh(provider, iter_daily_entries(input_path, provider))
+    except Exception:
+        index.close()
+        raise
+    return index
 
 
-def pick_current_model(entries: List[Dict[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
-    if not entries:
-        return None, None
-    sorted_entries = sorted(
-        entries,
-        key=lambda entry: entry.get("date") or "",
-    )
-    for entry in reversed(sorted_entries):
-        breakdowns = entry.get("modelBreakdowns")
-        if isinstance(breakdowns, list) and breakdowns:
-            scored: List[ModelCost] = []
-            for item in breakdowns:
-                if not isinstance(item, dict):
-                    continue
-                model = item.get("modelName")
-                cost = item.get("cost")
-                if isinstance(model, str) and isinstance(cost, (int, float)):
-                    scored.append(ModelCost(model=model, cost=float(cost)))
-            if scored:
-                scored.sort(key=lambda item: item.cost, reverse=True)
-                return scored[0].model, entry.get("date") if isinstance(entry.get("date"), str) else None
-        models_used = entry.get("modelsUsed")
-        if isinstance(models_used, list) and models_used:
-            last = models_used[-1]
-            if isinstance(last, str):
-                return last, entry.get("date") if isinstance(entry.get("date"), str) else None
-    return None, None
+PERIODS = ("day", "week", "month")
+ROLLING_WINDOWS = (7, 30)
+FORECAST_BASIS_DAYS = 90
+
+
+def collect_daily_costs(entries: Iterable[Dict[str, Any]]) -> Dict[date, Dict[str, float]]:
+    """Per-day, per-model cost totals from dated daily rows."""
+    daily: Dict[date, Dict[str, float]] = {}
+    for entry in entries:
+        day, _, models = digest_entry(entry)
+        parsed = parse_date(day) if day else None
+        if parsed is None:
+            continue
+        costs = daily.setdefault(parsed, {})
+        for name, (_, total) in models.items():
+            if total is not None:
+                costs[name] = costs.get(name, 0.0) + total
+    return daily
+
+
+def period_key(day: date, period: str) -> str:
+    if period == "day":
+        return day.isoformat()
+    if period == "week":
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    return f"{day.year}-{day.month:02d}"
+
+
+def rolling_means(values: List[float], window: int) -> List[float]:
+    """Trailing mean over `window` values (fewer at the start of the series), via prefix sums."""
+    prefix = [0.0]
+    for value in values:
+        prefix.append(prefix[-1] + value)
+    return [
+        (prefix[i + 1] - prefix[max(0, i + 1 - window)]) / min(window, i + 1)
+        for i in range(len(values))
+    ]
+
+
+def linear_forecast(values: List[float], horizon: int) -> Tuple[float, float]:
+    """Least-squares line through daily values; returns (slope per day, projected total over `horizon` days)."""
+    n = len(values)
+    if n == 0:
+        return 0.0, 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    sxx = sum((x - mean_x) ** 2 for x in range(n))
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values)) / sxx if sxx else 0.0
+    intercept = mean_y - slope * mean_x
+    projected = sum(max(0.0, intercept + slope * x) for x in range(n, n + horizon))
+    return slope, projected
+
+
+def build_trends(daily: Dict[date, Dict[str, float]], period: str, horizon: int) -> Optional[Dict[str, Any]]:
+    """Period rollups with per-model shares, trailing averages and a linear spend forecast.
+
+    Days without rows inside the covered range count as zero spend.
+    """
+    if not daily:
+        return None
+    start, end = min(daily), max(daily)
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    totals = [sum(daily.get(day, {}).values()) for day in days]
+    rolling = {window: rolling_means(totals, window) for window in ROLLING_WINDOWS}
+
+    periods: List[Dict[str, Any]] = []
+    model_totals: Dict[str, float] = {}
+    for i, day in enumerate(days):
+        key = period_key(day, period)
+        if not periods or periods[-1]["period"] != key:
+            periods.append({"period": key, "start": day.isoformat(), "totalCostUSD": 0.0, "models": {}})
+        current = periods[-1]
+        current["end"] = day.isoformat()
+        current["totalCostUSD"] += totals[i]
+        for window in ROLLING_WINDOWS:
+            current[f"rolling{window}dAvgUSD"] = rolling[window][i]
+        for model, cost in daily.get(day, {}).items():
+            current["models"][model] = current["models"].get(model, 0.0) + cost
+            model_totals[model] = model_totals.get(model, 0.0) + cost
+
+    for current in periods:
+        total = current["totalCostUSD"]
+        current["models"] = [
+            {"model": model, "costUSD": cost, "share": cost / total if total else 0.0}
+            for model, cost in sorted(current["models"].items(), key=lambda item: item[1], reverse=True)
+        ]
+
+    basis = totals[-FORECAST_BASIS_DAYS:]
+    slope, projected = linear_forecast(basis, horizon)
+    return {
+        "period": period,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "dayCount": len(days),
+        "models": [
+            {"model": model, "totalCostUSD": cost}
+            for model, cost in sorted(model_totals.items(), key=lambda item: item[1], reverse=True)
+        ],
+        "periods": periods,
+        "forecast": {
+            "days": horizon,
+            "basisDays": len(basis),
+            "dailySlopeUSD": slope,
+            "projectedCostUSD": projected,
+        },
+    }
 
 
 def usd(value: Optional[float]) -> str:
@@ -154,27 +606,6 @@ def usd(value: Optional[float]) -> str:
     return f"${value:,.2f}"
 
 
-def latest_day_cost(entries: List[Dict[str, Any]], model: str) -> Tuple[Optional[str], Optional[float]]:
-    if not entries:
-        return None, None
-    sorted_entries = sorted(
-        entries,
-        key=lambda entry: entry.get("date") or "",
-    )
-    for entry in reversed(sorted_entries):
-        breakdowns = entry.get("modelBreakdowns")
-        if not isinstance(breakdowns, list):
-            continue
-        for item in breakdowns:
-            if not isinstance(item, dict):
-                continue
-            if item.get("modelName") == model:
-                cost = item.get("cost") if isinstance(item.get("cost"), (int, float)) else None
-                day = entry.get("date") if isinstance(entry.get("date"), str) else None
-                return day, float(cost) if cost is not None else None
-    return None, None
-
-
 def render_text_current(
     provider: str,
     model: str,
@@ -233,38 +664,250 @@ def build_json_all(provider: str, totals: Dict[str, float]) -> Dict[str, Any]:
     }
 
 
+def render_text_trends(provider: str, trends: Dict[str, Any]) -> str:
+    lines = [
+        f"Provider: {provider}",
+        f"Trends by {trends['period']}: {trends['start']} to {trends['end']} ({trends['dayCount']} days)",
+        f"{'Period':<12}{'Total':>12}{'7d avg':>11}{'30d avg':>11}  Top models",
+    ]
+    for row in trends["periods"]:
+        top = ", ".join(f"{item['model']} {item['share']:.0%}" for item in row["models"][:3])
+        lines.append(
+            f"{row['period']:<12}{usd(row['totalCostUSD']):>12}"
+            f"{usd(row['rolling7dAvgUSD']):>11}{usd(row['rolling30dAvgUSD']):>11}  {top or '—'}"
+        )
+    forecast = trends["forecast"]
+    slope = forecast["dailySlopeUSD"]
+    lines.append(
+        f"Forecast next {forecast['days']} days: {usd(forecast['projectedCostUSD'])} "
+        f"(trend {'+' if slope >= 0 else '-'}{usd(abs(slope))}/day, fit on last {forecast['basisDays']} days)"
+    )
+    return "\n".join(lines)
+
+
+def build_json_trends(provider: str, trends: Dict[str, Any]) -> Dict[str, Any]:
+    return {"provider": provider, "mode": "trends", **trends}
+
+
+def collect(provider: str, args: argparse.Namespace) -> Any:
+    """Daily costs for --mode trends, otherwise a CostSummary, for one provider."""
+    index = refreshed_index(args.index, args.input, provider, args.max_age) if args.index else None
+    try:
+        if args.mode == "trends":
+            if index:
+                return index.daily_costs(provider, args.days)
+            return collect_daily_costs(filter_by_days(iter_daily_entries(args.input, provider), args.days))
+        if index:
+            return index.summary(provider, args.days, args.model)
+        return summarize(filter_by_days(iter_daily_entries(args.input, provider), args.days))
+    finally:
+        if index:
+            index.close()
+
+
+@dataclass
+class ProviderResult:
+    provider: str
+    seconds: float
+    data: Any = None
+    error: Optional[str] = None
+
+
+def collect_providers(providers: Iterable[str], args: argparse.Namespace) -> List[ProviderResult]:
+    """Run collect() for every provider at once; each runs its own codexbar process."""
+
+    def run(provider: str) -> ProviderResult:
+        started = time.perf_counter()
+        try:
+            data = collect(provider, args)
+        except Exception as exc:
+            return ProviderResult(provider, time.perf_counter() - started, error=str(exc))
+        return ProviderResult(provider, time.perf_counter() - started, data=data)
+
+    providers = list(providers)
+    with ThreadPoolExecutor(max_workers=len(providers)) as pool:
+        return list(pool.map(run, providers))
+
+
+def render_text_timing(results: List[ProviderResult], wall: float) -> str:
+    parts = ", ".join(f"{result.provider} {result.seconds:.2f}s" for result in results)
+    return f"Timing: {parts} (wall {wall:.2f}s)"
+
+
+def report_all_providers(args: argparse.Namespace) -> int:
+    if args.input == "-":
+        eprint("--provider all cannot read stdin; save the codexbar JSON to a file and pass --input <path>.")
+        return 1
+    started = time.perf_counter()
+    results = collect_providers(PROVIDERS, args)
+    wall = time.perf_counter() - started
+    for result in results:
+        if result.error:
+            eprint(f"{result.provider}: {result.error}")
+    collected = [result for result in results if result.error is None]
+    if not collected:
+        return 1
+    timings = {result.provider: result.seconds for result in results}
+    indent = 2 if args.pretty else None
+
+    if args.mode == "trends":
+        # Models are keyed as provider/model so shares stay comparable across providers.
+        daily: Dict[date, Dict[str, float]] = {}
+        for result in collected:
+            for day, costs in result.data.items():
+                merged = daily.setdefault(day, {})
+                for model, cost in costs.items():
+                    merged[f"{result.provider}/{model}"] = cost
+        trends = build_trends(daily, args.period, args.forecast_days)
+        if trends is None:
+            eprint("No dated daily rows found in codexbar cost payload.")
+            return 2
+        if args.format == "json":
+            payload_out = {**build_json_trends("all", trends), "timings": timings, "wallSeconds": wall}
+            print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
+        else:
+            print(render_text_trends("all", trends))
+            print(render_text_timing(results, wall))
+        return 0
+
+    if args.mode == "current":
+        reports = []
+        for result in collected:
+            summary = result.data
+            model = args.model or summary.current_model
+            if not model:
+                eprint(f"{result.provider}: No model data found in codexbar cost payload.")
+                continue
+            latest_cost_date, latest_cost = summary.latest_day_cost(model)
+            reports.append(
+                dict(
+                    provider=result.provider,
+                    model=model,
+                    latest_date=None if args.model else summary.current_date,
+                    total_cost=summary.totals.get(model),
+                    latest_cost=latest_cost,
+                    latest_cost_date=latest_cost_date,
+                    entry_count=summary.entry_count,
+                )
+            )
+        if not reports:
+            return 2
+        if args.format == "json":
+            payload_out = {
+                "provider": "all",
+                "mode": "current",
+                "providers": [
+                    {**build_json_current(**report), "seconds": timings[report["provider"]]} for report in reports
+                ],
+                "wallSeconds": wall,
+            }
+            print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
+        else:
+            print("\n\n".join(render_text_current(**report) for report in reports))
+            print()
+            print(render_text_timing(results, wall))
+        return 0
+
+    provider_totals = {result.provider: sum(result.data.totals.values()) for result in collected}
+    models = sorted(
+        ((result.provider, model, cost) for result in collected for model, cost in result.data.totals.items()),
+        key=lambda item: item[2],
+        reverse=True,
+    )
+    if not models:
+        eprint("No model breakdowns found in codexbar cost payload.")
+        return 2
+    if args.format == "json":
+        payload_out = {
+            "provider": "all",
+            "mode": "all",
+            "models": [
+                {"provider": provider, "model": model, "totalCostUSD": cost} for provider, model, cost in models
+            ],
+            "providers": [
+                {"provider": provider, "totalCostUSD": total, "seconds": timings[provider]}
+                for provider, total in provider_totals.items()
+            ],
+            "totalCostUSD": sum(provider_totals.values()),
+            "wallSeconds": wall,
+        }
+        print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
+    else:
+        lines = ["Provider: all", "Models:"]
+        lines.extend(f"- {provider}/{model}: {usd(cost)}" for provider, model, cost in models)
+        lines.append("Providers:")
+        lines.extend(f"- {provider}: {usd(total)}" for provider, total in provider_totals.items())
+        lines.append(f"Total cost: {usd(sum(provider_totals.values()))}")
+        print("\n".join(lines))
+        print(render_text_timing(results, wall))
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Summarize CodexBar model usage from local cost logs.")
-    parser.add_argument("--provider", choices=["codex", "claude"], default="codex")
-    parser.add_argument("--mode", choices=["current", "all"], default="current")
+    parser.add_argument(
+        "--provider",
+        choices=[*PROVIDERS, "all"],
+        default="codex",
+        help="Provider to summarize; 'all' collects every provider concurrently.",
+    )
+    parser.add_argument("--mode", choices=["current", "all", "trends"], default="current")
     parser.add_argument("--model", help="Explicit model name to report instead of auto-current.")
     parser.add_argument("--input", help="Path to codexbar cost JSON (or '-' for stdin).")
     parser.add_argument("--days", type=int, help="Limit to last N days (based on daily rows).")
     parser.add_argument("--format", choices=["text", "json"], default="text")
     parser.add_argument("--pretty", action="store_true", help="Pretty-print JSON output.")
+    parser.add_argument("--period", choices=PERIODS, default="week", help="Rollup period for --mode trends.")
+    parser.add_argument(
+        "--forecast-days", type=int, default=30, help="Forecast horizon in days for --mode trends."
+    )
+    parser.add_argument(
+        "--index",
+        nargs="?",
+        const=default_index_path(),
+        help="Answer from a local SQLite cost index (default path under ~/.cache), refreshed incrementally.",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=300.0,
+        help="With --index, skip running codexbar if the index was refreshed within this many seconds.",
+    )
 
     args = parser.parse_args()
 
+    if args.provider == "all":
+        return report_all_providers(args)
+
     try:
-        payload = load_payload(args.input, args.provider)
+        data = collect(args.provider, args)
     except Exception as exc:
         eprint(str(exc))
         return 1
 
-    entries = parse_daily_entries(payload)
-    entries = filter_by_days(entries, args.days)
+    if args.mode == "trends":
+        trends = build_trends(data, args.period, args.forecast_days)
+        if trends is None:
+            eprint("No dated daily rows found in codexbar cost payload.")
+            return 2
+        if args.format == "json":
+            indent = 2 if args.pretty else None
+            print(json.dumps(build_json_trends(args.provider, trends), indent=indent, sort_keys=args.pretty))
+        else:
+            print(render_text_trends(args.provider, trends))
+        return 0
 
+    summary = data
     if args.mode == "current":
         model = args.model
         latest_date = None
         if not model:
-            model, latest_date = pick_current_model(entries)
+            model, latest_date = summary.current_model, summary.current_date
         if not model:
             eprint("No model data found in codexbar cost payload.")
             return 2
-        totals = aggregate_costs(entries)
-        total_cost = totals.get(model)
-        latest_cost_date, latest_cost = latest_day_cost(entries, model)
+        total_cost = summary.totals.get(model)
+        latest_cost_date, latest_cost = summary.latest_day_cost(model)
 
         if args.format == "json":
             payload_out = build_json_current(
@@ -274,7 +917,7 @@ def main() -> int:
                 total_cost=total_cost,
                 latest_cost=latest_cost,
                 latest_cost_date=latest_cost_date,
-                entry_count=len(entries),
+                entry_count=summary.entry_count,
             )
             indent = 2 if args.pretty else None
             print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
@@ -287,12 +930,12 @@ def main() -> int:
                     total_cost=total_cost,
                     latest_cost=latest_cost,
                     latest_cost_date=latest_cost_date,
-                    entry_count=len(entries),
+                    entry_count=summary.entry_count,
                 )
             )
         return 0
 
-    totals = aggregate_costs(entries)
+    totals = summary.totals
     if not totals:
         eprint("No model breakdowns found in codexbar cost payload.")
         return 2
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Skill Index Builder - Writes one compact JSON index of every skill under a root
+
+Agents can load this single file at startup instead of opening and parsing
+every SKILL.md. Rebuilds are incremental: a skill whose SKILL.md has the same
+mtime and size (or, failing that, the same content hash) as in the previous
+index is copied over without re-parsing its frontmatter.
+
+Usage:
+    build_skill_index.py <skills-root> [--output PATH] [--jobs N] [--bench]
+
+Examples:
+    build_skill_index.py skills
+    build_skill_index.py skills --output dist/skills-index.json
+    build_skill_index.py skills --bench
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from quick_validate import find_skills, parse_frontmatter
+
+INDEX_FILENAME = "skills-index.json"
+INDEX_VERSION = 1
+INDEXED_FIELDS = ("name", "description", "allowed-tools")
+
+
+def load_index(index_path):
+    """
+    Load a skill index for use at agent startup.
+
+    Returns:
+        List of skill entries (name, description, allowed-tools, path, sha256), skipping unreadable skills
+    """
+    with open(index_path, "r", encoding="utf-8") as f:
+        index = json.load(f)
+    return [entry for entry in index.get("skills", []) if "error" not in entry]
+
+
+def read_previous(index_path):
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if index.get("version") != INDEX_VERSION:
+        return {}
+    return {entry["path"]: entry for entry in index.get("skills", [])}
+
+
+def field_type_error(field, value):
+    """
+    Check that an indexed frontmatter value is JSON-serializable text.
+
+    YAML turns unquoted values like 2024-01-01 into dates, which would break the index.
+
+    Returns:
+        Error message, or None if the value is usable
+    """
+    if field == "allowed-tools":
+        if isinstance(value, str) or (isinstance(value, list) and all(isinstance(v, str) for v in value)):
+            return None
+        return f"'{field}' must be a string or a list of strings, got {type(value).__name__}"
+    if isinstance(value, str):
+        return None
+    return f"'{field}' must be a string, got {type(value).__name__}"
+
+
+def index_entry(skill_md, rel_path, previous):
+    """
+    Build the index entry for one SKILL.md, reusing the previous entry when unchanged.
+
+    Returns:
+        (entry, reused)
+    """
+    stat = skill_md.stat()
+    if previous and previous.get("mtime_ns") == stat.st_mtime_ns and previous.get("size") == stat.st_size:
+        return previous, True
+
+    data = skill_md.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if previous and previous.get("sha256") == digest:
+        return {**previous, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}, True
+
+    entry = {"path": rel_path, "sha256": digest, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    try:
+        frontmatter, error = parse_frontmatter(data.decode("utf-8"))
+    except UnicodeDecodeError as e:
+        frontmatter, error = None, f"SKILL.md is not valid UTF-8: {e}"
+    if error:
+        entry["error"] = error.splitlines()[0]
+        return entry, False
+
+    for field in INDEXED_FIELDS:
+        if field in frontmatter:
+            error = field_type_error(field, frontmatter[field])
+            if error:
+                entry["error"] = error
+                return entry, False
+            entry[field] = frontmatter[field]
+    if not isinstance(entry.get("name"), str) or not entry["name"].strip():
+        entry["name"] = skill_md.parent.name
+    return entry, False
+
+
+def build_index(skills_root, output_path=None, jobs=None):
+    """
+    Scan skills_root and write the index, reusing unchanged entries from the previous one.
+
+    Returns:
+        (path to the index, stats dict)
+    """
+    started = time.perf_counter()
+    root = Path(skills_root).resolve()
+    output_path = Path(output_path).resolve() if output_path else root / INDEX_FILENAME
+    previous = read_previous(output_path)
+
+    skills = find_skills(root)
+    rel_paths = [skill.relative_to(root).as_posix() for skill in skills]
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) + 4)) as pool:
+        results = list(
+            pool.map(
+                index_entry,
+                [skill / "SKILL.md" for skill in skills],
+                rel_paths,
+                [previous.get(rel_path) for rel_path in rel_paths],
+            )
+        )
+
+    entries = [entry for entry, _ in results]
+    index = {"version": INDEX_VERSION, "skills": entries}
+    text = json.dumps(index, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+    # Leave the file untouched when nothing changed, so watchers and caches see no update
+    try:
+        unchanged = output_path.read_text(encoding="utf-8") == text
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, output_path)
+
+    stats = {
+        "skills": len(entries),
+        "reused": sum(1 for _, reused in results if reused),
+        "errors": [(entry["path"], entry["error"]) for entry in entries if "error" in entry],
+        "written": not unchanged,
+        "bytes": len(text.encode("utf-8")),
+        "seconds": time.perf_counter() - started,
+    }
+    return output_path, stats
+
+
+def bench(skills_root, index_path):
+    """Compare loading the index against reading and parsing every SKILL.md, as an agent would at startup"""
+    started = time.perf_counter()
+    for skill in find_skills(Path(skills_root).resolve()):
+        parse_frontmatter((skill / "SKILL.md").read_text(encoding="utf-8", errors="replace"))
+    scan_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    load_index(index_path)
+    index_seconds = time.perf_counter() - started
+    return scan_seconds, index_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a compact index of every skill under a root")
+    parser.add_argument("root", help="Skills root to scan")
+    parser.add_argument("--output", help=f"Index path (default: <root>/{INDEX_FILENAME})")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel workers")
+    parser.add_argument("--bench", action="store_true", help="Time loading the index against parsing every SKILL.md")
+    args = parser.parse_args()
+
+    if not Path(args.root).is_dir():
+        print(f"[ERROR] Not a directory: {args.root}")
+        sys.exit(1)
+
+    index_path, stats = build_index(args.root, args.output, args.jobs)
+    for path, error in stats["errors"]:
+        print(f"[WARN] {path}: {error}")
+    print(
+        f"[OK] Indexed {stats['skills']} skills ({stats['reused']} unchanged) in {stats['seconds'] * 1000:.1f}ms"
+    )
+    print(f"   {'Wrote' if stats['written'] else 'Up to date:'} {index_path} ({stats['bytes']:,} bytes)")
+
+    if args.bench:
+        scan_seconds, index_seconds = bench(args.root, index_path)
+        print(f"   Parse every SKILL.md: {scan_seconds * 1000:.1f}ms")
+        print(f"   Load index:           {index_seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Skill Installer - Installs a .skill file created by package_skill.py
+
+Entries are streamed to disk and checked against the SHA-256 manifest inside
+the archive. Files already installed with the same content are hard-linked
+into the new tree instead of being rewritten. The new tree is built in a
+staging folder and swapped with the old one in a single atomic rename
+(renameat2 RENAME_EXCHANGE on Linux, renamex_np RENAME_SWAP on macOS), so a
+failed or interrupted install leaves the previous version in place.
+
+Where no exchange rename is available, the old tree is first moved to a
+backup folder. If the install is interrupted between the two renames, the
+next run restores that backup before installing.
+
+Files in an existing install that the previous package did not ship (local
+config, output) are carried over unless --clean is given.
+
+Usage:
+    python utils/install_skill.py <path/to/skill-file> [skills-directory] [--clean]
+
+Example:
+    python utils/install_skill.py dist/my-skill.skill
+    python utils/install_skill.py dist/my-skill.skill ~/.openclaw/skills
+"""
+
+import ctypes
+import errno
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from package_skill import CHUNK_SIZE, MANIFEST_NAME, file_digest
+
+SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2  # Linux renameat2 flag
+RENAME_SWAP = 2  # macOS renamex_np flag
+
+
+def member_path(name, skill_name):
+    """
+    Path of an archive entry relative to the skill folder.
+
+    Raises:
+        ValueError: for entries outside the skill folder (absolute paths, '..', other top-level folders)
+    """
+    parts = PurePosixPath(name).parts
+    if not parts or parts[0] != skill_name or ".." in parts or PurePosixPath(name).is_absolute():
+        raise ValueError(f"Unsafe entry in archive: {name}")
+    return PurePosixPath(*parts[1:])
+
+
+def read_manifest(zipf):
+    """
+    Find the skill folder name and its manifest.
+
+    Returns:
+        (skill name, manifest files dict or None for archives built without one)
+
+    Raises:
+        ValueError: if the manifest is not {"files": {arcname: {"sha256": hex, "size": int}}}
+    """
+    names = [info.filename for info in zipf.infolist() if not info.is_dir()]
+    top_levels = {PurePosixPath(name).parts[0] for name in names if PurePosixPath(name).parts}
+    if len(top_levels) != 1:
+        raise ValueError(f"Expected one skill folder in the archive, found: {', '.join(sorted(top_levels)) or 'none'}")
+    skill_name = top_levels.pop()
+    manifest_name = f"{skill_name}/{MANIFEST_NAME}"
+    if manifest_name not in names:
+        return skill_name, None
+    manifest = json.loads(zipf.read(manifest_name))
+    files = manifest.get("files") if isinstance(manifest, dict) else None
+    if not isinstance(files, dict):
+        raise ValueError("Malformed manifest: 'files' must be an object")
+    for name, record in files.items():
+        if not (
+            isinstance(record, dict)
+            and isinstance(record.get("sha256"), str)
+            and SHA256_PATTERN.fullmatch(record["sha256"])
+            and type(record.get("size")) is int
+            and record["size"] >= 0
+        ):
+            raise ValueError(f"Malformed manifest record for {name}")
+    return skill_name, files
+
+
+def installed_files(skill_dir):
+    """Files the previous package installed, per the manifest it left behind"""
+    try:
+        with open(skill_dir / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    files = manifest.get("files") if isinstance(manifest, dict) else None
+    if not isinstance(files, dict):
+        return None
+    return {name.split("/", 1)[1] for name in files if isinstance(name, str) and "/" in name}
+
+
+def same_content(path, size, sha256):
+    """True if path already holds exactly this content (hashed only when the size matches)"""
+    try:
+        if not path.is_file() or path.stat().st_size != size:
+            return False
+    except OSError:
+        return False
+    return file_digest(path) == sha256
+
+
+def link_or_copy(src, dst):
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def extract_entry(zipf, info, target, expected_sha256):
+    """Stream one entry to target, hashing as it is written; raises on a hash mismatch"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    sha256 = hashlib.sha256()
+    with zipf.open(info) as src, open(target, "wb") as dst:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+            sha256.update(chunk)
+            dst.write(chunk)
+    if expected_sha256 and sha256.hexdigest() != expected_sha256:
+        raise ValueError(f"Hash mismatch for {info.filename}")
+    if (info.external_attr >> 16) & 0o111:
+        os.chmod(target, 0o755)
+
+
+def exchange_paths(a, b):
+    """
+    Atomically swap two existing paths on the same filesystem.
+
+    Returns:
+        True if swapped, False if the platform or filesystem has no exchange rename
+    """
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+    except OSError:
+        return False
+    if sys.platform.startswith("linux"):
+        func = getattr(libc, "renameat2", None)
+        if func is None:
+            return False
+        func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+        result = func(AT_FDCWD, os.fsencode(a), AT_FDCWD, os.fsencode(b), RENAME_EXCHANGE)
+    elif sys.platform == "darwin":
+        func = getattr(libc, "renamex_np", None)
+        if func is None:
+            return False
+        func.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint]
+        result = func(os.fsencode(a), os.fsencode(b), RENAME_SWAP)
+    else:
+        return False
+    if result == 0:
+        return True
+    err = ctypes.get_errno()
+    if err in (errno.ENOSYS, errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP):
+        return False
+    raise OSError(err, os.strerror(err), str(b))
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def recover_interrupted(skills_dir, skill_name):
+    """
+    Clean up after installs of this skill that did not finish.
+
+    A backup left between the two fallback renames is restored if the skill
+    folder is missing; staging and backup folders of dead processes are removed.
+    """
+    target_dir = skills_dir / skill_name
+    leftovers = []
+    for kind in ("old", "install"):
+        for path in skills_dir.glob(f".{skill_name}.{kind}-*"):
+            pid = path.name.rsplit("-", 1)[1]
+            if pid.isdigit() and not pid_alive(int(pid)):
+                leftovers.append((kind, path))
+
+    backups = sorted((p for kind, p in leftovers if kind == "old"), key=lambda p: p.stat().st_mtime)
+    if backups and not target_dir.exists():
+        os.rename(backups.pop(), target_dir)
+        print(f"[WARN] Restored {skill_name} from an interrupted install")
+    for kind, path in leftovers:
+        if path.exists():
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def verify_archive_digest(skill_file):
+    """Check the archive against a <name>.skill.sha256 file next to it, if there is one"""
+    digest_file = skill_file.with_name(skill_file.name + ".sha256")
+    if not digest_file.exists():
+        return None
+    expected = digest_file.read_text().split()[0]
+    if file_digest(skill_file) != expected:
+        raise ValueError(f"Archive does not match {digest_file.name}")
+    return expected
+
+
+def install_skill(skill_file, skills_dir=None, clean=False):
+    """
+    Install a .skill file into a skills directory.
+
+    Args:
+        skill_file: Path to the .skill file
+        skills_dir: Directory that holds installed skills (defaults to current directory)
+        clean: Drop files in the existing install that did not come from a package
+
+    Returns:
+        Path to the installed skill folder, or None if error
+    """
+    skill_file = Path(skill_file).resolve()
+    if not skill_file.is_file():
+        print(f"[ERROR] Skill file not found: {skill_file}")
+        return None
+
+    skills_dir = Path(skills_dir).resolve() if skills_dir else Path.cwd()
+    skills_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        digest = verify_archive_digest(skill_file)
+        if digest:
+            print(f"[OK] Archive matches {skill_file.name}.sha256")
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return None
+
+    staging = None
+    try:
+        with zipfile.ZipFile(skill_file) as zipf:
+            skill_name, manifest = read_manifest(zipf)
+            if manifest is None:
+                print("[WARN] No manifest in archive; relying on ZIP CRC checks only")
+
+            target_dir = skills_dir / skill_name
+            recover_interrupted(skills_dir, skill_name)
+            staging = skills_dir / f".{skill_name}.install-{os.getpid()}"
+            shutil.rmtree(staging, ignore_errors=True)
+            staging.mkdir()
+
+            written = unchanged = 0
+            skipped_bytes = 0
+            packaged = set()
+            for info in zipf.infolist():
+                if info.is_dir():
+                    continue
+                rel_path = member_path(info.filename, skill_name)
+                packaged.add(rel_path.as_posix())
+                record = (manifest or {}).get(info.filename)
+                if manifest is not None and record is None and rel_path.as_posix() != MANIFEST_NAME:
+                    raise ValueError(f"Entry not covered by the manifest: {info.filename}")
+
+                if record and record["size"] != info.file_size:
+                    raise ValueError(f"Size mismatch for {info.filename}")
+
+                existing = target_dir / rel_path
+                if record and same_content(existing, info.file_size, record["sha256"]):
+                    link_or_copy(existing, staging / rel_path)
+                    unchanged += 1
+                    skipped_bytes += info.file_size
+                else:
+                    extract_entry(zipf, info, staging / rel_path, record and record["sha256"])
+                    written += 1
+
+            if manifest is not None:
+                missing = {name for name in manifest} - {f"{skill_name}/{p}" for p in packaged}
+                if missing:
+                    raise ValueError(f"Manifest lists files missing from the archive: {', '.join(sorted(missing))}")
+
+        # Carry over local files the previous package did not install
+        kept = 0
+        if target_dir.is_dir() and not clean:
+            previously_packaged = installed_files(target_dir) or set()
+            for path in sorted(target_dir.rglob("*")):
+                rel = path.relative_to(target_dir).as_posix()
+                if path.is_file() and not path.is_symlink() and rel not in packaged and rel not in previously_packaged:
+                    link_or_copy(path, staging / rel)
+                    kept += 1
+
+        # Swap the new tree in; afterwards the staging path holds the old tree
+        if not target_dir.exists():
+            os.rename(staging, target_dir)
+            staging = None
+        elif not exchange_paths(staging, target_dir):
+            backup = skills_dir / f".{skill_name}.old-{os.getpid()}"
+            os.rename(target_dir, backup)
+            try:
+                os.rename(staging, target_dir)
+            except OSError:
+                os.rename(backup, target_dir)
+                raise
+            staging = backup
+
+        print(f"[OK] Installed {skill_name} to: {target_dir}")
+        print(
+            f"   {written} written, {unchanged} unchanged ({skipped_bytes / 1024 / 1024:.1f} MB not rewritten)"
+            + (f", {kept} local files kept" if kept else "")
+        )
+        return target_dir
+
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"[ERROR] Install failed: {e}")
+        print("   The existing installation (if any) was left unchanged.")
+        return None
+    finally:
+        if staging is not None:
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def main():
+    clean = "--clean" in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != "--clean"]
+    if not args:
+        print("Usage: python utils/install_skill.py <path/to/skill-file> [skills-directory] [--clean]")
+        print("\nExample:")
+        print("  python utils/install_skill.py dist/my-skill.skill")
+        print("  python utils/install_skill.py dist/my-skill.skill ~/.openclaw/skills")
+        sys.exit(1)
+
+    skill_file = args[0]
+    skills_dir = args[1] if len(args) > 1 else None
+
+    print(f"Installing skill: {skill_file}")
+    if skills_dir:
+        print(f"   Skills directory: {skills_dir}")
+    print()
+
+    result = install_skill(skill_file, skills_dir, clean)
+
+    if result:
+        sys.exit(0)
+    else:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
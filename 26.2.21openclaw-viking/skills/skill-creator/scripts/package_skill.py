@@ -2,28 +2,228 @@
 """
 Skill Packager - Creates a distributable .skill file of a skill folder
 
+Packaging is incremental: every archive carries a content-hash manifest, and
+entries whose content is unchanged since the previous .skill are copied over
+as already-compressed bytes. Changed files are hashed and compressed in a
+worker pool; already-compressed media is stored as-is.
+
+With --deterministic, entries also get a fixed timestamp and normalized
+permissions, so identical content always produces byte-identical archives.
+The SHA-256 of the archive is printed and written next to it.
+
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--deterministic]
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py skills/public/my-skill ./dist --deterministic
 """
 
+import hashlib
+import json
+import os
+import stat
+import struct
 import sys
+import tempfile
+import time
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from quick_validate import validate_skill
 
+MANIFEST_NAME = ".skill-manifest.json"
+CHUNK_SIZE = 1024 * 1024
+# Compressed output above this size is spilled to a temp file instead of memory
+SPOOL_LIMIT = CHUNK_SIZE
+INCOMPRESSIBLE_RATIO = 0.95
+
+# Never packaged: caches and OS metadata that differ between machines
+EXCLUDED_DIRS = {"__pycache__", ".git", ".hg", ".svn"}
+EXCLUDED_FILES = {".DS_Store", "Thumbs.db", "desktop.ini"}
+EXCLUDED_SUFFIXES = {".pyc", ".pyo"}
+
+# Formats that are already compressed; deflating them again only costs time
+STORED_SUFFIXES = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".ico",
+    ".mp3", ".m4a", ".aac", ".ogg", ".opus", ".flac",
+    ".mp4", ".m4v", ".mov", ".webm", ".mkv",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".7z", ".skill",
+    ".woff", ".woff2",
+}
+
+
+def is_incompressible(file_path):
+    """Probe the first chunk: if fast deflate barely shrinks it, the file is stored as-is."""
+    with open(file_path, "rb") as f:
+        sample = f.read(CHUNK_SIZE)
+    return len(sample) >= 4096 and len(zlib.compress(sample, 1)) > len(sample) * INCOMPRESSIBLE_RATIO
+
+
+def load_previous(archive_path):
+    """
+    Read the manifest of a previously built .skill.
+
+    Returns:
+        (manifest files dict, {arcname: ZipInfo}); empty when there is no usable previous archive.
+        Manifest records without a matching entry in the archive are dropped, so they are recompressed.
+    """
+    try:
+        with zipfile.ZipFile(archive_path) as zipf:
+            infos = {info.filename: info for info in zipf.infolist()}
+            manifest_name = next((name for name in infos if name.endswith("/" + MANIFEST_NAME)), None)
+            if manifest_name is None:
+                return {}, {}
+            manifest = json.loads(zipf.read(manifest_name))
+        files = {
+            name: {**record, "compress": "stored" if infos[name].compress_type == zipfile.ZIP_STORED else "deflated"}
+            for name, record in manifest.get("files", {}).items()
+            if name in infos and infos[name].compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+        }
+        return files, infos
+    except (OSError, zipfile.BadZipFile, ValueError):
+        return {}, {}
+
+
+def prepare_entry(file_path, arcname, previous, spool_dir=None):
+    """
+    Hash a file and, unless its compressed bytes can be reused, compress it.
+
+    Runs in a worker thread; hashlib and zlib release the GIL on large buffers.
+    Compressed data is kept in a spooled temp file that moves to spool_dir once
+    it exceeds SPOOL_LIMIT, so in-flight entries hold at most that much memory each.
+
+    Returns:
+        dict with the manifest record plus how to write the entry
+    """
+    sha256 = hashlib.sha256()
+    crc = 0
+    size = 0
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha256.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+    record = {"sha256": sha256.hexdigest(), "size": size}
+    entry = {"path": file_path, "arcname": arcname, "record": record, "crc": crc, "data": None}
+
+    old = previous.get(arcname)
+    if old and old.get("sha256") == record["sha256"]:
+        entry["action"] = "reuse"
+        record["compress"] = old.get("compress", "deflated")
+    elif file_path.suffix.lower() in STORED_SUFFIXES or is_incompressible(file_path):
+        entry["action"] = "store"
+        record["compress"] = "stored"
+    else:
+        # Second pass over a file that is now in the page cache
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        data = tempfile.SpooledTemporaryFile(max_size=SPOOL_LIMIT, dir=spool_dir)
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                data.write(compressor.compress(chunk))
+        data.write(compressor.flush())
+        data.seek(0)
+        entry["action"] = "compress"
+        entry["data"] = data
+        record["compress"] = "deflated"
+    return entry
+
+
+def read_raw_entry(handle, info):
+    """Yield the still-compressed bytes of an entry in an open archive file, in chunks."""
+    handle.seek(info.header_offset)
+    header = handle.read(30)
+    if header[:4] != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    handle.seek(name_length + extra_length, os.SEEK_CUR)
+    remaining = info.compress_size
+    while remaining:
+        chunk = handle.read(min(CHUNK_SIZE, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated entry {info.filename}")
+        remaining -= len(chunk)
+        yield chunk
+
+
+def iter_file(path):
+    with open(path, "rb") as f:
+        yield from iter(lambda: f.read(CHUNK_SIZE), b"")
+
+
+def write_raw_entry(zipf, zinfo, chunks):
+    """
+    Append an entry whose CRC, sizes and compressed bytes are already known.
+
+    zipfile has no public API for pre-compressed data, so this writes the local
+    header itself and registers the entry for the central directory.
+    """
+    zinfo.header_offset = zipf.fp.tell()
+    zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+    zipf.fp.write(zinfo.FileHeader(zip64))
+    for chunk in chunks:
+        zipf.fp.write(chunk)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = zipf.fp.tell()
+
+
+def collect_files(skill_path):
+    """Files to package, in a stable order (the manifest itself is regenerated, never copied)."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(skill_path):
+        dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+        for filename in filenames:
+            if (
+                filename == MANIFEST_NAME
+                or filename in EXCLUDED_FILES
+                or os.path.splitext(filename)[1].lower() in EXCLUDED_SUFFIXES
+            ):
+                continue
+            path = Path(dirpath) / filename
+            if path.is_file():
+                files.append(path)
+    return sorted(files, key=lambda p: p.relative_to(skill_path).as_posix())
 
-def package_skill(skill_path, output_dir=None):
+
+def fixed_date_time():
+    """Entry timestamp for deterministic archives: SOURCE_DATE_EPOCH if set, else the ZIP epoch"""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return time.gmtime(max(int(epoch), 315532800))[:6]
+    return (1980, 1, 1, 0, 0, 0)
+
+
+def make_zipinfo(file_path, arcname, deterministic):
+    """ZipInfo for a file; deterministic entries get a fixed time and 0644/0755 permissions"""
+    if not deterministic:
+        return zipfile.ZipInfo.from_file(file_path, arcname)
+    zinfo = zipfile.ZipInfo(arcname, fixed_date_time())
+    zinfo.create_system = 3
+    executable = file_path is not None and os.stat(file_path).st_mode & 0o111
+    zinfo.external_attr = (stat.S_IFREG | (0o755 if executable else 0o644)) << 16
+    return zinfo
+
+
+def file_digest(path):
+    sha256 = hashlib.sha256()
+    for chunk in iter_file(path):
+        sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def package_skill(skill_path, output_dir=None, deterministic=False):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        deterministic: Normalize timestamps and permissions so identical content gives identical bytes
 
     Returns:
         Path to the created .skill file, or None if error
@@ -64,42 +264,103 @@ def package_skill(skill_path, output_dir=None):
 
     skill_filename = output_path / f"{skill_name}.skill"
 
-    # Create the .skill file (zip format)
+    # Create the .skill file (zip format) next to the old one, then swap it in
+    previous, previous_infos = load_previous(skill_filename)
+    files = collect_files(skill_path)
+    workers = min(32, (os.cpu_count() or 1) + 4)
+    counts = {"reuse": 0, "compress": 0, "store": 0}
+    manifest = {"version": 1, "skill": skill_name, "files": {}}
+    tmp_name = output_path / f".{skill_name}.skill.{os.getpid()}.tmp"
+
     try:
-        with zipfile.ZipFile(skill_filename, "w", zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob("*"):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
+        with zipfile.ZipFile(tmp_name, "w", zipfile.ZIP_DEFLATED) as zipf, \
+                ThreadPoolExecutor(max_workers=workers) as pool, \
+                open(skill_filename if previous else os.devnull, "rb") as old:
+            # Entries are written in order; only a bounded window is prepared ahead,
+            # and each prepared entry holds at most SPOOL_LIMIT bytes in memory.
+            pending = deque()
+            queue = iter(files)
+            while True:
+                while len(pending) < workers * 2:
+                    file_path = next(queue, None)
+                    if file_path is None:
+                        break
+                    arcname = file_path.relative_to(skill_path.parent).as_posix()
+                    pending.append(pool.submit(prepare_entry, file_path, arcname, previous, output_path))
+                if not pending:
+                    break
+                entry = pending.popleft().result()
+
+                arcname = entry["arcname"]
+                record = entry["record"]
+                zinfo = make_zipinfo(entry["path"], arcname, deterministic)
+                zinfo.compress_type = zipfile.ZIP_STORED if record["compress"] == "stored" else zipfile.ZIP_DEFLATED
+                zinfo.file_size = record["size"]
+                zinfo.CRC = entry["crc"]
+                if entry["action"] == "reuse":
+                    old_info = previous_infos[arcname]
+                    zinfo.compress_size = old_info.compress_size
+                    write_raw_entry(zipf, zinfo, read_raw_entry(old, old_info))
+                elif entry["action"] == "store":
+                    zinfo.compress_size = record["size"]
+                    write_raw_entry(zipf, zinfo, iter_file(entry["path"]))
                     print(f"  Added: {arcname}")
+                else:
+                    with entry["data"] as data:
+                        zinfo.compress_size = data.seek(0, os.SEEK_END)
+                        data.seek(0)
+                        write_raw_entry(zipf, zinfo, iter(lambda: data.read(CHUNK_SIZE), b""))
+                    print(f"  Added: {arcname}")
+                counts[entry["action"]] += 1
+                manifest["files"][arcname] = record
+
+            manifest_name = f"{skill_name}/{MANIFEST_NAME}"
+            zipf.writestr(
+                make_zipinfo(None, manifest_name, True) if deterministic else manifest_name,
+                json.dumps(manifest, indent=2, sort_keys=True),
+                compress_type=zipfile.ZIP_DEFLATED,
+            )
 
+        os.replace(tmp_name, skill_filename)
+        digest = file_digest(skill_filename)
+        digest_file = skill_filename.with_name(skill_filename.name + ".sha256")
+        digest_file.write_text(f"{digest}  {skill_filename.name}\n")
         print(f"\n[OK] Successfully packaged skill to: {skill_filename}")
+        print(
+            f"   {counts['compress']} compressed, {counts['store']} stored, "
+            f"{counts['reuse']} reused from previous package"
+        )
+        print(f"   SHA-256: {digest} (written to {digest_file.name})")
         return skill_filename
 
     except Exception as e:
+        tmp_name.unlink(missing_ok=True)
         print(f"[ERROR] Error creating .skill file: {e}")
         return None
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
+    deterministic = "--deterministic" in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != "--deterministic"]
+    if not args:
+        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory] [--deterministic]")
         print("\nExample:")
         print("  python utils/package_skill.py skills/public/my-skill")
         print("  python utils/package_skill.py skills/public/my-skill ./dist")
+        print("  python utils/package_skill.py skills/public/my-skill ./dist --deterministic")
         sys.exit(1)
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    skill_path = args[0]
+    output_dir = args[1] if len(args) > 1 else None
 
     print(f"Packaging skill: {skill_path}")
     if output_dir:
         print(f"   Output directory: {output_dir}")
+    if deterministic:
+        print("   Deterministic: fixed timestamps and permissions")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    result = package_skill(skill_path, output_dir, deterministic)
 
     if result:
         sys.exit(0)
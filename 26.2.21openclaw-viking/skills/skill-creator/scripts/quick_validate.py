@@ -1,15 +1,35 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Usage:
+    python quick_validate.py <skill_directory>
+    python quick_validate.py validate-all <skills_root> [--jobs N] [--report PATH|-] [--cache PATH | --no-cache]
+
+validate-all finds every folder with a SKILL.md under the root and validates
+them in parallel. Results are cached by SKILL.md mtime+hash, so unchanged
+skills are skipped on the next run.
 """
 
+import argparse
+import hashlib
+import json
+import os
 import re
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import yaml
+# Start-up cost is dominated by importing yaml; timed once, when this module loads
+_IMPORT_STARTED = time.perf_counter()
+import yaml  # noqa: E402
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
 
 MAX_SKILL_NAME_LENGTH = 64
+CACHE_FILENAME = ".skill-validate-cache.json"
+SKIP_DIRS = {"node_modules", "__pycache__", "venv"}
 
 
 def validate_skill(skill_path):
@@ -20,22 +40,39 @@ def validate_skill(skill_path):
     if not skill_md.exists():
         return False, "SKILL.md not found"
 
-    content = skill_md.read_text()
+    return validate_skill_content(skill_md.read_text())
+
+
+def parse_frontmatter(content):
+    """
+    Extract the YAML frontmatter of a SKILL.md.
+
+    Returns:
+        (frontmatter dict, None) or (None, error message)
+    """
     if not content.startswith("---"):
-        return False, "No YAML frontmatter found"
+        return None, "No YAML frontmatter found"
 
     match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
     if not match:
-        return False, "Invalid frontmatter format"
+        return None, "Invalid frontmatter format"
 
     frontmatter_text = match.group(1)
 
     try:
         frontmatter = yaml.safe_load(frontmatter_text)
         if not isinstance(frontmatter, dict):
-            return False, "Frontmatter must be a YAML dictionary"
+            return None, "Frontmatter must be a YAML dictionary"
     except yaml.YAMLError as e:
-        return False, f"Invalid YAML in frontmatter: {e}"
+        return None, f"Invalid YAML in frontmatter: {e}"
+    return frontmatter, None
+
+
+def validate_skill_content(content):
+    """Validate the text of a SKILL.md"""
+    frontmatter, error = parse_frontmatter(content)
+    if error:
+        return False, error
 
     allowed_properties = {"name", "description", "license", "allowed-tools", "metadata"}
 
@@ -91,9 +128,166 @@ def validate_skill(skill_path):
     return True, "Skill is valid!"
 
 
+def validator_version():
+    """Hash of this file, so cached results are dropped whenever the rules change"""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+
+def find_skills(root):
+    """Folders under root that contain a SKILL.md, skipping hidden and dependency directories"""
+    skills = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS)
+        if "SKILL.md" in filenames:
+            skills.append(Path(dirpath))
+    return skills
+
+
+def load_cache(cache_path, version):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("validator") != version:
+        return {}
+    return cache.get("skills", {})
+
+
+def save_cache(cache_path, version, entries):
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"validator": version, "skills": entries}, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, cache_path)
+
+
+def validate_cached(skill_path, cached):
+    """
+    Validate one skill folder, reusing a cached result when SKILL.md is unchanged.
+
+    The cache entry matches on mtime+size without reading the file; if only the
+    mtime moved, a matching content hash still counts as a hit.
+    """
+    started = time.perf_counter()
+    skill_md = skill_path / "SKILL.md"
+    stat = skill_md.stat()
+    if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+        return {**cached, "cached": True, "seconds": time.perf_counter() - started}
+
+    data = skill_md.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if cached and cached["sha256"] == digest:
+        valid, message, hit = cached["valid"], cached["message"], True
+    else:
+        try:
+            valid, message = validate_skill_content(data.decode("utf-8"))
+        except UnicodeDecodeError as e:
+            valid, message = False, f"SKILL.md is not valid UTF-8: {e}"
+        hit = False
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": digest,
+        "valid": valid,
+        "message": message,
+        "cached": hit,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def validate_all(root, jobs=None, cache_path=None):
+    """
+    Validate every skill under root in parallel.
+
+    Returns:
+        JSON-serializable report with per-skill results and timings
+    """
+    started = time.perf_counter()
+    root = Path(root).resolve()
+    version = validator_version()
+    cache = load_cache(cache_path, version) if cache_path else {}
+
+    skills = find_skills(root)
+    discovered = time.perf_counter()
+    keys = [skill.relative_to(root).as_posix() for skill in skills]
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) + 4)) as pool:
+        results = list(pool.map(validate_cached, skills, [cache.get(key) for key in keys]))
+
+    if cache_path:
+        fields = ("mtime_ns", "size", "sha256", "valid", "message")
+        save_cache(cache_path, version, {key: {f: r[f] for f in fields} for key, r in zip(keys, results)})
+
+    finished = time.perf_counter()
+    entries = [
+        {
+            "path": key,
+            "valid": r["valid"],
+            "message": r["message"],
+            "cached": r["cached"],
+            "seconds": round(r["seconds"], 6),
+        }
+        for key, r in zip(keys, results)
+    ]
+    return {
+        "root": str(root),
+        "validator": version,
+        "total": len(entries),
+        "valid": sum(1 for e in entries if e["valid"]),
+        "invalid": sum(1 for e in entries if not e["valid"]),
+        "cached": sum(1 for e in entries if e["cached"]),
+        "timing": {
+            "startup_seconds": round(IMPORT_SECONDS, 6),
+            "discover_seconds": round(discovered - started, 6),
+            "validate_seconds": round(finished - discovered, 6),
+            "total_seconds": round(finished - started, 6),
+            "per_skill_avg_seconds": round(sum(r["seconds"] for r in results) / len(results), 6) if results else 0,
+        },
+        "skills": entries,
+    }
+
+
+def main_validate_all(argv):
+    parser = argparse.ArgumentParser(
+        prog="quick_validate.py validate-all", description="Validate every skill under a skills root"
+    )
+    parser.add_argument("root", help="Skills root to walk")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel workers")
+    parser.add_argument("--report", help="Write the JSON report to this path ('-' for stdout)")
+    parser.add_argument("--cache", help=f"Cache file (default: <root>/{CACHE_FILENAME})")
+    parser.add_argument("--no-cache", action="store_true", help="Validate everything, ignoring the cache")
+    args = parser.parse_args(argv)
+
+    if not Path(args.root).is_dir():
+        print(f"[ERROR] Not a directory: {args.root}")
+        return 1
+    cache_path = None if args.no_cache else (args.cache or str(Path(args.root) / CACHE_FILENAME))
+    report = validate_all(args.root, jobs=args.jobs, cache_path=cache_path)
+
+    if args.report == "-":
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for entry in report["skills"]:
+            if not entry["valid"]:
+                print(f"[ERROR] {entry['path']}: {entry['message']}")
+        timing = report["timing"]
+        print(
+            f"[{'OK' if not report['invalid'] else 'ERROR'}] {report['valid']}/{report['total']} skills valid "
+            f"({report['cached']} cached) in {timing['total_seconds']:.3f}s "
+            f"(plus {timing['startup_seconds']:.3f}s start-up, per skill {timing['per_skill_avg_seconds'] * 1000:.2f}ms)"
+        )
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0 if not report["invalid"] else 1
+
+
 if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "validate-all":
+        sys.exit(main_validate_all(sys.argv[2:]))
+
     if len(sys.argv) != 2:
         print("Usage: python quick_validate.py <skill_directory>")
+        print("       python quick_validate.py validate-all <skills_root> [--jobs N] [--report PATH|-]")
         sys.exit(1)
 
     valid, message = validate_skill(sys.argv[1])